@@ -1,10 +1,20 @@
 import os
-
-from camundactl.cmd.base import init, root
+import sys
 
 
 def _main():
 
+    # delegate to a running daemon before importing cctl itself
+    from camundactl.daemon import client
+
+    argv = sys.argv[1:]
+    if client.should_delegate(argv):
+        exit_code = client.run(argv)
+        if exit_code is not None:
+            sys.exit(exit_code)
+
+    from camundactl.cmd.base import init, root
+
     init()
 
     if "CCTL_PROFILE" in os.environ:
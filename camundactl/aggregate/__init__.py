@@ -0,0 +1,10 @@
+from camundactl.aggregate.accumulators import (  # noqa
+    Accumulator,
+    Avg,
+    Count,
+    Max,
+    Min,
+    P2Quantile,
+    Sum,
+)
+from camundactl.aggregate.group import Aggregation, GroupBy, parse_aggregations  # noqa
@@ -0,0 +1,175 @@
+import math
+from typing import Any, Callable, Dict, List, Optional
+
+__all__ = [
+    "Accumulator",
+    "Count",
+    "Min",
+    "Max",
+    "Sum",
+    "Avg",
+    "P2Quantile",
+    "to_number",
+]
+
+
+def to_number(value: Any) -> Optional[float]:
+    """
+    returns numbers (and booleans) as float, none for other values.
+    """
+    if isinstance(value, (int, float)) and not (
+        isinstance(value, float) and math.isnan(value)
+    ):
+        return float(value)
+    return None
+
+
+class Accumulator:
+    """
+    aggregates values one by one in constant memory.
+    """
+
+    def add(self, value: Any) -> None:
+        raise NotImplementedError()
+
+    def result(self) -> Any:
+        raise NotImplementedError()
+
+
+class Count(Accumulator):
+    """
+    counts the values which are not none.
+    """
+
+    def __init__(self):
+        self.count = 0
+
+    def add(self, value: Any) -> None:
+        if value is not None:
+            self.count += 1
+
+    def result(self) -> int:
+        return self.count
+
+
+class Min(Accumulator):
+    # compares any values, e.g. timestamps
+
+    def __init__(self):
+        self.value: Any = None
+
+    def add(self, value: Any) -> None:
+        if value is not None and (self.value is None or value < self.value):
+            self.value = value
+
+    def result(self) -> Any:
+        return self.value
+
+
+class Max(Min):
+    def add(self, value: Any) -> None:
+        if value is not None and (self.value is None or value > self.value):
+            self.value = value
+
+
+class Sum(Accumulator):
+    def __init__(self):
+        self.count = 0
+        self.sum = 0.0
+
+    def add(self, value: Any) -> None:
+        if (number := to_number(value)) is not None:
+            self.count += 1
+            self.sum += number
+
+    def result(self) -> Optional[float]:
+        return self.sum if self.count else None
+
+
+class Avg(Sum):
+    def result(self) -> Optional[float]:
+        return self.sum / self.count if self.count else None
+
+
+class P2Quantile(Accumulator):
+    """
+    estimates the quantile p (0 < p < 1) of the values with the P²
+    algorithm (Jain, Chlamtac 1985): five markers (the minimum, p/2, p,
+    (1+p)/2 and the maximum) are moved along with the values and their
+    heights adjusted by piecewise parabolic interpolation. until five
+    values are known the quantile is exact.
+    """
+
+    def __init__(self, p: float):
+        if not 0 < p < 1:
+            raise ValueError(f"invalid quantile: {p}")
+        self.p = p
+        # marker heights, positions, desired positions and increments
+        self.heights: List[float] = []
+        self.positions = [0, 1, 2, 3, 4]
+        self.desired = [0, 2 * p, 4 * p, 2 + 2 * p, 4]
+        self.increments = [0, p / 2, p, (1 + p) / 2, 1]
+
+    def add(self, value: Any) -> None:
+        if (number := to_number(value)) is None:
+            return
+        heights = self.heights
+        if len(heights) < 5:
+            heights.append(number)
+            heights.sort()
+            return
+
+        if number < heights[0]:
+            heights[0] = number
+            cell = 0
+        elif number >= heights[4]:
+            heights[4] = number
+            cell = 3
+        else:
+            cell = next(i for i in range(4) if heights[i] <= number < heights[i + 1])
+        for i in range(cell + 1, 5):
+            self.positions[i] += 1
+        for i in range(5):
+            self.desired[i] += self.increments[i]
+
+        positions = self.positions
+        for i in (1, 2, 3):
+            delta = self.desired[i] - positions[i]
+            if (delta >= 1 and positions[i + 1] - positions[i] > 1) or (
+                delta <= -1 and positions[i - 1] - positions[i] < -1
+            ):
+                step = 1 if delta > 0 else -1
+                height = self._parabolic(i, step)
+                if not heights[i - 1] < height < heights[i + 1]:
+                    height = self._linear(i, step)
+                heights[i] = height
+                positions[i] += step
+
+    def _parabolic(self, i: int, step: int) -> float:
+        q, n = self.heights, self.positions
+        return q[i] + step / (n[i + 1] - n[i - 1]) * (
+            (n[i] - n[i - 1] + step) * (q[i + 1] - q[i]) / (n[i + 1] - n[i])
+            + (n[i + 1] - n[i] - step) * (q[i] - q[i - 1]) / (n[i] - n[i - 1])
+        )
+
+    def _linear(self, i: int, step: int) -> float:
+        q, n = self.heights, self.positions
+        return q[i] + step * (q[i + step] - q[i]) / (n[i + step] - n[i])
+
+    def result(self) -> Optional[float]:
+        if not self.heights:
+            return None
+        if self.positions[4] == 4:
+            # nearest rank of the known values
+            rank = math.ceil(self.p * len(self.heights)) - 1
+            return self.heights[max(rank, 0)]
+        return self.heights[2]
+
+
+ACCUMULATORS: Dict[str, Callable[[], Accumulator]] = {
+    "count": Count,
+    "min": Min,
+    "max": Max,
+    "sum": Sum,
+    "avg": Avg,
+}
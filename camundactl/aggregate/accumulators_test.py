@@ -0,0 +1,44 @@
+import random
+
+import pytest
+
+from .accumulators import Avg, Count, Max, Min, P2Quantile, Sum
+
+
+def _accumulate(accumulator, values):
+    for value in values:
+        accumulator.add(value)
+    return accumulator.result()
+
+
+def test_accumulators():
+    values = [3, None, 1, "x", 2.5]
+
+    assert _accumulate(Count(), values) == 4
+    assert _accumulate(Sum(), values) == 6.5
+    assert _accumulate(Avg(), values) == pytest.approx(6.5 / 3)
+    assert _accumulate(Min(), [3, None, 1, 2.5]) == 1
+    assert _accumulate(Max(), ["2021-01-02", None, "2021-03-01"]) == "2021-03-01"
+    assert _accumulate(Avg(), [None]) is None
+
+
+@pytest.mark.parametrize("p", [0.5, 0.9, 0.95, 0.99])
+def test_p2_quantile(p):
+    rnd = random.Random(42)
+    values = [rnd.uniform(0, 1000) for _ in range(20000)]
+
+    estimate = _accumulate(P2Quantile(p), values)
+
+    exact = sorted(values)[int(p * len(values))]
+    assert estimate == pytest.approx(exact, abs=10)
+
+
+def test_p2_quantile_few_values():
+    assert _accumulate(P2Quantile(0.5), []) is None
+    assert _accumulate(P2Quantile(0.5), [5, 1, 3]) == 3
+    assert _accumulate(P2Quantile(0.95), [5, 1, 3, 2, 4]) == 5
+
+
+def test_p2_quantile_invalid():
+    with pytest.raises(ValueError):
+        P2Quantile(1)
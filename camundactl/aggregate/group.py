@@ -0,0 +1,104 @@
+import re
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from camundactl.aggregate.accumulators import ACCUMULATORS, Accumulator, P2Quantile
+
+__all__ = ["Aggregation", "GroupBy", "parse_aggregations"]
+
+# e.g. `count`, `max(version)` or `p95(durationInMillis)`
+AGGREGATION_PATTERN = re.compile(r"\s*(\w+)\s*(?:\(\s*([\w.]*)\s*\))?\s*(?:,|$)")
+
+QUANTILE_PATTERN = re.compile(r"^p(\d{1,2})$")
+
+
+class Aggregation(NamedTuple):
+    name: str
+    function: str
+    field: Optional[str]
+    create: Callable[[], Accumulator]
+
+
+def _create_aggregation(function: str, field: Optional[str]) -> Aggregation:
+    name = f"{function}({field})" if field else function
+    if function == "count":
+        return Aggregation(name, function, field, ACCUMULATORS["count"])
+    if not field:
+        raise ValueError(f"{function} needs a field, e.g. {function}(version)")
+    if function in ACCUMULATORS:
+        return Aggregation(name, function, field, ACCUMULATORS[function])
+    if match := QUANTILE_PATTERN.match(function):
+        quantile = int(match.group(1)) / 100
+        if quantile > 0:
+            return Aggregation(name, function, field, lambda: P2Quantile(quantile))
+    raise ValueError(
+        f"unknown aggregation {function}, "
+        f"choose from {', '.join(ACCUMULATORS)} or p1 ... p99"
+    )
+
+
+def parse_aggregations(value: str) -> List[Aggregation]:
+    """
+    parses a comma seperated list of aggregations like
+    `count,avg(durationInMillis),p95(durationInMillis)`.
+    """
+    aggregations, position = [], 0
+    value = value.strip()
+    while position < len(value):
+        match = AGGREGATION_PATTERN.match(value, position)
+        if not match or match.end() == position:
+            raise ValueError(f"invalid aggregation: {value[position:]}")
+        aggregations.append(_create_aggregation(match.group(1), match.group(2)))
+        position = match.end()
+    return aggregations
+
+
+class GroupBy:
+    """
+    aggregates rows by the values of the group fields. the rows are
+    added one by one (e.g. page by page), only the accumulators of
+    every group are kept.
+    """
+
+    def __init__(self, fields: Iterable[str], aggregations: Iterable[Aggregation]):
+        self.fields = list(fields)
+        self.aggregations = list(aggregations) or [_create_aggregation("count", None)]
+        self.groups: Dict[Tuple, List[Accumulator]] = {}
+
+    def add(self, row: Dict) -> None:
+        key = tuple(row.get(field) for field in self.fields)
+        if key not in self.groups:
+            self.groups[key] = [
+                aggregation.create() for aggregation in self.aggregations
+            ]
+        for aggregation, accumulator in zip(self.aggregations, self.groups[key]):
+            # count without a field counts the rows
+            accumulator.add(row.get(aggregation.field) if aggregation.field else True)
+
+    def add_all(self, rows: Iterable[Dict]) -> None:
+        for row in rows:
+            self.add(row)
+
+    def rows(self) -> List[Dict[str, Any]]:
+        groups = list(self.groups.items())
+        try:
+            groups.sort(
+                key=lambda group: tuple(
+                    (value is not None, value) for value in group[0]
+                )
+            )
+        except TypeError:
+            # values of different types
+            pass
+        if not groups and not self.fields:
+            # aggregations of no rows
+            groups = [((), [aggregation.create() for aggregation in self.aggregations])]
+        return [
+            {
+                **dict(zip(self.fields, key)),
+                **{
+                    aggregation.name: accumulator.result()
+                    for aggregation, accumulator in zip(self.aggregations, accumulators)
+                },
+            }
+            for key, accumulators in groups
+        ]
@@ -0,0 +1,61 @@
+import pytest
+
+from .group import GroupBy, parse_aggregations
+
+
+def test_parse_aggregations():
+    aggregations = parse_aggregations("count, avg(duration),p95(duration)")
+
+    assert [aggregation.name for aggregation in aggregations] == [
+        "count",
+        "avg(duration)",
+        "p95(duration)",
+    ]
+
+
+@pytest.mark.parametrize("value", ["avg", "median(x)", "count(x", "count,,"])
+def test_parse_aggregations_invalid(value):
+    with pytest.raises(ValueError):
+        parse_aggregations(value)
+
+
+def test_group_by():
+    group = GroupBy(
+        ["key", "state"], parse_aggregations("count,count(duration),max(duration)")
+    )
+    group.add_all(
+        [
+            {"key": "b", "state": "ACTIVE", "duration": None},
+            {"key": "a", "state": "ACTIVE", "duration": 5},
+            {"key": "a", "state": "ACTIVE", "duration": 7},
+            {"key": "a", "state": None, "duration": 1},
+        ]
+    )
+
+    assert group.rows() == [
+        {
+            "key": "a",
+            "state": None,
+            "count": 1,
+            "count(duration)": 1,
+            "max(duration)": 1,
+        },
+        {
+            "key": "a",
+            "state": "ACTIVE",
+            "count": 2,
+            "count(duration)": 2,
+            "max(duration)": 7,
+        },
+        {
+            "key": "b",
+            "state": "ACTIVE",
+            "count": 1,
+            "count(duration)": 0,
+            "max(duration)": None,
+        },
+    ]
+
+
+def test_aggregate_without_groups():
+    assert GroupBy([], []).rows() == [{"count": 0}]
@@ -0,0 +1,6 @@
+from camundactl.analyze.definition import (  # noqa
+    DURATION_COLUMNS,
+    analyze_definition,
+    parse_activities,
+    scan_durations,
+)
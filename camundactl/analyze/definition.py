@@ -0,0 +1,161 @@
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from xml.etree import ElementTree
+
+from camundactl.aggregate import GroupBy, parse_aggregations
+from camundactl.client import Client
+from camundactl.client.paging import DEFAULT_PAGE_SIZE
+from camundactl.client.parallel import map_concurrent
+from camundactl.export.windows import iter_window_pages
+
+__all__ = [
+    "DURATION_COLUMNS",
+    "analyze_definition",
+    "parse_activities",
+    "scan_durations",
+]
+
+BPMN_NAMESPACE = "{http://www.omg.org/spec/BPMN/20100524/MODEL}"
+
+# the aggregations of the durations of the activity instances and the
+# columns they are shown as
+DURATION_AGGREGATIONS = {
+    "avg(durationInMillis)": "avgMs",
+    "p50(durationInMillis)": "p50Ms",
+    "p95(durationInMillis)": "p95Ms",
+    "p99(durationInMillis)": "p99Ms",
+    "max(durationInMillis)": "maxMs",
+}
+DURATION_COLUMNS = list(DURATION_AGGREGATIONS.values())
+
+
+def parse_activities(xml: str) -> Dict[str, Tuple[Optional[str], str]]:
+    """
+    returns the name and type (the bpmn element, e.g. `userTask`) of the
+    elements of the model by id, in the order of the model.
+    """
+    activities = {}
+    for element in ElementTree.fromstring(xml.encode()).iter():
+        if not element.tag.startswith(BPMN_NAMESPACE) or not element.get("id"):
+            continue
+        activities[element.get("id")] = (
+            element.get("name"),
+            element.tag[len(BPMN_NAMESPACE) :],
+        )
+    return activities
+
+
+def scan_durations(
+    client: Client,
+    definition_id: str,
+    params: Optional[Dict[str, Any]] = None,
+    page_size: int = DEFAULT_PAGE_SIZE,
+) -> Dict[str, Dict]:
+    """
+    aggregates the durations of the finished activity instances of the
+    definition by activity. the instances are requested window by window
+    (by start time) and page by page, only the aggregates are kept.
+    """
+    group = GroupBy(["activityId"], parse_aggregations(",".join(DURATION_AGGREGATIONS)))
+    query = {
+        **(params or {}),
+        "processDefinitionId": definition_id,
+        "finished": "true",
+        "sortBy": "activityInstanceId",
+    }
+    for page in iter_window_pages(
+        client, "/history/activity-instance", query, "startedAfter", page_size
+    ):
+        group.add_all(page)
+    return {
+        row["activityId"]: {
+            column: row[aggregation]
+            for aggregation, column in DURATION_AGGREGATIONS.items()
+        }
+        for row in group.rows()
+    }
+
+
+def _get_json(client: Client, path: str, params: Optional[Dict] = None) -> Any:
+    resp = client.get(path, params=params)
+    resp.raise_for_status()
+    return resp.json()
+
+
+def _round(value: Optional[float]) -> Optional[int]:
+    return None if value is None else round(value)
+
+
+def analyze_definition(
+    client: Client,
+    definition_id: str,
+    params: Optional[Dict[str, Any]] = None,
+    page_size: int = DEFAULT_PAGE_SIZE,
+) -> List[Dict]:
+    """
+    returns the counts, failure rates and durations of the activities of
+    the definition. params (e.g. `startedAfter`) limit the history.
+
+    the runtime and historic statistics, the model and the durations
+    are requested concurrently. the model is cached (see HttpCache).
+    """
+    history_params = {
+        **(params or {}),
+        "canceled": "true",
+        "finished": "true",
+        "incidents": "true",
+    }
+    requests: List[Callable[[], Any]] = [
+        lambda: _get_json(
+            client,
+            f"/process-definition/{definition_id}/statistics",
+            {"failedJobs": "true", "incidents": "true"},
+        ),
+        lambda: _get_json(
+            client,
+            f"/history/process-definition/{definition_id}/statistics",
+            history_params,
+        ),
+        lambda: _get_json(client, f"/process-definition/{definition_id}/xml")[
+            "bpmn20Xml"
+        ],
+        lambda: scan_durations(client, definition_id, params, page_size),
+    ]
+    runtime, history, xml, durations = map_concurrent(lambda f: f(), requests)
+    runtime = {item["id"]: item for item in runtime}
+    history = {item["id"]: item for item in history}
+    activities = parse_activities(xml)
+
+    activity_ids = [
+        activity_id
+        for activity_id in list(activities) + sorted(history.keys() - activities.keys())
+        if activity_id in runtime or activity_id in history or activity_id in durations
+    ]
+    rows = []
+    for activity_id in activity_ids:
+        name, type_ = activities.get(activity_id, (None, None))
+        running = runtime.get(activity_id, {})
+        historic = history.get(activity_id, {})
+        incidents = sum(
+            historic.get(field) or 0
+            for field in ("openIncidents", "resolvedIncidents", "deletedIncidents")
+        )
+        # running and finished instances, canceled ones are finished too
+        total = (historic.get("instances") or 0) + (historic.get("finished") or 0)
+        rows.append(
+            {
+                "activityId": activity_id,
+                "name": name,
+                "type": type_,
+                "running": running.get("instances", historic.get("instances")),
+                "failedJobs": running.get("failedJobs"),
+                "finished": historic.get("finished"),
+                "canceled": historic.get("canceled"),
+                "incidents": incidents,
+                "failureRate": round(incidents / total, 4) if total else None,
+                **{
+                    column: _round(durations.get(activity_id, {}).get(column))
+                    for column in DURATION_COLUMNS
+                },
+            }
+        )
+    return rows
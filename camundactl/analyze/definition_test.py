@@ -0,0 +1,90 @@
+from datetime import datetime, timedelta
+from unittest.mock import Mock
+
+from camundactl.export.windows import format_timestamp
+
+from .definition import analyze_definition, parse_activities
+
+START = datetime(2021, 1, 1)
+
+XML = """<?xml version="1.0" encoding="UTF-8"?>
+<bpmn:definitions xmlns:bpmn="http://www.omg.org/spec/BPMN/20100524/MODEL"
+    xmlns:bpmndi="http://www.omg.org/spec/BPMN/20100524/DI" id="definitions">
+  <bpmn:process id="invoice">
+    <bpmn:startEvent id="start" name="Invoice received" />
+    <bpmn:serviceTask id="pay" name="Pay" />
+    <bpmn:endEvent id="end" />
+  </bpmn:process>
+  <bpmndi:BPMNDiagram id="diagram" />
+</bpmn:definitions>
+"""
+
+
+def test_parse_activities():
+    activities = parse_activities(XML)
+
+    assert activities["pay"] == ("Pay", "serviceTask")
+    assert activities["end"] == (None, "endEvent")
+    assert "diagram" not in activities
+
+
+def test_analyze_definition():
+    responses = {
+        "/process-definition/p1/statistics": [
+            {"id": "pay", "instances": 2, "failedJobs": 1, "incidents": []}
+        ],
+        "/history/process-definition/p1/statistics": [
+            {"id": "start", "instances": 0, "finished": 10, "canceled": 0},
+            {
+                "id": "pay",
+                "instances": 2,
+                "finished": 8,
+                "canceled": 1,
+                "openIncidents": 1,
+                "resolvedIncidents": 1,
+            },
+        ],
+        "/process-definition/p1/xml": {"bpmn20Xml": XML},
+    }
+    # one finished instance every hour (in start time order)
+    durations = [
+        {
+            "activityId": "pay",
+            "durationInMillis": duration,
+            "startTime": format_timestamp(START + timedelta(hours=duration // 10)),
+        }
+        for duration in range(0, 1000, 10)
+    ]
+
+    def get(path, params=None):
+        if path == "/history/activity-instance":
+            items = [
+                item
+                for item in durations
+                if params.get("startedAfter", "") <= item["startTime"]
+                and item["startTime"] <= params.get("startedBefore", "9")
+            ]
+            first = params["firstResult"]
+            page = items[first : first + params["maxResults"]]
+            return Mock(json=Mock(return_value=page))
+        return Mock(json=Mock(return_value=responses[path]))
+
+    client = Mock(get=Mock(side_effect=get))
+    rows = analyze_definition(client, "p1", page_size=30)
+
+    assert [row["activityId"] for row in rows] == ["start", "pay"]
+    pay = rows[1]
+    assert pay["name"] == "Pay"
+    assert (pay["running"], pay["failedJobs"], pay["finished"]) == (2, 1, 8)
+    assert (pay["incidents"], pay["failureRate"]) == (2, 0.2)
+    assert (pay["avgMs"], pay["maxMs"]) == (495, 990)
+    assert 900 <= pay["p95Ms"] <= 990
+    assert rows[0]["p95Ms"] is None
+    # the instances are requested window by window, the pages of every
+    # window start at offset 0
+    offsets = [
+        call.kwargs["params"]["firstResult"]
+        for call in client.get.call_args_list
+        if call.args[0] == "/history/activity-instance"
+    ]
+    assert offsets.count(0) > 1 and max(offsets) < len(durations) // 2
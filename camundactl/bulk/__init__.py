@@ -0,0 +1,33 @@
+from camundactl.bulk.executor import (  # noqa
+    FAILED,
+    OK,
+    SKIPPED,
+    UNKNOWN,
+    BulkResult,
+    BulkStats,
+    SkipItem,
+    execute,
+)
+from camundactl.bulk.input import (  # noqa
+    INPUT_FORMATS,
+    InvalidInput,
+    detect_format,
+    read_rows,
+)
+from camundactl.bulk.payload import PayloadBuilder, create_validator  # noqa
+from camundactl.bulk.journal import (  # noqa
+    Journal,
+    JournalMismatch,
+    item_key,
+    list_journals,
+    open_journal,
+)
+from camundactl.bulk.batch import (  # noqa
+    BatchMonitor,
+    chunked,
+    count,
+    done_ids,
+    query_ids,
+    submit_chunks,
+    unknown_ids,
+)
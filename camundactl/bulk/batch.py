@@ -0,0 +1,214 @@
+import time
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Set
+
+from toolz import partition_all
+
+from camundactl.bulk.executor import BulkResult, BulkStats, execute
+from camundactl.bulk.journal import Journal
+from camundactl.client import Client
+from camundactl.client.paging import DEFAULT_PAGE_SIZE, iter_pages
+from camundactl.client.parallel import map_concurrent
+
+__all__ = [
+    "BatchMonitor",
+    "chunked",
+    "count",
+    "done_ids",
+    "query_ids",
+    "submit_chunks",
+    "unknown_ids",
+]
+
+# ids per batch submitted at once. the engine resolves and stores all
+# ids of a batch in the transaction of the request
+DEFAULT_CHUNK_SIZE = 5000
+
+# chunks submitted at once. creating a batch is expensive for the
+# engine, the batch jobs do the actual work
+DEFAULT_SUBMIT_CONCURRENCY = 2
+
+DEFAULT_BATCH_INTERVAL = 5.0
+
+COMPLETED, RUNNING, SUSPENDED, FAILING = "completed", "running", "suspended", "failing"
+
+
+def chunked(ids: Iterable[str], size: int) -> Iterator[List[str]]:
+    return map(list, partition_all(size, ids))
+
+
+def count(client: Client, path: str, query: Dict[str, Any]) -> int:
+    """
+    counts the objects of a posted query (e.g. `POST /process-instance/count`).
+    """
+    resp = client.post(f"{path}/count", json=query)
+    resp.raise_for_status()
+    return resp.json()["count"]
+
+
+def query_ids(
+    client: Client,
+    path: str,
+    query: Dict[str, Any],
+    sort_by: str,
+    exclude: Optional[Set[str]] = None,
+    predicate: Optional[Callable[[Dict], bool]] = None,
+    page_size: int = DEFAULT_PAGE_SIZE,
+) -> Iterator[str]:
+    """
+    yields the ids of the objects of a posted query page by page,
+    sorted by sort_by (the id) so the pages are stable. predicate
+    filters the objects by what the query does not support.
+    """
+    query = {**query, "sorting": [{"sortBy": sort_by, "sortOrder": "asc"}]}
+    for page in iter_pages(client, path, page_size=page_size, json=query):
+        for item in page:
+            if exclude and item["id"] in exclude:
+                continue
+            if predicate is None or predicate(item):
+                yield item["id"]
+
+
+def submit_chunks(
+    client: Client,
+    path: str,
+    selections: Iterable[Dict[str, Any]],
+    build: Callable[[Dict[str, Any]], Dict[str, Any]],
+    journal: Optional[Journal] = None,
+    concurrency: int = DEFAULT_SUBMIT_CONCURRENCY,
+    stats: Optional[BulkStats] = None,
+) -> Iterator[BulkResult]:
+    """
+    posts the payload built for every selection (the ids or the query
+    of the objects) to the async operation at path. the response of a
+    result is the created batch.
+    """
+    return execute(
+        selections,
+        lambda payload: client.post(path, json=payload),
+        prepare=build,
+        concurrency=concurrency,
+        stats=stats,
+        journal=journal,
+    )
+
+
+def done_ids(journal: Journal, ids_field: str) -> Set[str]:
+    """
+    returns the ids of the selections submitted by earlier runs of the
+    journaled operation.
+    """
+    return {
+        id_
+        for selection in journal.done_items()
+        for id_ in selection.get(ids_field) or ()
+    }
+
+
+def unknown_ids(journal: Journal, ids_field: str) -> Set[str]:
+    """
+    returns the ids of the selections in flight when an earlier run of
+    the journaled operation was interrupted.
+    """
+    return {
+        id_
+        for selection in journal.unknown_items()
+        for id_ in selection.get(ids_field) or ()
+    }
+
+
+class BatchMonitor:
+    """
+    tracks the progress of batches. batches are removed from the
+    runtime when they complete, their end is looked up in the history.
+    """
+
+    def __init__(self, client: Client, batch_ids: Iterable[str] = ()):
+        self.client = client
+        self.batch_ids: List[str] = list(batch_ids)
+        self._completed: Dict[str, Dict] = {}
+
+    def add(self, batch_id: str) -> None:
+        self.batch_ids.append(batch_id)
+
+    def _statistics(self, batch_id: str) -> Optional[Dict]:
+        resp = self.client.get("/batch/statistics", params={"batchId": batch_id})
+        resp.raise_for_status()
+        return next(iter(resp.json()), None)
+
+    def _historic(self, batch_id: str) -> Dict:
+        resp = self.client.get(f"/history/batch/{batch_id}")
+        if resp.status_code == 404:
+            # the history level does not record batches
+            return {"id": batch_id}
+        resp.raise_for_status()
+        return resp.json()
+
+    def poll(self) -> List[Dict[str, Any]]:
+        running = [id_ for id_ in self.batch_ids if id_ not in self._completed]
+        statistics = dict(zip(running, map_concurrent(self._statistics, running)))
+        missing = [id_ for id_, stat in statistics.items() if stat is None]
+        for historic in map_concurrent(self._historic, missing):
+            self._completed[historic["id"]] = _completed_row(historic)
+        rows = []
+        for batch_id in self.batch_ids:
+            if batch_id in self._completed:
+                rows.append(self._completed[batch_id])
+            elif statistics.get(batch_id):
+                rows.append(_running_row(statistics[batch_id]))
+        return rows
+
+    def wait(
+        self,
+        interval: float = DEFAULT_BATCH_INTERVAL,
+        on_progress: Optional[Callable[[List[Dict]], None]] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        polls the batches until all are completed or only their failed
+        jobs remain.
+        """
+        while True:
+            rows = self.poll()
+            if on_progress:
+                on_progress(rows)
+            if all(row["state"] in (COMPLETED, FAILING) for row in rows):
+                return rows
+            time.sleep(interval)
+
+
+def _running_row(stat: Dict) -> Dict[str, Any]:
+    total = stat.get("totalJobs") or 0
+    completed = stat.get("completedJobs") or 0
+    failed = stat.get("failedJobs") or 0
+    remaining = stat.get("remainingJobs") or 0
+    if stat.get("suspended"):
+        state = SUSPENDED
+    elif total and completed >= total and not remaining:
+        # the monitor job removes the batch soon
+        state = COMPLETED
+    elif failed and remaining <= failed:
+        state = FAILING
+    else:
+        state = RUNNING
+    return {
+        "batchId": stat["id"],
+        "type": stat.get("type"),
+        "state": state,
+        "totalJobs": total,
+        "completedJobs": completed,
+        "failedJobs": failed,
+        "remainingJobs": remaining,
+        "progress": f"{completed / total:.0%}" if total else None,
+    }
+
+
+def _completed_row(historic: Dict) -> Dict[str, Any]:
+    return {
+        "batchId": historic["id"],
+        "type": historic.get("type"),
+        "state": COMPLETED,
+        "totalJobs": historic.get("totalJobs"),
+        "completedJobs": historic.get("totalJobs"),
+        "failedJobs": 0,
+        "remainingJobs": 0,
+        "progress": "100%",
+    }
@@ -0,0 +1,101 @@
+from unittest.mock import Mock, patch
+
+from .batch import (
+    COMPLETED,
+    FAILING,
+    RUNNING,
+    BatchMonitor,
+    done_ids,
+    query_ids,
+    unknown_ids,
+)
+from .journal import Journal
+
+
+def _response(json_data, status_code=200) -> Mock:
+    return Mock(status_code=status_code, json=Mock(return_value=json_data))
+
+
+def test_query_ids():
+    client = Mock()
+    client.post.side_effect = [
+        _response([{"id": "a"}, {"id": "b"}]),
+        _response([{"id": "c"}]),
+    ]
+
+    ids = list(
+        query_ids(
+            client,
+            "/process-instance",
+            {"processDefinitionId": "p"},
+            "instanceId",
+            exclude={"b"},
+            page_size=2,
+        )
+    )
+
+    assert ids == ["a", "c"]
+    client.post.assert_called_with(
+        "/process-instance",
+        params={"firstResult": 2, "maxResults": 2},
+        json={
+            "processDefinitionId": "p",
+            "sorting": [{"sortBy": "instanceId", "sortOrder": "asc"}],
+        },
+    )
+
+
+def test_done_ids(tmp_path):
+    with patch("camundactl.bulk.journal.get_journal_dir", return_value=tmp_path):
+        journal = Journal.create("POST /migration/executeAsync", {})
+    journal.start("1:a", {"processInstanceIds": ["a", "b"]})
+    journal.start("2:b", {"processInstanceIds": ["c"]})
+    journal.finish("1:a", True)
+    journal.finish("2:b", False, "error")
+
+    assert done_ids(journal, "processInstanceIds") == {"a", "b"}
+
+
+def test_unknown_ids(tmp_path):
+    with patch("camundactl.bulk.journal.get_journal_dir", return_value=tmp_path):
+        journal = Journal.create("POST /migration/executeAsync", {})
+    journal.start("1:a", {"processInstanceIds": ["a", "b"]})
+    journal.start("2:b", {"processInstanceIds": ["c"]})
+    journal.finish("1:a", True)
+    journal.close()
+
+    journal = Journal.load(journal.path)
+    assert unknown_ids(journal, "processInstanceIds") == {"c"}
+
+
+def test_batch_monitor():
+    statistics = {
+        "b1": [],
+        "b2": [{"id": "b2", "totalJobs": 4, "completedJobs": 1, "remainingJobs": 3}],
+        "b3": [{"id": "b3", "totalJobs": 2, "completedJobs": 1, "failedJobs": 1}],
+    }
+
+    def get(path, params=None):
+        if path == "/batch/statistics":
+            return _response(statistics[params["batchId"]])
+        return _response({"id": path.rsplit("/", 1)[-1], "totalJobs": 5})
+
+    client = Mock()
+    client.get.side_effect = get
+    monitor = BatchMonitor(client, ["b1", "b2", "b3"])
+
+    rows = monitor.poll()
+    assert [(row["batchId"], row["state"]) for row in rows] == [
+        ("b1", COMPLETED),
+        ("b2", RUNNING),
+        ("b3", FAILING),
+    ]
+    assert rows[1]["progress"] == "25%"
+
+    # completed batches are not requested again
+    client.get.reset_mock()
+    statistics["b2"] = []
+    rows = monitor.wait(interval=0)
+    assert [row["state"] for row in rows] == [COMPLETED, COMPLETED, FAILING]
+    # b2 and b3 statistics, b2 history
+    assert client.get.call_count == 3
@@ -0,0 +1,299 @@
+import logging
+import random
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Iterable, Iterator, NamedTuple, Optional, Set
+
+from requests import Response
+from requests.exceptions import (
+    ConnectionError,
+    ConnectTimeout,
+    RequestException,
+    Timeout,
+)
+from urllib3.exceptions import NewConnectionError
+
+from camundactl.bulk.journal import Journal, item_key
+
+__all__ = [
+    "BulkResult",
+    "BulkStats",
+    "SkipItem",
+    "execute",
+    "OK",
+    "FAILED",
+    "SKIPPED",
+    "UNKNOWN",
+]
+
+logger = logging.getLogger(__name__)
+
+OK, FAILED, SKIPPED = "ok", "failed", "skipped"
+# items in flight when a journaled operation was interrupted. the engine
+# may have processed them, they are not sent again by default
+UNKNOWN = "unknown"
+
+# the concurrency controller of the client finds the concurrency the
+# engine copes with. this is the maximum
+DEFAULT_CONCURRENCY = 16
+
+DEFAULT_RETRIES = 5
+
+# status codes of overloaded engines which did not process the request.
+# the request is sent again after a backoff. a 502 or 504 of a proxy does
+# not tell whether the engine processed it
+RETRY_STATUS_CODES = (429, 503)
+
+IN_FLIGHT = (
+    "in flight when the operation was interrupted. "
+    "check the item and resend it with --resend-in-flight"
+)
+
+INITIAL_BACKOFF = 0.5
+MAX_BACKOFF = 30.0
+
+
+class SkipItem(Exception):
+    """
+    raised by the prepare function for items which are not sent (e.g.
+    an invalid payload).
+    """
+
+
+class BulkResult(NamedTuple):
+    # position of the item in the input (starting with 1)
+    index: int
+    item: Any
+    status: str
+    attempts: int
+    http_status: Optional[int] = None
+    response: Any = None
+    error: Optional[str] = None
+
+
+class BulkStats:
+    """
+    counts the results and the requests sent per second.
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic):
+        self._clock = clock
+        self._lock = threading.Lock()
+        self.started = clock()
+        self.requests = 0
+        self.retries = 0
+        # items finished by an earlier run of a resumed operation
+        self.resumed = 0
+        self.results: Dict[str, int] = {OK: 0, FAILED: 0, SKIPPED: 0}
+        # items in flight when the earlier run was interrupted
+        self.unknown = 0
+
+    def add_request(self, retry: bool) -> None:
+        with self._lock:
+            self.requests += 1
+            self.retries += retry
+
+    def add_result(self, status: str) -> None:
+        with self._lock:
+            self.results[status] += 1
+
+    def add_resumed(self) -> None:
+        with self._lock:
+            self.resumed += 1
+
+    def add_unknown(self) -> None:
+        with self._lock:
+            self.unknown += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            seconds = self._clock() - self.started
+            return {
+                **self.results,
+                **({"resumed": self.resumed} if self.resumed else {}),
+                **({"unknown": self.unknown} if self.unknown else {}),
+                "requests": self.requests,
+                "retries": self.retries,
+                "seconds": round(seconds, 1),
+                "requests/s": round(self.requests / seconds, 1) if seconds else None,
+            }
+
+
+class _Backoff:
+    """
+    a backoff shared by all threads. an overloaded engine pauses all
+    requests, not only the failing one. the pause doubles with every
+    failure in a row and is reset by a success.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._delay = 0.0
+        self._resume_at = 0.0
+
+    def wait(self) -> None:
+        with self._lock:
+            pause = self._resume_at - time.monotonic()
+        if pause > 0:
+            time.sleep(pause)
+
+    def failed(self) -> float:
+        with self._lock:
+            self._delay = min(max(self._delay * 2, INITIAL_BACKOFF), MAX_BACKOFF)
+            # jitter, so the threads do not resume all at once
+            delay = self._delay * random.uniform(0.5, 1.0)
+            self._resume_at = max(self._resume_at, time.monotonic() + delay)
+            return delay
+
+    def succeeded(self) -> None:
+        with self._lock:
+            self._delay = 0.0
+
+
+def _response_body(resp: Response) -> Any:
+    if "application/json" in (resp.headers.get("Content-Type") or ""):
+        try:
+            return resp.json()
+        except ValueError:
+            pass
+    return resp.text or None
+
+
+def _error_message(resp: Response) -> str:
+    body = _response_body(resp)
+    if isinstance(body, dict) and body.get("message"):
+        return body["message"]
+    return f"{resp.status_code} {resp.reason}"
+
+
+def _not_sent(error: RequestException) -> bool:
+    """
+    tests whether the request did not reach the engine (the connection
+    could not be established). the requests are not idempotent, only
+    these are sent again.
+    """
+    if isinstance(error, ConnectTimeout):
+        return True
+    reason = error.args[0] if error.args else None
+    return isinstance(getattr(reason, "reason", reason), NewConnectionError)
+
+
+def _send(
+    index: int,
+    item: Any,
+    prepare: Optional[Callable[[Any], Any]],
+    send: Callable[[Any], Response],
+    retries: int,
+    backoff: _Backoff,
+    stats: BulkStats,
+) -> BulkResult:
+    try:
+        payload = prepare(item) if prepare else item
+    except SkipItem as error:
+        return BulkResult(index, item, SKIPPED, 0, error=str(error))
+    attempts = 0
+    while True:
+        backoff.wait()
+        attempts += 1
+        stats.add_request(retry=attempts > 1)
+        try:
+            resp = send(payload)
+        except (ConnectionError, Timeout) as error:
+            if attempts > retries or not _not_sent(error):
+                return BulkResult(index, item, FAILED, attempts, error=str(error))
+            logger.debug("item %d: %s. retry in %.1fs", index, error, backoff.failed())
+            continue
+
+        if resp.status_code in RETRY_STATUS_CODES and attempts <= retries:
+            logger.debug(
+                "item %d: %s. retry in %.1fs", index, resp.status_code, backoff.failed()
+            )
+            continue
+        backoff.succeeded()
+        if resp.status_code >= 400:
+            return BulkResult(
+                index,
+                item,
+                FAILED,
+                attempts,
+                resp.status_code,
+                error=_error_message(resp),
+            )
+        return BulkResult(
+            index, item, OK, attempts, resp.status_code, _response_body(resp)
+        )
+
+
+def execute(
+    items: Iterable[Any],
+    send: Callable[[Any], Response],
+    prepare: Optional[Callable[[Any], Any]] = None,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    retries: int = DEFAULT_RETRIES,
+    stats: Optional[BulkStats] = None,
+    journal: Optional[Journal] = None,
+    key: Callable[[int, Any], str] = item_key,
+    resend_in_flight: bool = False,
+) -> Iterator[BulkResult]:
+    """
+    sends every item (or its payload returned by prepare) with send
+    using concurrency threads and yields the results as they finish.
+    only a few items more than threads are read ahead, so the items
+    can be streamed from huge files.
+
+    requests which did not reach the engine (the connection could not
+    be established) and overloaded engines (429, 503) are retried after
+    a backoff shared by all threads. other errors (e.g. read timeouts)
+    fail the item, the engine may have processed it.
+
+    with a journal every item is logged when sent and when finished.
+    items the journal knows as done (identified by key) are skipped,
+    so an interrupted operation resumes with its journal. items in
+    flight when it was interrupted are yielded as UNKNOWN and not sent
+    again, unless resend_in_flight.
+    """
+    stats = stats or BulkStats()
+    backoff = _Backoff()
+    items_iter = enumerate(items, 1)
+    pending: Set[Future] = set()
+    exhausted = False
+
+    keys: Dict[Future, str] = {}
+
+    def record(future: Future) -> BulkResult:
+        result = future.result()
+        stats.add_result(result.status)
+        if journal:
+            journal.finish(keys.pop(future), result.status == OK, result.error)
+        return result
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        while True:
+            while not exhausted and len(pending) < concurrency * 2:
+                try:
+                    index, item = next(items_iter)
+                except StopIteration:
+                    exhausted = True
+                    break
+                if journal:
+                    item_id = key(index, item)
+                    if journal.is_done(item_id):
+                        stats.add_resumed()
+                        continue
+                    if journal.is_unknown(item_id) and not resend_in_flight:
+                        stats.add_unknown()
+                        yield BulkResult(index, item, UNKNOWN, 0, error=IN_FLIGHT)
+                        continue
+                    journal.start(item_id, item)
+                future = executor.submit(
+                    _send, index, item, prepare, send, retries, backoff, stats
+                )
+                if journal:
+                    keys[future] = item_id
+                pending.add(future)
+            if not pending:
+                return
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in sorted(done, key=lambda f: f.result().index):
+                yield record(future)
@@ -0,0 +1,97 @@
+import threading
+from unittest.mock import Mock, patch
+
+from requests.exceptions import ConnectionError, ReadTimeout
+from urllib3.exceptions import MaxRetryError, NewConnectionError
+
+from .executor import FAILED, OK, SKIPPED, BulkStats, SkipItem, execute
+
+
+def _response(status_code: int, json_data=None) -> Mock:
+    return Mock(
+        status_code=status_code,
+        headers={"Content-Type": "application/json"} if json_data else {},
+        json=Mock(return_value=json_data),
+        text="",
+        reason="reason",
+    )
+
+
+def test_execute():
+    def send(item):
+        if item == 3:
+            return _response(400, {"message": "no match"})
+        return _response(200, {"id": item})
+
+    def prepare(item):
+        if item == 4:
+            raise SkipItem("invalid")
+        return item
+
+    stats = BulkStats()
+    results = sorted(
+        execute(range(1, 11), send, prepare, concurrency=3, stats=stats),
+        key=lambda r: r.index,
+    )
+
+    assert [r.index for r in results] == list(range(1, 11))
+    assert results[0].status == OK and results[0].response == {"id": 1}
+    assert (results[2].status, results[2].error) == (FAILED, "no match")
+    assert (results[3].status, results[3].attempts) == (SKIPPED, 0)
+    snapshot = stats.snapshot()
+    assert (snapshot[OK], snapshot[FAILED], snapshot[SKIPPED]) == (8, 1, 1)
+    assert snapshot["requests"] == 9
+
+
+@patch("camundactl.bulk.executor.INITIAL_BACKOFF", 0.01)
+def test_execute_retries():
+    calls = []
+    lock = threading.Lock()
+
+    def send(item):
+        with lock:
+            calls.append(item)
+            count = calls.count(item)
+        if item == 1 and count < 3:
+            return _response(503)
+        if item == 2:
+            raise ConnectionError(
+                MaxRetryError(None, "/", NewConnectionError(None, "refused"))
+            )
+        if item == 4:
+            raise ReadTimeout("read timed out")
+        if item == 5:
+            raise ConnectionError("connection reset")
+        if item == 6:
+            return _response(502)
+        return _response(204)
+
+    results = {r.index: r for r in execute([1, 2, 3, 4, 5, 6], send, retries=2)}
+
+    assert (results[1].status, results[1].attempts) == (OK, 3)
+    assert (results[2].status, results[2].attempts) == (FAILED, 3)
+    assert results[3].status == OK
+    # the engine may have processed these, they are not sent again
+    assert (results[4].status, results[4].attempts) == (FAILED, 1)
+    assert results[4].error == "read timed out"
+    assert (results[5].status, results[5].attempts) == (FAILED, 1)
+    assert (results[6].status, results[6].attempts, results[6].http_status) == (
+        FAILED,
+        1,
+        502,
+    )
+
+
+def test_execute_reads_ahead_lazily():
+    consumed = []
+
+    def items():
+        for i in range(100):
+            consumed.append(i)
+            yield i
+
+    results = execute(items(), lambda item: _response(204), concurrency=2)
+    next(results)
+    # only a few items more than threads are read
+    assert len(consumed) <= 5
+    results.close()
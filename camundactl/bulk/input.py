@@ -0,0 +1,48 @@
+import csv
+import json
+from pathlib import Path
+from typing import IO, Any, Dict, Iterator, Optional
+
+__all__ = ["INPUT_FORMATS", "InvalidInput", "detect_format", "read_rows"]
+
+INPUT_FORMATS = ("ndjson", "csv")
+
+
+class InvalidInput(Exception):
+    pass
+
+
+def detect_format(filename: Optional[str]) -> str:
+    """
+    returns the format by the extension of the file. stdin and unknown
+    extensions are read as ndjson.
+    """
+    if filename and Path(filename).suffix.lower() == ".csv":
+        return "csv"
+    return "ndjson"
+
+
+def _read_ndjson(fh: IO[str]) -> Iterator[Dict[str, Any]]:
+    for number, line in enumerate(fh, 1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError as error:
+            raise InvalidInput(f"line {number} is no valid json: {error}")
+        if not isinstance(row, dict):
+            raise InvalidInput(f"line {number} is no json object")
+        yield row
+
+
+def read_rows(fh: IO[str], input_format: str = "ndjson") -> Iterator[Dict[str, Any]]:
+    """
+    reads the rows of the file one by one, so huge files are not
+    loaded at once. csv rows use the header as keys.
+    """
+    if input_format == "csv":
+        yield from csv.DictReader(fh)
+    elif input_format == "ndjson":
+        yield from _read_ndjson(fh)
+    else:
+        raise InvalidInput(f"unknown input format {input_format}")
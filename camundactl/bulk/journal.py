@@ -0,0 +1,218 @@
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import IO, Any, Dict, Iterator, List, Optional, Set
+
+from camundactl.config import get_configdir
+
+__all__ = [
+    "Journal",
+    "JournalMismatch",
+    "get_journal_dir",
+    "item_key",
+    "list_journals",
+    "open_journal",
+]
+
+# the journal is synced to disk after this number of records
+SYNC_EVERY = 100
+
+
+class JournalMismatch(Exception):
+    pass
+
+
+def _normalize(params: Dict[str, Any]) -> Dict[str, Any]:
+    # the params as read from the journal (e.g. tuples become lists)
+    return json.loads(json.dumps(params, default=str))
+
+
+def get_journal_dir() -> Path:
+    return get_configdir() / "journals"
+
+
+def item_key(index: int, item: Any) -> str:
+    """
+    identifies an item of an input file by its position and content,
+    so a changed file does not skip the wrong items on resume.
+    """
+    content = json.dumps(item, sort_keys=True, default=str)
+    return f"{index}:{hashlib.sha1(content.encode()).hexdigest()[:12]}"
+
+
+class Journal:
+    """
+    an append-only ndjson log of a bulk operation. the first line
+    describes the operation, every item is logged when it is sent
+    (`start`) and when it is finished (`done` or `failed`). items
+    started but not finished were in flight when the operation was
+    interrupted. the engine may have processed them, a resumed
+    operation knows them as unknown.
+    """
+
+    def __init__(self, path: Path, operation: str, params: Dict[str, Any]):
+        self.path = path
+        self.operation = operation
+        self.params = _normalize(params)
+        self.done: Set[str] = set()
+        self.failed: Dict[str, Optional[str]] = {}
+        self.in_flight: Set[str] = set()
+        self.unknown: Set[str] = set()
+        self._lock = threading.Lock()
+        self._fh: Optional[IO[str]] = None
+        self._unsynced = 0
+
+    @classmethod
+    def create(cls, operation: str, params: Dict[str, Any]) -> "Journal":
+        directory = get_journal_dir()
+        directory.mkdir(parents=True, exist_ok=True)
+        name = re.sub(r"[^\w.]+", "-", operation).strip("-").lower()
+        path = directory / f"{datetime.now():%Y%m%d-%H%M%S}-{name}.ndjson"
+        journal = cls(path, operation, params)
+        journal._write(
+            {
+                "type": "header",
+                "operation": operation,
+                "params": params,
+                "created": time.time(),
+            }
+        )
+        return journal
+
+    @classmethod
+    def load(cls, path: Path) -> "Journal":
+        """
+        reads the state of a journal to resume its operation. records
+        cut off by an interruption are ignored.
+        """
+        journal = None
+        with open(path, "r") as fh:
+            for line in fh:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                if record["type"] == "header":
+                    journal = cls(path, record["operation"], record["params"])
+                elif journal is not None:
+                    journal._apply(record)
+        if journal is None:
+            raise JournalMismatch(f"{path} is no journal")
+        journal.unknown = set(journal.in_flight)
+        return journal
+
+    def check(self, operation: str, params: Dict[str, Any]) -> None:
+        if operation != self.operation or _normalize(params) != self.params:
+            raise JournalMismatch(
+                f"the journal {self.path} belongs to another operation "
+                f"({self.operation} {json.dumps(self.params)})"
+            )
+
+    def _apply(self, record: Dict) -> None:
+        key = record["key"]
+        if record["type"] == "start":
+            self.in_flight.add(key)
+            return
+        self.in_flight.discard(key)
+        if record["type"] == "done":
+            self.done.add(key)
+            self.failed.pop(key, None)
+        else:
+            self.failed[key] = record.get("error")
+
+    def _write(self, record: Dict) -> None:
+        with self._lock:
+            if self._fh is None:
+                self._fh = open(self.path, "a")
+            self._fh.write(json.dumps(record, default=str) + "\n")
+            self._fh.flush()
+            self._unsynced += 1
+            if self._unsynced >= SYNC_EVERY:
+                os.fsync(self._fh.fileno())
+                self._unsynced = 0
+            if record["type"] != "header":
+                self._apply(record)
+
+    def start(self, key: str, item: Any) -> None:
+        self._write({"type": "start", "key": key, "item": item})
+
+    def finish(self, key: str, ok: bool, error: Optional[str] = None) -> None:
+        if ok:
+            self._write({"type": "done", "key": key})
+        else:
+            self._write({"type": "failed", "key": key, "error": error})
+
+    def is_done(self, key: str) -> bool:
+        return key in self.done
+
+    def is_unknown(self, key: str) -> bool:
+        return key in self.unknown
+
+    def done_items(self) -> Iterator[Any]:
+        """
+        reads the items done from the journal (they are not kept in
+        memory).
+        """
+        return self._read_items(self.done)
+
+    def unknown_items(self) -> Iterator[Any]:
+        return self._read_items(self.unknown)
+
+    def _read_items(self, keys: Set[str]) -> Iterator[Any]:
+        seen: Set[str] = set()
+        with open(self.path, "r") as fh:
+            for line in fh:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                key = record.get("key")
+                if record["type"] == "start" and key in keys and key not in seen:
+                    seen.add(key)
+                    yield record["item"]
+
+    def progress(self) -> Dict[str, Any]:
+        return {
+            "journal": str(self.path),
+            "operation": self.operation,
+            "done": len(self.done),
+            "failed": len(self.failed),
+            "inFlight": len(self.in_flight),
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            if self._fh is not None:
+                self._fh.flush()
+                os.fsync(self._fh.fileno())
+                self._fh.close()
+                self._fh = None
+
+
+def list_journals() -> List[Path]:
+    directory = get_journal_dir()
+    if not directory.exists():
+        return []
+    return sorted(directory.glob("*.ndjson"))
+
+
+def open_journal(
+    resume: Optional[str], operation: str, params: Dict[str, Any]
+) -> Journal:
+    """
+    creates the journal of a new operation or loads the journal to
+    resume (a path or the name of a file in the journal directory).
+    """
+    if not resume:
+        return Journal.create(operation, params)
+    path = Path(resume)
+    if not path.exists() and (get_journal_dir() / resume).exists():
+        path = get_journal_dir() / resume
+    journal = Journal.load(path)
+    journal.check(operation, params)
+    return journal
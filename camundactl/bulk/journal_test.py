@@ -0,0 +1,123 @@
+from unittest.mock import Mock, patch
+
+import pytest
+
+from .executor import FAILED, OK, UNKNOWN, execute
+from .journal import Journal, JournalMismatch, item_key, open_journal
+
+
+@pytest.fixture
+def journal_dir(tmp_path):
+    with patch("camundactl.bulk.journal.get_journal_dir", return_value=tmp_path):
+        yield tmp_path
+
+
+def _send_failing(*failing):
+    def send(item):
+        return Mock(
+            status_code=500 if item in failing else 204,
+            headers={},
+            text="",
+            reason="error",
+        )
+
+    return send
+
+
+def test_journal_records_progress(journal_dir):
+    journal = Journal.create("/message", {"defaults": ("a",)})
+    journal.start("1:a", {"x": 1})
+    journal.start("2:b", {"x": 2})
+    journal.start("3:c", {"x": 3})
+    journal.finish("1:a", True)
+    journal.finish("2:b", False, "boom")
+    journal.close()
+    # a record cut off by an interruption
+    with open(journal.path, "a") as fh:
+        fh.write('{"type": "do')
+
+    loaded = Journal.load(journal.path)
+    assert loaded.progress() == {
+        "journal": str(journal.path),
+        "operation": "/message",
+        "done": 1,
+        "failed": 1,
+        "inFlight": 1,
+    }
+    assert loaded.failed == {"2:b": "boom"}
+    loaded.check("/message", {"defaults": ("a",)})
+    with pytest.raises(JournalMismatch):
+        loaded.check("/message", {"defaults": ("b",)})
+
+
+def test_resume_skips_finished_items(journal_dir):
+    items = ["a", "b", "c", "d"]
+    journal = open_journal(None, "DELETE /job/{id}", {})
+    results = list(
+        execute(
+            items,
+            _send_failing("b"),
+            retries=0,
+            journal=journal,
+            key=lambda index, id_: id_,
+        )
+    )
+    journal.close()
+    assert sorted(r.status for r in results) == [FAILED, OK, OK, OK]
+
+    journal = open_journal(journal.path.name, "DELETE /job/{id}", {})
+    sent = []
+
+    def send(item):
+        sent.append(item)
+        return _send_failing()(item)
+
+    results = list(execute(items, send, journal=journal, key=lambda i, id_: id_))
+    assert sent == ["b"]
+    assert [r.status for r in results] == [OK]
+    assert journal.done == set(items) and not journal.failed
+
+
+def test_resume_skips_items_in_flight(journal_dir):
+    journal = open_journal(None, "DELETE /job/{id}", {})
+    journal.start("a", "a")
+    journal.start("b", "b")
+    journal.finish("a", True)
+    # interrupted while b was in flight
+    journal.close()
+
+    journal = open_journal(journal.path.name, "DELETE /job/{id}", {})
+    assert journal.unknown == {"b"}
+    assert list(journal.unknown_items()) == ["b"]
+    sent = []
+
+    def send(item):
+        sent.append(item)
+        return _send_failing()(item)
+
+    results = list(
+        execute(["a", "b", "c"], send, journal=journal, key=lambda i, id_: id_)
+    )
+    # the engine may have processed b
+    assert sent == ["c"]
+    assert [(r.item, r.status) for r in results] == [("b", UNKNOWN), ("c", OK)]
+    assert journal.in_flight == {"b"}
+
+    results = list(
+        execute(
+            ["a", "b", "c"],
+            send,
+            journal=journal,
+            key=lambda i, id_: id_,
+            resend_in_flight=True,
+        )
+    )
+    assert sent == ["c", "b"]
+    assert [r.status for r in results] == [OK]
+    assert not journal.in_flight
+
+
+def test_item_key():
+    assert item_key(1, {"a": 1, "b": 2}) == item_key(1, {"b": 2, "a": 1})
+    assert item_key(1, {"a": 1}) != item_key(2, {"a": 1})
+    assert item_key(1, {"a": 1}) != item_key(1, {"a": 2})
@@ -0,0 +1,106 @@
+import json
+import re
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from camundactl.client import Client
+from camundactl.config import get_configdir
+
+__all__ = [
+    "get_definition",
+    "get_plan",
+    "get_plan_file",
+    "validate_plan",
+]
+
+
+def get_definition(
+    client: Client,
+    key: str,
+    version: Optional[int] = None,
+    tenant_id: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    returns the process definition with key and version (default=the
+    latest version).
+    """
+    params: Dict[str, Any] = {"key": key}
+    if version is None:
+        params["latestVersion"] = "true"
+    else:
+        params["version"] = version
+    if tenant_id:
+        params["tenantIdIn"] = tenant_id
+    resp = client.get("/process-definition", params=params)
+    resp.raise_for_status()
+    definitions = resp.json()
+    if not definitions:
+        raise LookupError(
+            f"there is no process definition {key} in version {version or 'latest'}"
+        )
+    if len(definitions) > 1:
+        raise LookupError(
+            f"the process definition {key} exists in multiple tenants. "
+            "select one with --tenant-id"
+        )
+    return definitions[0]
+
+
+def get_plan_file(engine: str, source_id: str, target_id: str) -> Path:
+    name = re.sub(r"[^\w.-]+", "_", f"{engine}-{source_id}-{target_id}")
+    return get_configdir() / "migration-plans" / f"{name}.json"
+
+
+def get_plan(
+    client: Client,
+    engine: str,
+    source_id: str,
+    target_id: str,
+    update_event_triggers: bool = False,
+    regenerate: bool = False,
+) -> Tuple[Dict[str, Any], bool]:
+    """
+    returns the migration plan between two process definitions and if
+    it was cached. deployed definitions do not change, so the plan is
+    generated once and then read from the config dir.
+    """
+    plan_file = get_plan_file(engine, source_id, target_id)
+    if plan_file.exists() and not regenerate:
+        plan = json.loads(plan_file.read_text())
+        if plan.get("updateEventTriggers", False) == update_event_triggers:
+            return plan["plan"], True
+    resp = client.post(
+        "/migration/generate",
+        json={
+            "sourceProcessDefinitionId": source_id,
+            "targetProcessDefinitionId": target_id,
+            "updateEventTriggers": update_event_triggers,
+        },
+    )
+    resp.raise_for_status()
+    plan = resp.json()
+    plan_file.parent.mkdir(parents=True, exist_ok=True)
+    plan_file.write_text(
+        json.dumps({"updateEventTriggers": update_event_triggers, "plan": plan})
+    )
+    return plan, False
+
+
+def validate_plan(client: Client, plan: Dict[str, Any]) -> List[str]:
+    """
+    validates the plan against both definitions. returns the failures.
+    """
+    resp = client.post("/migration/validate", json=plan)
+    resp.raise_for_status()
+    report = resp.json()
+    failures = []
+    for instruction_report in report.get("instructionReports") or ():
+        instruction = instruction_report.get("instruction") or {}
+        source = ",".join(instruction.get("sourceActivityIds") or ())
+        target = ",".join(instruction.get("targetActivityIds") or ())
+        for failure in instruction_report.get("failures") or ():
+            failures.append(f"{source} -> {target}: {failure}")
+    for name, variable_report in (report.get("variableReports") or {}).items():
+        for failure in variable_report.get("failures") or ():
+            failures.append(f"variable {name}: {failure}")
+    return failures
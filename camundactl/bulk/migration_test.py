@@ -0,0 +1,41 @@
+from unittest.mock import Mock, patch
+
+from .migration import get_plan, validate_plan
+
+
+def test_get_plan_is_cached(tmp_path):
+    client = Mock()
+    client.post.return_value = Mock(json=Mock(return_value={"instructions": []}))
+
+    with patch("camundactl.bulk.migration.get_configdir", return_value=tmp_path):
+        assert get_plan(client, "local", "p:1", "p:2") == ({"instructions": []}, False)
+        assert get_plan(client, "local", "p:1", "p:2") == ({"instructions": []}, True)
+        # a plan with other options is generated again
+        get_plan(client, "local", "p:1", "p:2", update_event_triggers=True)
+
+    assert client.post.call_count == 2
+
+
+def test_validate_plan():
+    client = Mock()
+    client.post.return_value = Mock(
+        json=Mock(
+            return_value={
+                "instructionReports": [
+                    {
+                        "instruction": {
+                            "sourceActivityIds": ["a"],
+                            "targetActivityIds": ["b"],
+                        },
+                        "failures": ["not the same type"],
+                    }
+                ],
+                "variableReports": {"x": {"failures": ["cannot be set"]}},
+            }
+        )
+    )
+
+    assert validate_plan(client, {}) == [
+        "a -> b: not the same type",
+        "variable x: cannot be set",
+    ]
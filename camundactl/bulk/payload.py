@@ -0,0 +1,71 @@
+from typing import Any, Dict, Optional
+
+import jsonschema
+import yaml
+from jinja2 import Environment, StrictUndefined, TemplateError
+
+from camundactl.bulk.executor import SkipItem
+
+__all__ = ["PayloadBuilder", "create_validator"]
+
+
+def create_validator(spec: Dict, schema_name: str):
+    """
+    compiles the validator of a request schema of the openapi spec
+    once. the references of the schema are resolved in the spec.
+    """
+    schema = {
+        **spec["components"]["schemas"][schema_name],
+        "components": spec["components"],
+    }
+    validator_cls = jsonschema.validators.validator_for(schema)
+    return validator_cls(schema)
+
+
+class PayloadBuilder:
+    """
+    builds the request payloads of rows. a template (jinja2 rendering
+    yaml or json) gets the values of the row as variables and as `row`.
+    without a template the row is the payload. defaults are added to
+    every payload.
+    """
+
+    def __init__(
+        self,
+        template: Optional[str] = None,
+        defaults: Optional[Dict[str, Any]] = None,
+        validator=None,
+    ):
+        self.template = (
+            Environment(undefined=StrictUndefined).from_string(template)
+            if template
+            else None
+        )
+        self.defaults = defaults or {}
+        self.validator = validator
+
+    def build(self, row: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        returns the payload of the row. raises SkipItem if the row
+        can not be rendered or the payload is invalid.
+        """
+        if self.template:
+            try:
+                payload = yaml.safe_load(self.template.render(row=row, **row))
+            except (TemplateError, yaml.YAMLError) as error:
+                raise SkipItem(f"rendering the template failed: {error}")
+            if not isinstance(payload, dict):
+                raise SkipItem("the template does not render an object")
+        else:
+            payload = dict(row)
+        payload = {**self.defaults, **payload}
+        if self.validator is not None:
+            if error := jsonschema.exceptions.best_match(
+                self.validator.iter_errors(payload)
+            ):
+                location = ".".join(str(part) for part in error.absolute_path)
+                raise SkipItem(
+                    f"invalid payload: {error.message}"
+                    + (f" ({location})" if location else "")
+                )
+        return payload
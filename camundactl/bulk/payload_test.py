@@ -0,0 +1,42 @@
+import io
+
+import pytest
+
+from camundactl.openapi.loader import load_spec
+
+from .executor import SkipItem
+from .input import InvalidInput, detect_format, read_rows
+from .payload import PayloadBuilder, create_validator
+
+
+def test_read_rows():
+    assert detect_format("rows.CSV") == "csv"
+    assert detect_format(None) == "ndjson"
+    csv_rows = read_rows(io.StringIO("a,b\n1,2\n"), "csv")
+    assert list(csv_rows) == [{"a": "1", "b": "2"}]
+    ndjson_rows = read_rows(io.StringIO('{"a": 1}\n\n{"a": 2}\n'), "ndjson")
+    assert list(ndjson_rows) == [{"a": 1}, {"a": 2}]
+    with pytest.raises(InvalidInput):
+        list(read_rows(io.StringIO("[1]\n")))
+
+
+def test_payload_builder_template():
+    builder = PayloadBuilder(
+        "businessKey: {{ key }}\nprocessVariables: {a: {value: {{ row.a }}}}",
+        defaults={"messageName": "paid"},
+    )
+    assert builder.build({"key": "k1", "a": 1}) == {
+        "messageName": "paid",
+        "businessKey": "k1",
+        "processVariables": {"a": {"value": 1}},
+    }
+    with pytest.raises(SkipItem):
+        builder.build({"key": "k1"})
+
+
+def test_payload_builder_validation():
+    validator = create_validator(load_spec("latest"), "CorrelationMessageDto")
+    builder = PayloadBuilder(validator=validator)
+    assert builder.build({"messageName": "paid"}) == {"messageName": "paid"}
+    with pytest.raises(SkipItem, match="processVariables.a"):
+        builder.build({"messageName": "paid", "processVariables": {"a": 1}})
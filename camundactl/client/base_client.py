@@ -1,12 +1,25 @@
 from typing import Optional, overload, Union
 
-from requests import Session, session
+from requests import PreparedRequest, Session, session
+from requests.adapters import HTTPAdapter
 
+from camundactl.client.cache import HttpCache, get_resource
+from camundactl.client.coalesce import Coalescer
+from camundactl.client.concurrency import ConcurrencyController, get_controller
 from camundactl.config import ConfigDict, EngineDict
 
+# number of pooled connections per host. concurrent requests
+# (e.g. batched gets) share the session and its connections.
+DEFAULT_POOL_SIZE = 16
+
 
 def create_session(engine_config: EngineDict) -> Session:
     s = session()
+    adapter = HTTPAdapter(
+        pool_maxsize=max(DEFAULT_POOL_SIZE, engine_config.get("max_concurrency") or 0)
+    )
+    s.mount("http://", adapter)
+    s.mount("https://", adapter)
     auth = engine_config.get("auth")
     if auth:
         s.auth = (auth["user"], auth["password"])
@@ -16,33 +29,103 @@ def create_session(engine_config: EngineDict) -> Session:
 
 
 class Client:
-    def __init__(self, session: Session, base_url: str):
+    def __init__(
+        self,
+        session: Session,
+        base_url: str,
+        timeout: Optional[float] = None,
+        controller: Optional[ConcurrencyController] = None,
+        cache: Optional[HttpCache] = None,
+    ):
         self.base_url = base_url
         self.session = session
+        # default timeout in seconds for all requests (none waits forever)
+        self.timeout = timeout
+        # limits the concurrent requests (and requests per second)
+        self.controller = controller
+        # caches get responses (none disables the cache)
+        self.cache = cache
+        # identical gets sent concurrently are sent once
+        self.coalescer = Coalescer()
+
+    def _request(self, method: str, path: str, kwargs: dict):
+        kwargs.setdefault("timeout", self.timeout)
+        # requests waiting on purpose (e.g. long polling) are not limited
+        controlled = kwargs.pop("controlled", True)
+        send = getattr(self.session, method)
+        if self.controller is None or not controlled:
+            return send(self.base_url + path, **kwargs)
+        return self.controller.call(lambda: send(self.base_url + path, **kwargs))
+
+    def _cache_key(self, path: str, params) -> str:
+        """
+        the engine (url and user), path and params of a request.
+        """
+        if isinstance(params, dict):
+            params = sorted(params.items())
+        request = PreparedRequest()
+        request.prepare_url(self.base_url + path, params)
+        user = self.session.auth[0] if isinstance(self.session.auth, tuple) else ""
+        return f"{user}@{request.url}"
+
+    def _send_get(self, path: str, kwargs: dict, use_cache: bool):
+        if self.cache is None or not use_cache:
+            return self._request("get", path, kwargs)
+
+        def send(headers: dict):
+            headers = {**(kwargs.get("headers") or {}), **headers}
+            return self._request("get", path, {**kwargs, "headers": headers})
+
+        return self.cache.get(self._cache_key(path, kwargs.get("params")), path, send)
 
     def get(self, path: str, /, **kwargs):
-        return self.session.get(self.base_url + path, **kwargs)
+        # pass cache=False to bypass the cache for one request
+        use_cache = kwargs.pop("cache", True)
+        # streamed responses can be read once only and are not cached
+        # (the cache would read them into memory). headers are not part
+        # of the key
+        if kwargs.get("stream"):
+            return self._send_get(path, kwargs, False)
+        if kwargs.get("headers"):
+            return self._send_get(path, kwargs, use_cache)
+        return self.coalescer.call(
+            f"{use_cache} {self._cache_key(path, kwargs.get('params'))}",
+            lambda: self._send_get(path, kwargs, use_cache),
+        )
+
+    def _mutate(self, method: str, path: str, kwargs: dict):
+        try:
+            return self._request(method, path, kwargs)
+        finally:
+            if self.cache is not None:
+                self.cache.invalidate(self._cache_key(get_resource(path), None))
 
     def post(self, path, /, **kwargs):
-        return self.session.post(self.base_url + path, **kwargs)
+        return self._mutate("post", path, kwargs)
 
     def put(self, path, /, **kwargs):
-        return self.session.put(self.base_url + path, **kwargs)
+        return self._mutate("put", path, kwargs)
 
     def delete(self, path, /, **kwargs):
-        return self.session.delete(self.base_url + path, **kwargs)
+        return self._mutate("delete", path, kwargs)
 
 
 @overload
 def create_client(
-    engine_or_config: EngineDict, selected_engine: Optional[str] = None
+    engine_or_config: EngineDict,
+    selected_engine: Optional[str] = None,
+    timeout: Optional[float] = None,
+    cache: Optional[HttpCache] = None,
 ) -> Client:
     ...
 
 
 @overload
 def create_client(
-    engine_or_config: ConfigDict, selected_engine: Optional[str] = None
+    engine_or_config: ConfigDict,
+    selected_engine: Optional[str] = None,
+    timeout: Optional[float] = None,
+    cache: Optional[HttpCache] = None,
 ) -> Client:
     ...
 
@@ -50,6 +133,8 @@ def create_client(
 def create_client(
     engine_or_config: Union[ConfigDict, EngineDict],
     selected_engine: Optional[str] = None,
+    timeout: Optional[float] = None,
+    cache: Optional[HttpCache] = None,
 ) -> Client:
 
     if "engines" in engine_or_config:
@@ -69,4 +154,12 @@ def create_client(
     else:
         engine = engine_or_config
 
-    return Client(create_session(engine), engine["url"])
+    return Client(
+        create_session(engine),
+        engine["url"],
+        timeout=timeout or engine.get("timeout"),
+        controller=get_controller(
+            engine["url"], engine.get("max_concurrency"), engine.get("rps")
+        ),
+        cache=cache,
+    )
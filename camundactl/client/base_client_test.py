@@ -1,2 +1,20 @@
+from unittest.mock import Mock
+
+from .base_client import Client
+
+
 def test_foo():
     assert True
+
+
+def test_streamed_responses_are_not_cached():
+    session = Mock(auth=None)
+    cache = Mock()
+    client = Client(session, "http://engine", cache=cache)
+
+    client.get("/deployment/d1/resources/r1/data", stream=True)
+    cache.get.assert_not_called()
+    session.get.assert_called_once()
+
+    client.get("/deployment/d1/resources/r1/data")
+    cache.get.assert_called_once()
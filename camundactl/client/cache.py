@@ -0,0 +1,252 @@
+import json
+import logging
+import re
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict
+
+from requests import Response
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+from camundactl.config import get_configdir
+
+__all__ = [
+    "HttpCache",
+    "get_cache_file",
+    "get_resource",
+    "is_immutable",
+    "DEFAULT_MAX_SIZE",
+]
+
+logger = logging.getLogger(__name__)
+
+# megabytes
+DEFAULT_MAX_SIZE = 256
+
+# responses of these paths never change: definitions and deployments can
+# not be changed, only deleted (and ids are not reused). the definitions
+# themselves are not listed, they can be suspended.
+IMMUTABLE_PATHS = [
+    re.compile(pattern)
+    for pattern in (
+        r"^/(process|decision|case|decision-requirements)-definition/[^/]+/(xml|diagram)$",
+        r"^/deployment/[^/]+/resources/[^/]+(/data)?$",
+    )
+]
+
+# the headers kept with the response. the content is stored decoded, so
+# e.g. Content-Encoding and Content-Length are not kept
+KEPT_HEADERS = ("Content-Type", "Content-Disposition", "ETag", "Last-Modified")
+
+
+def get_cache_file() -> Path:
+    return get_configdir() / "http-cache.sqlite"
+
+
+def is_immutable(path: str) -> bool:
+    return any(pattern.match(path) for pattern in IMMUTABLE_PATHS)
+
+
+def get_resource(path: str) -> str:
+    """
+    returns the path of the resource of path, e.g. `/process-instance`
+    for `/process-instance/{id}/variables`.
+    """
+    segments = path.strip("/").split("/")
+    return "/" + "/".join(segments[: 2 if segments[0] == "history" else 1])
+
+
+def _response(url: str, headers: Dict[str, str], content: bytes) -> Response:
+    resp = Response()
+    resp.status_code = 200
+    resp.reason = "OK"
+    resp.url = url
+    resp.headers = CaseInsensitiveDict(headers)
+    resp.encoding = get_encoding_from_headers(resp.headers)
+    resp._content = content
+    resp._content_consumed = True
+    return resp
+
+
+class HttpCache:
+    """
+    on-disk cache of GET responses (sqlite). responses of immutable
+    paths are kept until they are evicted, the least recently used
+    first, when the cache exceeds max_size. other responses are kept if
+    they have an ETag or Last-Modified header and are revalidated with
+    a conditional request.
+
+    with a ttl (seconds) all responses are kept and answered from the
+    cache until they expire or a request changes their resource (see
+    `invalidate`).
+    """
+
+    def __init__(self, path: Path, max_size: int = DEFAULT_MAX_SIZE, ttl: float = 0):
+        self.path = path
+        self.max_size = max_size * 1024 * 1024
+        self.ttl = ttl
+        # one connection per thread, the schema is created once
+        self._local = threading.local()
+        self._schema_lock = threading.Lock()
+        self._schema_ready = False
+
+    def connect(self) -> sqlite3.Connection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            connection = sqlite3.connect(self.path, timeout=10)
+            connection.execute("PRAGMA journal_mode=WAL")
+            self._local.connection = connection
+        with self._schema_lock:
+            if not self._schema_ready:
+                self._create_schema(connection)
+                self._schema_ready = True
+        return connection
+
+    def _create_schema(self, connection: sqlite3.Connection) -> None:
+        with connection:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS response (key TEXT PRIMARY KEY, "
+                "url TEXT, headers TEXT, content BLOB, immutable INTEGER, "
+                "size INTEGER, accessed REAL, expires REAL)"
+            )
+            columns = [
+                row[1] for row in connection.execute("PRAGMA table_info(response)")
+            ]
+            if "expires" not in columns:
+                # caches created before responses could expire
+                connection.execute("ALTER TABLE response ADD COLUMN expires REAL")
+            connection.execute(
+                "CREATE INDEX IF NOT EXISTS response_accessed ON response (accessed)"
+            )
+
+    def get(
+        self, key: str, path: str, send: Callable[[Dict[str, str]], Response]
+    ) -> Response:
+        """
+        returns the cached response of key or sends the request (with
+        the additional headers passed to send) and caches it. errors of
+        the cache are logged, the request is sent then.
+        """
+        try:
+            return self._get(key, path, send)
+        except sqlite3.Error as error:
+            logger.warning("http cache failed: %s", error)
+            return send({})
+
+    def _get(
+        self, key: str, path: str, send: Callable[[Dict[str, str]], Response]
+    ) -> Response:
+        connection = self.connect()
+        row = connection.execute(
+            "SELECT url, headers, content, immutable, expires FROM response "
+            "WHERE key = ?",
+            (key,),
+        ).fetchone()
+        if row and (row[3] or (self.ttl and row[4] and row[4] > time.time())):
+            self._touch(connection, key)
+            return _response(row[0], json.loads(row[1]), row[2])
+
+        conditions = {}
+        if row:
+            headers = json.loads(row[1])
+            if etag := headers.get("ETag"):
+                conditions["If-None-Match"] = etag
+            if last_modified := headers.get("Last-Modified"):
+                conditions["If-Modified-Since"] = last_modified
+        resp = send(conditions)
+        if row and resp.status_code == 304:
+            self._touch(connection, key)
+            return _response(row[0], json.loads(row[1]), row[2])
+
+        immutable = is_immutable(path)
+        if resp.status_code == 200 and (
+            immutable
+            or self.ttl
+            or "ETag" in resp.headers
+            or "Last-Modified" in resp.headers
+        ):
+            self._store(connection, key, resp, immutable)
+        elif row:
+            with connection:
+                connection.execute("DELETE FROM response WHERE key = ?", (key,))
+        return resp
+
+    def _touch(self, connection: sqlite3.Connection, key: str) -> None:
+        with connection:
+            connection.execute(
+                "UPDATE response SET accessed = ? WHERE key = ?", (time.time(), key)
+            )
+
+    def _store(
+        self, connection: sqlite3.Connection, key: str, resp: Response, immutable: bool
+    ) -> None:
+        content = resp.content
+        if len(content) > self.max_size // 10:
+            return
+        headers = {
+            name: resp.headers[name] for name in KEPT_HEADERS if name in resp.headers
+        }
+        with connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO response VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    key,
+                    resp.url,
+                    json.dumps(headers),
+                    content,
+                    immutable,
+                    len(content),
+                    time.time(),
+                    time.time() + self.ttl if self.ttl and not immutable else None,
+                ),
+            )
+        self.evict(connection)
+
+    def evict(self, connection: sqlite3.Connection) -> int:
+        """
+        removes the least recently used responses until the cache is
+        smaller than max_size. returns the number of removed responses.
+        """
+        (size,) = connection.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM response"
+        ).fetchone()
+        if size <= self.max_size:
+            return 0
+        keys = []
+        for key, entry_size in connection.execute(
+            "SELECT key, size FROM response ORDER BY accessed"
+        ).fetchall():
+            if size <= self.max_size:
+                break
+            keys.append((key,))
+            size -= entry_size
+        with connection:
+            connection.executemany("DELETE FROM response WHERE key = ?", keys)
+        return len(keys)
+
+    def invalidate(self, prefix: str) -> None:
+        """
+        removes the expiring responses of keys starting with prefix,
+        followed by a path or the query. called after requests changing
+        the resource of prefix.
+        """
+        if not self.ttl:
+            # responses expire only with a ttl
+            return
+        try:
+            with self.connect() as connection:
+                connection.execute(
+                    "DELETE FROM response WHERE expires IS NOT NULL AND (key = ? "
+                    "OR substr(key, 1, ?) IN (? || '/', ? || '?'))",
+                    (prefix, len(prefix) + 1, prefix, prefix),
+                )
+        except sqlite3.Error as error:
+            logger.warning("http cache failed: %s", error)
+
+    def clear(self) -> None:
+        with self.connect() as connection:
+            connection.execute("DELETE FROM response")
@@ -0,0 +1,111 @@
+from unittest.mock import Mock
+
+from requests import Response
+
+from .cache import HttpCache, get_resource, is_immutable
+
+
+def _response(status_code=200, content=b"<xml/>", headers=None):
+    resp = Response()
+    resp.status_code = status_code
+    resp._content = content
+    resp.headers.update(headers or {})
+    resp.url = "http://engine/path"
+    return resp
+
+
+def test_is_immutable():
+    assert is_immutable("/process-definition/invoice:1:abc/xml")
+    assert is_immutable("/decision-definition/rules:2:abc/diagram")
+    assert is_immutable("/deployment/d1/resources/r1/data")
+    assert not is_immutable("/process-definition/key/invoice/xml")
+    assert not is_immutable("/process-definition/invoice:1:abc")
+    assert not is_immutable("/deployment/d1/resources")
+
+
+def test_immutable_responses_are_cached(tmp_path):
+    cache = HttpCache(tmp_path / "cache.sqlite")
+    send = Mock(return_value=_response())
+
+    for _ in range(2):
+        resp = cache.get("key", "/process-definition/p:1:a/xml", send)
+        assert resp.status_code == 200
+        assert resp.content == b"<xml/>"
+
+    send.assert_called_once_with({})
+
+
+def test_mutable_responses_are_revalidated(tmp_path):
+    cache = HttpCache(tmp_path / "cache.sqlite")
+    send = Mock(return_value=_response(content=b"[]", headers={"ETag": '"v1"'}))
+    cache.get("key", "/process-definition", send)
+
+    send.return_value = _response(304, b"")
+    resp = cache.get("key", "/process-definition", send)
+
+    send.assert_called_with({"If-None-Match": '"v1"'})
+    assert (resp.status_code, resp.content) == (200, b"[]")
+
+
+def test_responses_without_validators_are_not_cached(tmp_path):
+    cache = HttpCache(tmp_path / "cache.sqlite")
+    send = Mock(return_value=_response(content=b"[]"))
+
+    cache.get("key", "/process-definition", send)
+    cache.get("key", "/process-definition", send)
+
+    assert send.call_count == 2
+    assert send.call_args.args == ({},)
+
+
+def test_evict_least_recently_used(tmp_path):
+    cache = HttpCache(tmp_path / "cache.sqlite", max_size=1)
+    path = "/deployment/d1/resources/r1/data"
+    # eleven responses of 100kb exceed 1mb, the first one is used again
+    for key in [f"k{i}" for i in range(10)] + ["k0", "k10"]:
+        cache.get(key, path, Mock(return_value=_response(content=b"x" * 100_000)))
+
+    with cache.connect() as connection:
+        keys = {key for key, in connection.execute("SELECT key FROM response")}
+    assert len(keys) == 10
+    assert "k0" in keys and "k1" not in keys
+
+
+def test_get_resource():
+    assert get_resource("/process-instance/abc/variables") == "/process-instance"
+    assert get_resource("/history/process-instance/abc") == "/history/process-instance"
+
+
+def test_ttl(tmp_path):
+    cache = HttpCache(tmp_path / "cache.sqlite", ttl=60)
+    send = Mock(return_value=_response(content=b"[]"))
+
+    cache.get("u@http://engine/process-instance?a=1", "/process-instance", send)
+    cache.get("u@http://engine/process-instance?a=1", "/process-instance", send)
+    assert send.call_count == 1
+
+    cache.invalidate("u@http://engine/process-instance-other")
+    cache.get("u@http://engine/process-instance?a=1", "/process-instance", send)
+    assert send.call_count == 1
+
+    cache.invalidate("u@http://engine/process-instance")
+    cache.get("u@http://engine/process-instance?a=1", "/process-instance", send)
+    assert send.call_count == 2
+
+    # without a ttl the response is requested again
+    HttpCache(tmp_path / "cache.sqlite").get(
+        "u@http://engine/process-instance?a=1", "/process-instance", send
+    )
+    assert send.call_count == 3
+
+
+def test_connection_reused(tmp_path):
+    cache = HttpCache(tmp_path / "cache.sqlite", ttl=60)
+    assert cache.connect() is cache.connect()
+
+
+def test_invalidate_without_ttl(tmp_path):
+    cache = HttpCache(tmp_path / "cache.sqlite")
+    cache.invalidate("u@http://engine/process-instance")
+    # nothing expires without a ttl, so the database is not even created
+    assert not (tmp_path / "cache.sqlite").exists()
@@ -0,0 +1,41 @@
+import threading
+from concurrent.futures import Future
+from typing import Callable, Dict, TypeVar
+
+__all__ = ["Coalescer"]
+
+TResult = TypeVar("TResult")
+
+
+class Coalescer:
+    """
+    runs calls with the same key only once at a time. threads calling
+    while a call of the key is in flight wait for it and get its result
+    (or exception).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._in_flight: Dict[str, Future] = {}
+
+    def call(self, key: str, func: Callable[[], TResult]) -> TResult:
+        with self._lock:
+            future = self._in_flight.get(key)
+            if future is not None:
+                waiting = True
+            else:
+                waiting = False
+                future = self._in_flight[key] = Future()
+        if waiting:
+            return future.result()
+        try:
+            result = func()
+        except BaseException as error:
+            future.set_exception(error)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                del self._in_flight[key]
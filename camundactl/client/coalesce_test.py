@@ -0,0 +1,41 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from .coalesce import Coalescer
+
+
+def test_coalesce_in_flight_calls():
+    coalescer = Coalescer()
+    started, release = threading.Event(), threading.Event()
+    calls = []
+
+    def func():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return "result"
+
+    with ThreadPoolExecutor(4) as executor:
+        first = executor.submit(coalescer.call, "key", func)
+        started.wait(5)
+        others = [executor.submit(coalescer.call, "key", func) for _ in range(3)]
+        release.set()
+        results = [first.result()] + [other.result() for other in others]
+
+    assert results == ["result"] * 4
+    assert len(calls) == 1
+    # finished calls are not reused
+    assert coalescer.call("key", lambda: "next") == "next"
+
+
+def test_coalesce_exception():
+    coalescer = Coalescer()
+
+    def func():
+        raise ValueError("failed")
+
+    with pytest.raises(ValueError):
+        coalescer.call("key", func)
+    assert coalescer.call("key", lambda: 1) == 1
@@ -0,0 +1,196 @@
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, TypeVar
+
+from requests.exceptions import ConnectionError, HTTPError, Timeout
+
+__all__ = ["ConcurrencyController", "RateLimiter", "get_controller"]
+
+logger = logging.getLogger(__name__)
+
+# requests sent at once to a new engine. grows while the engine is healthy
+DEFAULT_INITIAL_CONCURRENCY = 4
+
+# keep this at the connection pool size of the session
+DEFAULT_MAX_CONCURRENCY = 16
+
+# the limit is multiplied by this factor if the engine is overloaded
+DECREASE_FACTOR = 0.5
+
+# the engine is overloaded if the p95 latency of a window of requests
+# exceeds the best p95 latency seen by this factor
+LATENCY_TOLERANCE = 2.0
+
+# the best latency seen grows by this factor with every window, so
+# the controller adapts to engines getting slower permanently
+BASELINE_DRIFT = 1.05
+
+MIN_WINDOW_SIZE = 5
+
+TResult = TypeVar("TResult")
+
+
+class RateLimiter:
+    """
+    spaces the requests evenly to at most rps requests per second.
+    """
+
+    def __init__(self, rps: float, clock: Callable[[], float] = time.monotonic):
+        if rps <= 0:
+            raise ValueError("rps must be positive")
+        self.interval = 1 / rps
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._next = 0.0
+
+    def acquire(self) -> float:
+        """
+        waits for the next free slot. returns the seconds waited.
+        """
+        with self._lock:
+            now = self._clock()
+            at = max(now, self._next)
+            self._next = at + self.interval
+        if at > now:
+            time.sleep(at - now)
+        return at - now
+
+
+def _is_overload(status_code: Optional[int]) -> bool:
+    return status_code is not None and (status_code >= 500 or status_code == 429)
+
+
+def _percentile(values: List[float], p: float) -> float:
+    values = sorted(values)
+    return values[min(int(len(values) * p), len(values) - 1)]
+
+
+class ConcurrencyController:
+    """
+    limits the requests sent to one engine at once (additive increase,
+    multiplicative decrease). the limit grows by one with every window
+    of limit requests with healthy latency and is halved on server
+    errors (5xx, 429), timeouts, lost connections or a p95 latency
+    rising above LATENCY_TOLERANCE times the best one seen. only
+    requests started after the last decrease can decrease it again.
+    """
+
+    def __init__(
+        self,
+        initial: int = DEFAULT_INITIAL_CONCURRENCY,
+        min_limit: int = 1,
+        max_limit: int = DEFAULT_MAX_CONCURRENCY,
+        rps: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.min_limit = min_limit
+        self.max_limit = max(max_limit, min_limit)
+        self.limit = float(min(max(initial, min_limit), self.max_limit))
+        self.rate_limiter = RateLimiter(rps, clock) if rps else None
+        self._clock = clock
+        self._changed = threading.Condition()
+        self._in_flight = 0
+        self._sequence = 0
+        self._decreased_at = 0
+        self._window: List[float] = []
+        self._baseline: Optional[float] = None
+        self.decreases = 0
+
+    def acquire(self) -> int:
+        """
+        waits for a free slot and returns its ticket for `release`.
+        """
+        with self._changed:
+            while self._in_flight >= int(self.limit):
+                self._changed.wait()
+            self._in_flight += 1
+            self._sequence += 1
+            ticket = self._sequence
+        if self.rate_limiter:
+            self.rate_limiter.acquire()
+        return ticket
+
+    def release(self, ticket: int, latency: float, overloaded: bool) -> None:
+        with self._changed:
+            self._in_flight -= 1
+            if overloaded:
+                self._decrease(ticket, "server overloaded")
+            else:
+                self._window.append(latency)
+                if len(self._window) >= max(int(self.limit), MIN_WINDOW_SIZE):
+                    self._close_window(ticket)
+            self._changed.notify_all()
+
+    def _close_window(self, ticket: int) -> None:
+        p95 = _percentile(self._window, 0.95)
+        self._window = []
+        if self._baseline is None:
+            self._baseline = p95
+        else:
+            self._baseline = min(p95, self._baseline * BASELINE_DRIFT)
+        if p95 > self._baseline * LATENCY_TOLERANCE:
+            self._decrease(ticket, f"p95 latency {p95 * 1000:.0f}ms")
+        elif self.limit < self.max_limit:
+            self.limit = min(self.limit + 1, self.max_limit)
+            logger.debug("increased concurrency to %d", self.limit)
+
+    def _decrease(self, ticket: int, reason: str) -> None:
+        if ticket <= self._decreased_at:
+            # sent with the old limit. the decrease did not work yet
+            return
+        self.limit = max(self.limit * DECREASE_FACTOR, self.min_limit)
+        self._decreased_at = self._sequence
+        self._window = []
+        self.decreases += 1
+        logger.debug("decreased concurrency to %d (%s)", self.limit, reason)
+
+    def call(self, func: Callable[[], TResult]) -> TResult:
+        """
+        calls func (sending one request) within a slot. the response
+        (or the raised exception) tells if the engine is overloaded.
+        """
+        ticket = self.acquire()
+        start = self._clock()
+        overloaded = False
+        try:
+            result = func()
+            overloaded = _is_overload(getattr(result, "status_code", None))
+            return result
+        except HTTPError as error:
+            overloaded = _is_overload(getattr(error.response, "status_code", None))
+            raise
+        except (ConnectionError, Timeout):
+            overloaded = True
+            raise
+        finally:
+            self.release(ticket, self._clock() - start, overloaded)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._changed:
+            return {
+                "concurrency": int(self.limit),
+                "inFlight": self._in_flight,
+                "decreases": self.decreases,
+            }
+
+
+_controllers: Dict[str, ConcurrencyController] = {}
+_controllers_lock = threading.Lock()
+
+
+def get_controller(
+    url: str,
+    max_limit: Optional[int] = None,
+    rps: Optional[float] = None,
+) -> ConcurrencyController:
+    """
+    returns the controller of the engine at url. all clients of an
+    engine share it (e.g. clients with different timeouts).
+    """
+    with _controllers_lock:
+        if url not in _controllers:
+            _controllers[url] = ConcurrencyController(
+                max_limit=max_limit or DEFAULT_MAX_CONCURRENCY, rps=rps
+            )
+        return _controllers[url]
@@ -0,0 +1,96 @@
+import threading
+from unittest.mock import Mock
+
+import pytest
+from requests.exceptions import Timeout
+
+from .base_client import Client
+from .concurrency import ConcurrencyController, RateLimiter
+
+
+def _healthy_window(controller: ConcurrencyController, latency: float = 0.01):
+    tickets = [controller.acquire() for _ in range(int(controller.limit))]
+    for ticket in tickets:
+        controller.release(ticket, latency, overloaded=False)
+
+
+def test_additive_increase():
+    controller = ConcurrencyController(initial=5, max_limit=7)
+    _healthy_window(controller)
+    assert controller.limit == 6
+    _healthy_window(controller)
+    _healthy_window(controller)
+    assert controller.limit == 7
+
+
+def test_multiplicative_decrease():
+    controller = ConcurrencyController(initial=8)
+    tickets = [controller.acquire() for _ in range(8)]
+    controller.release(tickets[0], 0.01, overloaded=True)
+    assert controller.limit == 4
+    # the requests sent before the decrease do not decrease again
+    controller.release(tickets[1], 0.01, overloaded=True)
+    assert controller.limit == 4
+
+    for ticket in tickets[2:]:
+        controller.release(ticket, 0.01, overloaded=False)
+    ticket = controller.acquire()
+    controller.release(ticket, 0.01, overloaded=True)
+    assert controller.snapshot() == {"concurrency": 2, "inFlight": 0, "decreases": 2}
+
+
+def test_decrease_on_rising_latency():
+    controller = ConcurrencyController(initial=5)
+    _healthy_window(controller, 0.01)
+    assert controller.limit == 6
+    _healthy_window(controller, 0.1)
+    assert controller.limit == 3
+
+
+def test_acquire_waits_for_free_slot():
+    controller = ConcurrencyController(initial=1)
+    ticket = controller.acquire()
+    acquired = threading.Event()
+    thread = threading.Thread(target=lambda: (controller.acquire(), acquired.set()))
+    thread.start()
+    assert not acquired.wait(0.1)
+    controller.release(ticket, 0.01, overloaded=False)
+    assert acquired.wait(1)
+    thread.join()
+
+
+def test_call_classifies_outcomes():
+    controller = ConcurrencyController(initial=8)
+    assert controller.call(lambda: Mock(status_code=200)).status_code == 200
+    assert controller.limit == 8
+    controller.call(lambda: Mock(status_code=503))
+    assert controller.limit == 4
+
+    def timeout():
+        raise Timeout()
+
+    with pytest.raises(Timeout):
+        controller.call(timeout)
+    assert controller.limit == 2
+
+
+def test_rate_limiter():
+    now = [0.0]
+    limiter = RateLimiter(rps=4, clock=lambda: now[0])
+    assert limiter.acquire() == 0
+    now[0] = 0.1
+    # the next slot is at 0.25
+    assert limiter.acquire() == pytest.approx(0.15)
+
+
+def test_client_uses_controller():
+    session = Mock()
+    session.get.return_value = Mock(status_code=500)
+    client = Client(session, "http://engine", controller=ConcurrencyController(8))
+    client.get("/job/count")
+    assert client.controller.limit == 4
+    client.post("/external-task/fetchAndLock", controlled=False)
+    session.post.assert_called_once_with(
+        "http://engine/external-task/fetchAndLock", timeout=None
+    )
+    assert client.controller.limit == 4
@@ -0,0 +1,80 @@
+import mimetypes
+import os
+import uuid
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+
+__all__ = ["MultipartStream"]
+
+CHUNK_SIZE = 64 * 1024
+
+
+class MultipartStream:
+    """
+    a multipart/form-data body streamed from its files. unlike the
+    `files` of requests the files are not loaded into memory: they are
+    read chunk by chunk while the body is sent. the length is known in
+    advance, so the body is sent with a Content-Length. files given as
+    bytes are sent as they are.
+    """
+
+    def __init__(
+        self,
+        fields: Dict[str, str],
+        files: Dict[str, Union[Path, bytes]],
+        boundary: Optional[str] = None,
+        chunk_size: int = CHUNK_SIZE,
+    ):
+        self.boundary = boundary or uuid.uuid4().hex
+        self.chunk_size = chunk_size
+        self._parts: List[Tuple[bytes, Optional[Path], bytes]] = []
+        for name, value in fields.items():
+            self._parts.append(
+                (
+                    self._header(f'form-data; name="{name}"'),
+                    None,
+                    str(value).encode(),
+                )
+            )
+        for name, content in files.items():
+            content_type = mimetypes.guess_type(name)[0] or "application/octet-stream"
+            self._parts.append(
+                (
+                    self._header(
+                        f'form-data; name="{name}"; filename="{name}"', content_type
+                    ),
+                    None if isinstance(content, bytes) else Path(content),
+                    content if isinstance(content, bytes) else b"",
+                )
+            )
+
+    def _header(self, disposition: str, content_type: Optional[str] = None) -> bytes:
+        header = f"--{self.boundary}\r\nContent-Disposition: {disposition}\r\n"
+        if content_type:
+            header += f"Content-Type: {content_type}\r\n"
+        return (header + "\r\n").encode()
+
+    @property
+    def content_type(self) -> str:
+        return f"multipart/form-data; boundary={self.boundary}"
+
+    def _end(self) -> bytes:
+        return f"--{self.boundary}--\r\n".encode()
+
+    def __len__(self) -> int:
+        length = len(self._end())
+        for header, path, value in self._parts:
+            length += len(header) + len(value) + len(b"\r\n")
+            if path is not None:
+                length += os.path.getsize(path)
+        return length
+
+    def __iter__(self) -> Iterator[bytes]:
+        for header, path, value in self._parts:
+            yield header
+            if path is not None:
+                with open(path, "rb") as fh:
+                    while chunk := fh.read(self.chunk_size):
+                        yield chunk
+            yield value + b"\r\n"
+        yield self._end()
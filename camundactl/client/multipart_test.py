@@ -0,0 +1,26 @@
+from email.parser import BytesParser
+
+from .multipart import MultipartStream
+
+
+def test_multipart_stream(tmp_path):
+    model = tmp_path / "invoice.bpmn"
+    model.write_bytes(b"<definitions/>" * 1000)
+
+    body = MultipartStream(
+        {"deployment-name": "invoice"}, {"invoice.bpmn": model}, chunk_size=100
+    )
+    content = b"".join(body)
+
+    assert len(body) == len(content)
+    message = BytesParser().parsebytes(
+        f"Content-Type: {body.content_type}\r\n\r\n".encode() + content
+    )
+    parts = {
+        part.get_param("name", header="content-disposition"): part
+        for part in message.get_payload()
+    }
+    assert parts["deployment-name"].get_payload() == "invoice"
+    assert parts["invoice.bpmn"].get_payload(decode=True) == model.read_bytes()
+    # the body can be sent again
+    assert b"".join(body) == content
@@ -0,0 +1,43 @@
+from typing import Any, Dict, Iterator, List, Optional
+
+from camundactl.client.base_client import Client
+
+__all__ = ["iter_pages", "DEFAULT_PAGE_SIZE"]
+
+# the engine limits the result size (`queryMaxResultsLimit`). stay
+# below its usual configuration.
+DEFAULT_PAGE_SIZE = 500
+
+
+def iter_pages(
+    client: Client,
+    path: str,
+    params: Optional[Dict[str, Any]] = None,
+    page_size: int = DEFAULT_PAGE_SIZE,
+    first_result: int = 0,
+    json: Optional[Dict[str, Any]] = None,
+) -> Iterator[List[Dict]]:
+    """
+    requests the list operation at path page by page using
+    `firstResult` and `maxResults` and yields the pages until a page is
+    not complete. pass a stable `sortBy` in the params, otherwise the
+    engine may return objects twice or skip some. with json the query
+    is posted (e.g. `POST /process-instance`), sort it by `sorting`.
+    """
+    while True:
+        params_page = {
+            **(params or {}),
+            "firstResult": first_result,
+            "maxResults": page_size,
+        }
+        if json is None:
+            resp = client.get(path, params=params_page)
+        else:
+            resp = client.post(path, params=params_page, json=json)
+        resp.raise_for_status()
+        page = resp.json()
+        if page:
+            yield page
+        if len(page) < page_size:
+            return
+        first_result += len(page)
@@ -0,0 +1,37 @@
+from unittest.mock import Mock
+
+from .paging import iter_pages
+
+
+def _client(items: list) -> Mock:
+    def get(path, params):
+        start = params["firstResult"]
+        resp = Mock()
+        resp.json.return_value = items[start : start + params["maxResults"]]
+        return resp
+
+    client = Mock()
+    client.get.side_effect = get
+    return client
+
+
+def test_iter_pages():
+    client = _client(list(range(5)))
+
+    pages = list(iter_pages(client, "/incident", {"sortBy": "id"}, page_size=2))
+
+    assert pages == [[0, 1], [2, 3], [4]]
+    assert client.get.call_count == 3
+    client.get.assert_called_with(
+        "/incident", params={"sortBy": "id", "firstResult": 4, "maxResults": 2}
+    )
+
+
+def test_iter_pages_full_last_page():
+    client = _client(list(range(4)))
+
+    pages = list(iter_pages(client, "/incident", page_size=2))
+
+    assert pages == [[0, 1], [2, 3]]
+    # the empty page tells that there are no more objects
+    assert client.get.call_count == 3
@@ -0,0 +1,93 @@
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, Optional, TypeVar
+
+from toolz import partition_all, unique
+
+from camundactl.client.base_client import Client
+
+__all__ = ["map_concurrent", "fetch_by_ids", "fetch_each"]
+
+logger = logging.getLogger(__name__)
+
+# keep this below the connection pool size of the session
+DEFAULT_MAX_WORKERS = 8
+
+# the ids are passed as comma seperated query parameter. keep the
+# chunks small enough not to exceed the url length limits of the engine
+DEFAULT_ID_CHUNK_SIZE = 100
+
+TItem = TypeVar("TItem")
+TResult = TypeVar("TResult")
+
+
+def map_concurrent(
+    func: Callable[[TItem], TResult],
+    items: Iterable[TItem],
+    max_workers: int = DEFAULT_MAX_WORKERS,
+) -> List[TResult]:
+    """
+    calls func for every item using a thread pool and returns the
+    results in the order of the items. the first raised exception
+    is reraised.
+    """
+    items = list(items)
+    if len(items) <= 1 or max_workers <= 1:
+        return [func(item) for item in items]
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(items))) as executor:
+        return list(executor.map(func, items))
+
+
+def fetch_each(
+    client: Client,
+    path: str,
+    ids: Iterable[str],
+    params: Optional[Dict[str, Any]] = None,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+) -> List[Dict]:
+    """
+    requests the objects by id one by one (but concurrently).
+    the path has to contain an `{id}` placeholder.
+    """
+
+    def fetch(id_: str) -> Dict:
+        resp = client.get(path.format(id=id_), params=params)
+        resp.raise_for_status()
+        return resp.json()
+
+    return map_concurrent(fetch, unique(ids), max_workers=max_workers)
+
+
+def fetch_by_ids(
+    client: Client,
+    path: str,
+    id_param: str,
+    ids: Iterable[str],
+    params: Optional[Dict[str, Any]] = None,
+    chunk_size: int = DEFAULT_ID_CHUNK_SIZE,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+) -> Dict[str, Dict]:
+    """
+    requests the objects with the given ids using the list operation
+    at path which supports filtering by a comma seperated list of ids
+    (e.g. `processInstanceIds`). returns a lookup of id to object.
+    ids not known by the engine are missing in the result.
+    """
+
+    def fetch(chunk: tuple) -> List[Dict]:
+        chunk_params = {
+            **(params or {}),
+            id_param: ",".join(chunk),
+            "maxResults": len(chunk),
+        }
+        resp = client.get(path, params=chunk_params)
+        resp.raise_for_status()
+        return resp.json()
+
+    chunks = list(partition_all(chunk_size, unique(ids)))
+    logger.debug("fetching %s in %s chunks via %s", path, len(chunks), id_param)
+    result: Dict[str, Dict] = {}
+    for items in map_concurrent(fetch, chunks, max_workers=max_workers):
+        for item in items:
+            result[item["id"]] = item
+    return result
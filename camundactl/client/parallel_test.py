@@ -0,0 +1,59 @@
+from unittest.mock import Mock
+
+import pytest
+
+from .parallel import fetch_by_ids, fetch_each, map_concurrent
+
+
+def _response(json_data) -> Mock:
+    resp = Mock()
+    resp.json.return_value = json_data
+    return resp
+
+
+def test_map_concurrent_keeps_order():
+    result = map_concurrent(lambda x: x * 2, range(50), max_workers=4)
+    assert result == [x * 2 for x in range(50)]
+
+
+def test_map_concurrent_reraises():
+    def func(x):
+        if x == 3:
+            raise ValueError(x)
+        return x
+
+    with pytest.raises(ValueError):
+        map_concurrent(func, range(10), max_workers=4)
+
+
+def test_fetch_by_ids_chunks():
+    client = Mock()
+    client.get.side_effect = lambda path, params: _response(
+        [{"id": id_} for id_ in params["processInstanceIds"].split(",")]
+    )
+
+    ids = [str(i) for i in range(5)]
+    result = fetch_by_ids(
+        client, "/process-instance", "processInstanceIds", ids, chunk_size=2
+    )
+
+    assert client.get.call_count == 3
+    assert sorted(result.keys()) == ids
+    for _, kwargs in client.get.call_args_list:
+        assert kwargs["params"]["maxResults"] == len(
+            kwargs["params"]["processInstanceIds"].split(",")
+        )
+
+
+def test_fetch_by_ids_missing():
+    client = Mock()
+    client.get.return_value = _response([{"id": "a"}])
+    result = fetch_by_ids(client, "/task", "taskIdIn", ["a", "b"])
+    assert list(result.keys()) == ["a"]
+
+
+def test_fetch_each_unique():
+    client = Mock()
+    client.get.side_effect = lambda path, params: _response({"path": path})
+    result = fetch_each(client, "/group/{id}", ["a", "b", "a"])
+    assert result == [{"path": "/group/a"}, {"path": "/group/b"}]
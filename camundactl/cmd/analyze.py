@@ -0,0 +1,114 @@
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+import click
+
+from camundactl.analyze import DURATION_COLUMNS, analyze_definition
+from camundactl.bulk.migration import get_definition
+from camundactl.client.paging import DEFAULT_PAGE_SIZE
+from camundactl.cmd.base import AliasGroup, root
+from camundactl.cmd.fanout import with_engine_options
+from camundactl.cmd.helpers import with_exception_handler
+from camundactl.export.runner import format_timestamp
+from camundactl.output import default_json_output, default_table_output
+from camundactl.output.decorator import with_output
+
+SORT_COLUMNS = [
+    "running",
+    "failedJobs",
+    "finished",
+    "canceled",
+    "incidents",
+    "failureRate",
+] + DURATION_COLUMNS
+
+
+@root.group("analyze", cls=AliasGroup)
+@click.pass_context
+@with_engine_options()
+def analyze(ctx: click.Context):
+    """
+    analyzes process definitions
+    """
+
+
+@analyze.command("definition")
+@click.argument("key")
+@click.option(
+    "--version",
+    "version",
+    type=int,
+    default=None,
+    help="the version of the definition (default=latest)",
+)
+@click.option("--tenant-id", "tenant_id", default=None, help="the tenant")
+@click.option(
+    "--started-after",
+    "started_after",
+    type=click.DateTime(),
+    default=None,
+    help="only the history started after this time (utc)",
+)
+@click.option(
+    "--started-before",
+    "started_before",
+    type=click.DateTime(),
+    default=None,
+    help="only the history started before this time (utc)",
+)
+@click.option(
+    "--sort",
+    "sort_by",
+    type=click.Choice(SORT_COLUMNS),
+    default=None,
+    help="sort the activities by this column, descending "
+    "(default=the order of the model)",
+)
+@click.option(
+    "--page-size",
+    "page_size",
+    type=int,
+    default=DEFAULT_PAGE_SIZE,
+    help=f"activity instances per request (default={DEFAULT_PAGE_SIZE})",
+)
+@with_output(default_table_output, default_json_output)
+@click.pass_context
+@with_exception_handler()
+def analyze_definition_command(
+    ctx: click.Context,
+    key: str,
+    version: Optional[int],
+    tenant_id: Optional[str],
+    started_after: Optional[datetime],
+    started_before: Optional[datetime],
+    sort_by: Optional[str],
+    page_size: int,
+):
+    """
+    shows the counts, failure rates and durations of the activities of a
+    process definition.
+
+    the running instances and failed jobs are taken from the runtime
+    statistics, the finished and canceled instances and the incidents
+    from the historic statistics. the failure rate is the number of
+    incidents per instance of the activity. the durations (in milliseconds) are
+    aggregated from the finished activity instances, which are requested
+    page by page. limit them with --started-after.
+    """
+    client = ctx.obj.get_client()
+    definition = get_definition(client, key, version, tenant_id)
+    params: Dict[str, Any] = {}
+    if started_after:
+        params["startedAfter"] = format_timestamp(started_after)
+    if started_before:
+        params["startedBefore"] = format_timestamp(started_before)
+    click.echo(
+        f"analyzing {definition['key']}:{definition['version']} ({definition['id']})",
+        err=True,
+    )
+    rows = analyze_definition(client, definition["id"], params, page_size)
+    if sort_by:
+        rows.sort(
+            key=lambda row: (row[sort_by] is not None, row[sort_by]), reverse=True
+        )
+    return rows
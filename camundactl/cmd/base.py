@@ -2,7 +2,7 @@ import importlib
 import logging
 import logging.config
 import sys
-from typing import Mapping, Optional
+from typing import Dict, List, Mapping, Optional
 
 import click
 from tabulate import tabulate
@@ -10,6 +10,7 @@ from tabulate import tabulate
 from camundactl.cmd.apply import ApplyMultiCommand
 from camundactl.cmd.context import ContextObject
 from camundactl.cmd.delete import DeleteMultiCommand
+from camundactl.cmd.fanout import fan_out, with_engine_options
 from camundactl.cmd.get import GetMulitCommand
 from camundactl.config import ConfigDict, load_config
 
@@ -61,9 +62,30 @@ class AliasGroup(click.Group):
     default=None,
     required=False,
 )
+@click.option(
+    "--no-cache",
+    "no_cache",
+    is_flag=True,
+    default=False,
+    help="do not use the cache of engine responses",
+)
+@click.option(
+    "--cache-ttl",
+    "cache_ttl",
+    type=click.FloatRange(min=0),
+    default=None,
+    help="seconds to answer requests from the cache (default=cache.ttl or 0)",
+)
 @click.pass_context
-def root(ctx: click.Context, log_level: Optional[str] = None) -> None:
+def root(
+    ctx: click.Context,
+    log_level: Optional[str] = None,
+    no_cache: bool = False,
+    cache_ttl: Optional[float] = None,
+) -> None:
     ctx.ensure_object(ContextObject)
+    ctx.obj.set_cache_enabled(not no_cache)
+    ctx.obj.set_cache_ttl(cache_ttl)
     config_ = ctx.obj.get_config()
     if log_level or (log_level := config_.get("log_level", "")):
         logging.basicConfig(
@@ -78,12 +100,12 @@ def root(ctx: click.Context, log_level: Optional[str] = None) -> None:
             logger.debug("no logging configured.")
 
 
-def _group_factory(parent, parent_kwargs):
+def _group_factory(parent, parent_kwargs, fan_out: bool = False):
     @parent.group(**parent_kwargs)
     @click.pass_context
-    @click.option("-e", "--engine", "engine", required=False)
-    def group(ctx: click.Context, engine: Optional[str]):
-        ctx.obj.set_selected_engine(engine)
+    @with_engine_options(fan_out=fan_out)
+    def group(ctx: click.Context):
+        pass
 
     return group
 
@@ -95,6 +117,7 @@ get = _group_factory(
         cls=GetMulitCommand,
         help="query resources of camunda engine",
     ),
+    fan_out=True,
 )
 
 
@@ -105,6 +128,7 @@ describe = _group_factory(
         cls=AliasGroup,
         help="get complex collected information about engine ressources",
     ),
+    fan_out=True,
 )
 
 
@@ -128,14 +152,12 @@ apply = _group_factory(
 )
 
 
-@root.command("api-resources")
-@click.option("-e", "--engine", "engine", required=False)
-@click.pass_context
-def api_resources(ctx: click.Context, engine: Optional[str]):
-    ctx.obj.set_selected_engine(engine)
-    json_data = ctx.obj.get_spec()
+API_RESOURCES_HEADERS = ("Tag", "Verb", "Operation", "Schema", "Summary")
+
+
+def _api_resources_rows(spec: Dict) -> List[Dict]:
     rows = []
-    for path, path_conf in json_data["paths"].items():
+    for path, path_conf in spec["paths"].items():
         for verb, op_conf in path_conf.items():
             for tag in op_conf["tags"]:
                 try:
@@ -147,29 +169,28 @@ def api_resources(ctx: click.Context, engine: Optional[str]):
                     schema = "-"
                 else:
                     *_, schema = schema.split("/")
-                rows.append(
-                    [
-                        tag,
-                        #                        path,
-                        verb,
-                        op_conf["operationId"],
-                        schema,
-                        op_conf.get("summary"),
-                    ]
+                values = (
+                    tag,
+                    verb,
+                    op_conf["operationId"],
+                    schema,
+                    op_conf.get("summary"),
                 )
-    click.echo(
-        tabulate(
-            rows,
-            headers=(
-                "Tag",
-                #                "Path",
-                "Verb",
-                "Operation",
-                "Schema",
-                "Summary",
-            ),
-        )
-    )
+                rows.append(dict(zip(API_RESOURCES_HEADERS, values)))
+    return rows
+
+
+@root.command("api-resources")
+@click.pass_context
+@with_engine_options(fan_out=True)
+def api_resources(ctx: click.Context):
+    if ctx.obj.get_selected_engines():
+        # the specs may differ by engine. print them per engine
+        results = fan_out(ctx.obj, lambda: _api_resources_rows(ctx.obj.get_spec()))
+    else:
+        results = [_api_resources_rows(ctx.obj.get_spec())]
+    for rows in results:
+        click.echo(tabulate(rows, headers="keys"))
 
 
 def init():
@@ -179,6 +200,21 @@ def init():
         "camundactl.cmd.openapi",
         "camundactl.cmd.openapi.schema",
         "camundactl.cmd.process_instance",
+        "camundactl.cmd.process_definition",
+        "camundactl.cmd.job",
+        "camundactl.cmd.task",
+        "camundactl.cmd.shell",
+        "camundactl.cmd.daemon",
+        "camundactl.cmd.mirror",
+        "camundactl.cmd.export",
+        "camundactl.cmd.top",
+        "camundactl.cmd.worker",
+        "camundactl.cmd.bulk",
+        "camundactl.cmd.migrate",
+        "camundactl.cmd.modification",
+        "camundactl.cmd.retry",
+        "camundactl.cmd.deployment",
+        "camundactl.cmd.analyze",
     ):
         module = importlib.import_module(module_name)
         if hasattr(module, "register_commands"):
@@ -0,0 +1,247 @@
+from typing import IO, Any, Callable, Dict, List, Optional, Tuple
+
+import click
+import yaml
+
+from camundactl.bulk import (
+    OK,
+    BatchMonitor,
+    chunked,
+    count,
+    done_ids,
+    open_journal,
+    query_ids,
+    submit_chunks,
+    unknown_ids,
+)
+from camundactl.bulk.batch import DEFAULT_BATCH_INTERVAL, DEFAULT_CHUNK_SIZE
+from camundactl.cmd.helpers import print_journal, with_resume_option
+
+
+def with_batch_options():
+    """
+    adds the options to submit a query in chunks and track the batches.
+    """
+
+    def inner(func):
+        for option in reversed(
+            (
+                click.option(
+                    "--chunk-size",
+                    "chunk_size",
+                    type=click.IntRange(min=1),
+                    default=DEFAULT_CHUNK_SIZE,
+                    help=f"maximal objects per batch (default={DEFAULT_CHUNK_SIZE})",
+                ),
+                click.option(
+                    "--dry-run",
+                    "dry_run",
+                    is_flag=True,
+                    default=False,
+                    help="count the objects but do not submit batches",
+                ),
+                click.option(
+                    "--wait/--no-wait",
+                    "wait",
+                    default=False,
+                    help="wait until the batches completed",
+                ),
+                click.option(
+                    "--interval",
+                    "interval",
+                    type=float,
+                    default=DEFAULT_BATCH_INTERVAL,
+                    help="seconds between polling the batches "
+                    f"(default={DEFAULT_BATCH_INTERVAL})",
+                ),
+                with_resume_option(),
+            )
+        ):
+            func = option(func)
+        return func
+
+    return inner
+
+
+def with_instance_query_options():
+    """
+    adds the options to filter the process instances of a definition.
+    """
+
+    def inner(func):
+        for option in reversed(
+            (
+                click.option(
+                    "--activity-id",
+                    "activity_ids",
+                    multiple=True,
+                    help="only instances waiting in this activity (repeatable)",
+                ),
+                click.option(
+                    "--business-key-like",
+                    "business_key_like",
+                    default=None,
+                    help="only instances with a business key like this (e.g. order-%)",
+                ),
+                click.option(
+                    "--with-incident",
+                    "with_incident",
+                    is_flag=True,
+                    default=False,
+                    help="only instances with an incident",
+                ),
+                click.option(
+                    "-q",
+                    "--query",
+                    "query_file",
+                    type=click.File("r"),
+                    default=None,
+                    help="a process instance query (yaml or json) adding filters",
+                ),
+            )
+        ):
+            func = option(func)
+        return func
+
+    return inner
+
+
+def build_instance_query(
+    definition_id: str,
+    activity_ids: Tuple[str, ...],
+    business_key_like: Optional[str],
+    with_incident: bool,
+    query_file: Optional[IO[str]],
+) -> Dict:
+    query = yaml.safe_load(query_file) if query_file else {}
+    query["processDefinitionId"] = definition_id
+    if activity_ids:
+        query["activityIdIn"] = list(activity_ids)
+    if business_key_like:
+        query["businessKeyLike"] = business_key_like
+    if with_incident:
+        query["withIncident"] = True
+    return query
+
+
+def _print_batches(rows: List[Dict]) -> None:
+    completed = sum(row["completedJobs"] or 0 for row in rows)
+    total = sum(row["totalJobs"] or 0 for row in rows)
+    failed = sum(row["failedJobs"] or 0 for row in rows)
+    states = ",".join(sorted({row["state"] for row in rows}))
+    click.echo(
+        f"batches={len(rows)} jobs={completed}/{total} failed={failed} ({states})",
+        err=True,
+    )
+
+
+def run_batches(
+    ctx: click.Context,
+    path: str,
+    query_path: str,
+    query: Dict[str, Any],
+    sort_by: str,
+    ids_field: str,
+    query_field: str,
+    build: Callable[[Dict[str, Any]], Dict[str, Any]],
+    chunk_size: int,
+    dry_run: bool,
+    wait: bool,
+    interval: float,
+    resume: Optional[str],
+    resend_in_flight: bool = False,
+    params: Optional[Dict[str, Any]] = None,
+    predicate: Optional[Callable[[Dict], bool]] = None,
+) -> List[Dict[str, Any]]:
+    """
+    submits the objects of the query to the async operation at path
+    and returns the created batches.
+
+    up to chunk_size objects are selected by the query itself (the
+    query_field of the payload). more objects are selected by their ids
+    (ids_field), chunk by chunk, each chunk as its own batch. the ids
+    are queried before the first batch is submitted, the batches change
+    the result of the query. with a predicate (filtering what the query
+    does not support) the objects are always selected by id. the chunks
+    are journaled, a resumed run skips the objects of the chunks already
+    submitted and of the chunks in flight when it was interrupted (unless
+    resend_in_flight).
+    """
+    client = ctx.obj.get_client()
+    total = count(client, query_path, query)
+    click.echo(f"{total} objects match the query", err=True)
+    ids = None
+    if predicate:
+        ids = list(query_ids(client, query_path, query, sort_by, predicate=predicate))
+        total = len(ids)
+        click.echo(f"{total} objects match the filters", err=True)
+    if dry_run:
+        return [{"path": path, "count": total, "batches": -(-total // chunk_size)}]
+
+    journal = open_journal(
+        resume,
+        f"POST {path}",
+        {"engine": ctx.obj.get_engine_name(), "query": query, **(params or {})},
+    )
+    print_journal(journal)
+    if any(query_field in selection for selection in journal.done_items()):
+        raise click.ClickException("the query was submitted as a whole already")
+    if not resend_in_flight and any(
+        query_field in selection for selection in journal.unknown_items()
+    ):
+        raise click.ClickException(
+            "the query was in flight as a whole when the operation was interrupted. "
+            "check the batches and resend it with --resend-in-flight"
+        )
+    if not resume and not predicate and total <= chunk_size:
+        selections = [{query_field: query}]
+    else:
+        if resume or ids is None:
+            submitted = done_ids(journal, ids_field) if resume else set()
+            if resume and not resend_in_flight:
+                in_flight = unknown_ids(journal, ids_field) - submitted
+                if in_flight:
+                    click.echo(
+                        f"skipping {len(in_flight)} objects in flight when the "
+                        "operation was interrupted. resend them with "
+                        "--resend-in-flight",
+                        err=True,
+                    )
+                submitted |= in_flight
+            ids = list(
+                query_ids(
+                    client,
+                    query_path,
+                    query,
+                    sort_by,
+                    exclude=submitted,
+                    predicate=predicate,
+                )
+            )
+        click.echo(f"submitting {len(ids)} objects by id", err=True)
+        selections = [{ids_field: chunk} for chunk in chunked(ids, chunk_size)]
+
+    monitor = BatchMonitor(client)
+    rejected = []
+    try:
+        for result in submit_chunks(client, path, selections, build, journal):
+            size = len(result.item.get(ids_field) or ()) or "query"
+            if result.status == OK:
+                monitor.add(result.response["id"])
+                click.echo(f"batch {result.response['id']}: {size}", err=True)
+            else:
+                click.echo(f"chunk {result.index} failed: {result.error}", err=True)
+                rejected.append(
+                    {"batchId": None, "state": "rejected", "error": result.error}
+                )
+    finally:
+        journal.close()
+        print_journal(journal, finished=True)
+
+    if not monitor.batch_ids:
+        return rejected
+    if wait:
+        rows = monitor.wait(interval, on_progress=_print_batches)
+    else:
+        rows = monitor.poll()
+    return rows + rejected
@@ -0,0 +1,286 @@
+import functools
+import time
+from typing import IO, Any, Callable, Dict, Iterator, List, Optional
+
+import click
+
+from camundactl.bulk import (
+    INPUT_FORMATS,
+    OK,
+    BulkResult,
+    BulkStats,
+    InvalidInput,
+    Journal,
+    PayloadBuilder,
+    create_validator,
+    detect_format,
+    execute,
+    list_journals,
+    open_journal,
+    read_rows,
+)
+from camundactl.bulk.executor import DEFAULT_CONCURRENCY, DEFAULT_RETRIES
+from camundactl.client import Client
+from camundactl.cmd.base import AliasGroup, root
+from camundactl.cmd.fanout import with_engine_options
+from camundactl.cmd.helpers import (
+    print_journal,
+    with_exception_handler,
+    with_resume_option,
+)
+from camundactl.output import default_json_output, default_table_output
+from camundactl.output.decorator import with_output
+
+# seconds between the progress written to stderr
+PROGRESS_INTERVAL = 5.0
+
+# rows of the results printed at once (a table prints its headers per
+# chunk). the buffered rows are printed with the progress, too
+RESULT_CHUNK_SIZE = 500
+
+
+@root.group("bulk", cls=AliasGroup)
+@click.pass_context
+@with_engine_options()
+def bulk(ctx: click.Context):
+    """
+    sends one request per row of a ndjson or csv file
+    """
+
+
+def with_bulk_options():
+    """
+    adds the options to read, template and send the rows of a file.
+    """
+
+    def inner(func):
+        for option in reversed(
+            (
+                click.argument("input_file", metavar="FILE", type=click.File("r")),
+                click.option(
+                    "--format",
+                    "input_format",
+                    type=click.Choice(INPUT_FORMATS),
+                    default=None,
+                    help="format of FILE (default=by extension, ndjson for stdin)",
+                ),
+                click.option(
+                    "-t",
+                    "--template",
+                    "template",
+                    type=click.File("r"),
+                    default=None,
+                    help="jinja2 template rendering the payload (yaml or json) "
+                    "of a row. without a template the row is the payload",
+                ),
+                click.option(
+                    "--concurrency",
+                    "concurrency",
+                    type=int,
+                    default=DEFAULT_CONCURRENCY,
+                    help="maximal requests sent at once "
+                    f"(default={DEFAULT_CONCURRENCY})",
+                ),
+                click.option(
+                    "--retries",
+                    "retries",
+                    type=int,
+                    default=DEFAULT_RETRIES,
+                    help="retries of requests failing to connect or by overload "
+                    f"(default={DEFAULT_RETRIES})",
+                ),
+                click.option(
+                    "--skip-validation",
+                    "skip_validation",
+                    is_flag=True,
+                    default=False,
+                    help="do not validate the payloads",
+                ),
+                with_resume_option(),
+            )
+        ):
+            func = option(func)
+        return func
+
+    return inner
+
+
+def _summarize(body: Any) -> Any:
+    """
+    returns the id of the started or correlated process instance(s).
+    """
+    if isinstance(body, dict):
+        return body.get("id") or body
+    if isinstance(body, list):
+        return ",".join(
+            str((item.get("processInstance") or item.get("execution") or {}).get("id"))
+            for item in body
+        )
+    return body
+
+
+def _to_row(result: BulkResult) -> Dict:
+    row = {
+        "row": result.index,
+        "status": result.status,
+        "attempts": result.attempts,
+        "httpStatus": result.http_status,
+        "result": _summarize(result.response),
+        "error": result.error,
+    }
+    if result.status != OK:
+        # the input of rows to send again
+        row["input"] = result.item
+    return row
+
+
+def run_bulk(
+    ctx: click.Context,
+    input_file: IO[str],
+    input_format: Optional[str],
+    template: Optional[IO[str]],
+    concurrency: int,
+    retries: int,
+    skip_validation: bool,
+    resume: Optional[str],
+    resend_in_flight: bool,
+    operation: str,
+    send: Callable[[Client, Dict], Any],
+    defaults: Optional[Dict] = None,
+    args: Optional[Dict] = None,
+) -> Iterator[List[Dict]]:
+    """
+    sends the rows of the file and returns a stream of the results.
+    the progress is written to stderr. every row is journaled, so an
+    interrupted run can be resumed.
+    """
+    journal = open_journal(
+        resume,
+        operation,
+        {"engine": ctx.obj.get_engine_name(), "args": args, "defaults": defaults},
+    )
+    spec_cache = ctx.obj.get_spec_cache()
+    operation_id = spec_cache.get_operation_id_by_path(operation, "post")
+    validator = None
+    if not skip_validation:
+        validator = create_validator(
+            ctx.obj.get_spec(), spec_cache.get_operation_id_schema_name(operation_id)
+        )
+    builder = PayloadBuilder(template.read() if template else None, defaults, validator)
+    rows = read_rows(
+        input_file, input_format or detect_format(getattr(input_file, "name", None))
+    )
+    client = ctx.obj.get_client()
+    results = execute(
+        rows,
+        functools.partial(send, client),
+        prepare=builder.build,
+        concurrency=concurrency,
+        retries=retries,
+        stats=(stats := BulkStats()),
+        journal=journal,
+        resend_in_flight=resend_in_flight,
+    )
+
+    def progress() -> None:
+        snapshot = stats.snapshot()
+        if client.controller:
+            snapshot["concurrency"] = client.controller.snapshot()["concurrency"]
+        click.echo(" ".join(f"{k}={v}" for k, v in snapshot.items()), err=True)
+
+    def stream() -> Iterator[List[Dict]]:
+        last_progress = time.monotonic()
+        print_journal(journal)
+        rows: List[Dict] = []
+        try:
+            for result in results:
+                rows.append(_to_row(result))
+                interval_passed = time.monotonic() - last_progress >= PROGRESS_INTERVAL
+                if interval_passed or len(rows) >= RESULT_CHUNK_SIZE:
+                    yield rows
+                    rows = []
+                if interval_passed:
+                    last_progress = time.monotonic()
+                    progress()
+            if rows:
+                yield rows
+        except InvalidInput as error:
+            raise click.ClickException(str(error))
+        finally:
+            journal.close()
+            progress()
+            print_journal(journal, finished=True)
+
+    return stream()
+
+
+@bulk.command("correlate")
+@with_bulk_options()
+@click.option(
+    "-m",
+    "--message",
+    "message_name",
+    default=None,
+    help="the message name of rows without messageName",
+)
+@with_output(default_json_output, default_table_output)
+@click.pass_context
+@with_exception_handler()
+def correlate(ctx: click.Context, message_name: Optional[str], **options):
+    """
+    correlates one message (`POST /message`) per row of FILE. every row
+    (or the payload rendered by the template) is a CorrelationMessageDto,
+    e.g. {"messageName": "paid", "businessKey": "order-1"}.
+    """
+
+    def send(client: Client, payload: Dict):
+        return client.post("/message", json=payload)
+
+    return run_bulk(
+        ctx,
+        operation="/message",
+        send=send,
+        defaults={"messageName": message_name} if message_name else None,
+        **options,
+    )
+
+
+@bulk.command("start")
+@click.argument("key")
+@with_bulk_options()
+@with_output(default_json_output, default_table_output)
+@click.pass_context
+@with_exception_handler()
+def start(ctx: click.Context, key: str, **options):
+    """
+    starts one instance of the latest process definition with KEY per
+    row of FILE. every row (or the payload rendered by the template) is
+    a StartProcessInstanceDto, e.g. {"businessKey": "order-1"}.
+    """
+
+    def send(client: Client, payload: Dict):
+        return client.post(f"/process-definition/key/{key}/start", json=payload)
+
+    return run_bulk(
+        ctx,
+        operation="/process-definition/key/{key}/start",
+        args={"key": key},
+        send=send,
+        **options,
+    )
+
+
+@bulk.command("journals")
+@with_output(default_table_output, default_json_output)
+@click.pass_context
+@with_exception_handler()
+def journals(ctx: click.Context):
+    """
+    lists the journals of bulk operations and their progress
+    """
+    rows = []
+    for path in list_journals():
+        progress = Journal.load(path).progress()
+        del progress["journal"]
+        rows.append({"name": path.name, **progress})
+    return rows
@@ -1,23 +1,41 @@
+import threading
 import warnings
-from functools import cache, wraps
+from contextlib import contextmanager
+from functools import wraps
 from inspect import getfullargspec
-from typing import Callable, Dict, Optional
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
 
 import click
 
 from camundactl.client import Client, create_client
+from camundactl.client.cache import DEFAULT_MAX_SIZE, HttpCache, get_cache_file
 from camundactl.client.client import CamundaOpenAPIClient
-from camundactl.config import ConfigDict, load_config
+from camundactl.config import ConfigDict, EngineDoesNotExists, load_config
 from camundactl.openapi.cache import OpenAPISpecCache
 from camundactl.openapi.loader import load_spec
 
 
+ALL_ENGINES = "all"
+
+
 class ContextObject:
 
     _selected_engine = None
-    _spec: Optional[Dict] = None
+    _default_engine: Optional[str] = None
+    _selected_engines: Optional[List[str]] = None
+    _timeout: Optional[float] = None
     _config: Optional[Dict] = None
-    _spec_cache = None
+    _cache_enabled: bool = True
+    _cache_ttl: Optional[float] = None
+
+    def __init__(self):
+        # clients by engine, timeout and cache settings (see get_client)
+        self._clients: Dict[Tuple, Client] = {}
+        self._specs: Dict[str, Dict] = {}
+        self._spec_caches: Dict[str, OpenAPISpecCache] = {}
+        self._lock = threading.RLock()
+        # the engine a thread works on while fanning out to multiple engines
+        self._local = threading.local()
 
     def __getitem__(self, key):
 
@@ -42,33 +60,167 @@ class ContextObject:
         # TODO: validate Engine
         self._selected_engine = engine
 
-    @cache
+    def set_default_engine(self, engine: Optional[str]):
+        """
+        sets the engine used if no engine is selected explicitly. unlike
+        the current engine of the config this is not persisted.
+        """
+        if engine is not None:
+            engine_names = [e["name"] for e in self.get_config()["engines"]]
+            if engine not in engine_names:
+                raise EngineDoesNotExists(engine)
+        self._default_engine = engine
+
+    def set_selected_engines(self, engines: Optional[str]):
+        """
+        selects multiple engines to fan out to. engines is a comma
+        seperated list of engine names or `all`.
+        """
+        if engines is None:
+            self._selected_engines = None
+            return
+        engine_names = [engine["name"] for engine in self.get_config()["engines"]]
+        if engines == ALL_ENGINES:
+            self._selected_engines = engine_names
+            return
+        selected = [name.strip() for name in engines.split(",") if name.strip()]
+        for name in selected:
+            if name not in engine_names:
+                raise EngineDoesNotExists(name)
+        self._selected_engines = selected
+
+    def get_selected_engines(self) -> List[str]:
+        """
+        returns the engines a command should fan out to. an empty list
+        means that the command runs against one engine only.
+        """
+        return list(self._selected_engines or [])
+
+    def set_timeout(self, timeout: Optional[float]):
+        self._timeout = timeout
+
+    def fork(self) -> "ContextObject":
+        """
+        creates a context object for another command. it shares the
+        loaded config, specs and clients but has its own selection.
+        """
+        obj = ContextObject()
+        obj._config = self.get_config()
+        obj._clients = self._clients
+        obj._specs = self._specs
+        obj._spec_caches = self._spec_caches
+        obj._lock = self._lock
+        obj._default_engine = self._default_engine
+        obj._cache_enabled = self._cache_enabled
+        obj._cache_ttl = self._cache_ttl
+        return obj
+
+    def reset_selection(self):
+        """
+        resets the per command selection of engines and timeout, so
+        the object can be reused for the next command.
+        """
+        self._selected_engine = None
+        self._selected_engines = None
+        self._timeout = None
+
+    def get_engine_name(self) -> Optional[str]:
+        """
+        returns the name of the engine the current thread works on.
+        """
+        if engine := getattr(self._local, "engine", None):
+            return engine
+        return (
+            self._selected_engine
+            or self._default_engine
+            or self.get_config().get("current_engine")
+        )
+
+    @contextmanager
+    def use_engine(self, engine: str) -> Iterator[None]:
+        """
+        lets the current thread work on the given engine. used to run
+        one command against multiple engines concurrently.
+        """
+        previous = getattr(self._local, "engine", None)
+        self._local.engine = engine
+        try:
+            yield
+        finally:
+            self._local.engine = previous
+
+    def set_cache_enabled(self, enabled: bool):
+        self._cache_enabled = enabled
+
+    def set_cache_ttl(self, ttl: Optional[float]):
+        self._cache_ttl = ttl
+
+    def get_http_cache(self) -> Optional[HttpCache]:
+        """
+        returns the cache of get responses, none if it is disabled
+        (`--no-cache` or `cache.enabled` in the config).
+        """
+        cache_config = self.get_config().get("cache") or {}
+        if not self._cache_enabled or cache_config.get("enabled") is False:
+            return None
+        ttl = self._cache_ttl
+        if ttl is None:
+            ttl = cache_config.get("ttl") or 0
+        return HttpCache(
+            get_cache_file(), cache_config.get("max_size") or DEFAULT_MAX_SIZE, ttl
+        )
+
     def get_client(self) -> Client:
-        return create_client(
-            self.get_config(),
-            selected_engine=self._selected_engine,
+        # the shell and the daemon run commands with other cache options
+        # (`--no-cache`, `--cache-ttl`) on the same object
+        key = (
+            self.get_engine_name(),
+            self._timeout,
+            self._cache_enabled,
+            self._cache_ttl,
         )
+        with self._lock:
+            if key not in self._clients:
+                self._clients[key] = create_client(
+                    self.get_config(),
+                    selected_engine=key[0],
+                    timeout=key[1],
+                    cache=self.get_http_cache(),
+                )
+            return self._clients[key]
 
-    @cache
     def get_config(self) -> ConfigDict:
-        if self._config is None:
-            self._config = load_config()
-        return self._config
+        with self._lock:
+            if self._config is None:
+                self._config = load_config()
+            return self._config
+
+    def get_spec_version(self) -> str:
+        """
+        returns the spec version of the current engine. falls back to
+        the globally configured version.
+        """
+        config = self.get_config()
+        name = self.get_engine_name()
+        for engine in config.get("engines") or []:
+            if engine["name"] == name and engine.get("spec_version"):
+                return engine["spec_version"]
+        return config.get("spec_version") or "latest"
 
-    @cache
     def get_spec(self) -> Dict:
-        if self._spec is None:
-            self._spec = load_spec()
-        return self._spec
+        spec_version = self.get_spec_version()
+        with self._lock:
+            if spec_version not in self._specs:
+                self._specs[spec_version] = load_spec(spec_version)
+            return self._specs[spec_version]
 
-    @cache
     def get_spec_cache(self) -> OpenAPISpecCache:
-        if self._spec_cache is None:
-            spec = self.get_spec()
-            self._spec_cache = OpenAPISpecCache(spec)
-        return self._spec_cache
+        spec_version = self.get_spec_version()
+        with self._lock:
+            if spec_version not in self._spec_caches:
+                self._spec_caches[spec_version] = OpenAPISpecCache(self.get_spec())
+            return self._spec_caches[spec_version]
 
-    @cache
     def get_camunda_client(self):
         return CamundaOpenAPIClient(
             spec=self.get_spec(),
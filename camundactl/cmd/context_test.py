@@ -1,3 +1,7 @@
+import gc
+import weakref
+from unittest.mock import patch
+
 from camundactl.client import Client
 from camundactl.cmd.context import ContextObject
 from camundactl.openapi.cache import OpenAPISpecCache
@@ -22,3 +26,36 @@ def test_ContextObject_get_spec_cache():
 
     spec_cache = co.get_spec_cache()
     assert isinstance(spec_cache, OpenAPISpecCache)
+
+
+def test_ContextObject_get_client_cache_options(tmp_path):
+    co = ContextObject()
+    co._config = {
+        "engines": [{"name": "local", "url": "http://localhost:8080/engine-rest"}],
+        "current_engine": "local",
+    }
+
+    with patch(
+        "camundactl.cmd.context.get_cache_file", return_value=tmp_path / "c.sqlite"
+    ):
+        assert co.get_client().cache.ttl == 0
+        co.set_cache_ttl(60)
+        assert co.get_client().cache.ttl == 60
+        co.set_cache_enabled(False)
+        assert co.get_client().cache is None
+        co.set_cache_enabled(True)
+        co.set_cache_ttl(None)
+        assert co.get_client().cache.ttl == 0
+
+
+def test_ContextObject_forks_are_released():
+    co = ContextObject()
+    co._config = {"engines": [], "current_engine": None}
+
+    fork = co.fork()
+    assert fork.get_config() is co.get_config()
+    ref = weakref.ref(fork)
+    del fork
+    gc.collect()
+    # e.g. the daemon forks the object for every command
+    assert ref() is None
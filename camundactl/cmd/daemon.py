@@ -0,0 +1,83 @@
+import os
+import subprocess
+import sys
+import time
+
+import click
+
+from camundactl.cmd.base import AliasGroup, root
+from camundactl.cmd.helpers import with_exception_handler
+from camundactl.config import get_configdir
+from camundactl.daemon import client
+
+# seconds to wait for a started daemon to accept connections
+START_TIMEOUT = 10
+
+
+@root.group("daemon", cls=AliasGroup, help="run cctl as a background daemon")
+def daemon_cmd():
+    pass
+
+
+@daemon_cmd.command("start")
+@click.option(
+    "--foreground",
+    "foreground",
+    is_flag=True,
+    default=False,
+    help="do not detach from the terminal",
+)
+@with_exception_handler()
+def start(foreground: bool) -> None:
+    """
+    starts the daemon. while it is running, cctl commands are sent to
+    the daemon over a unix socket and run without startup costs.
+    """
+    if client.control("ping"):
+        raise click.ClickException("the daemon is already running")
+
+    if foreground:
+        from camundactl.daemon.server import serve
+
+        serve(client.get_socket_path())
+        return
+
+    log_file = get_configdir() / "daemon.log"
+    with open(log_file, "ab") as log:
+        process = subprocess.Popen(
+            [sys.executable, "-m", "camundactl", "daemon", "start", "--foreground"],
+            stdin=subprocess.DEVNULL,
+            stdout=log,
+            stderr=log,
+            start_new_session=True,
+            env={**os.environ, client.DISABLE_ENV: "1"},
+        )
+    deadline = time.monotonic() + START_TIMEOUT
+    while time.monotonic() < deadline:
+        if client.control("ping"):
+            click.echo(f"daemon started (pid {process.pid})")
+            return
+        if process.poll() is not None:
+            break
+        time.sleep(0.1)
+    raise click.ClickException(f"the daemon did not start. see {log_file}")
+
+
+@daemon_cmd.command("stop")
+@with_exception_handler()
+def stop() -> None:
+    if client.control("shutdown") is None:
+        raise click.ClickException("the daemon is not running")
+    click.echo("daemon stopped")
+
+
+@daemon_cmd.command("status")
+@with_exception_handler()
+def status() -> None:
+    if (info := client.control("ping")) is None:
+        click.echo("not running")
+        return
+    click.echo(
+        f"running (pid {info['pid']}, uptime {info['uptime']}s, "
+        f"{info['requests']} requests) on {client.get_socket_path()}"
+    )
@@ -0,0 +1,397 @@
+import json
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import click
+from toolz import groupby
+
+from camundactl.client.parallel import fetch_each, map_concurrent
+from camundactl.cmd.base import AliasGroup, root
+from camundactl.cmd.fanout import with_engine_options
+from camundactl.cmd.helpers import with_exception_handler
+from camundactl.deployment import (
+    DeployState,
+    deploy,
+    diff,
+    download_resource,
+    fetch_resource,
+    hash_bytes,
+    hash_file,
+    hash_resources,
+    latest_resources,
+    list_deployments,
+    list_resources,
+    scan,
+)
+from camundactl.deployment.sync import CHANGED, MISSING, NEW, UNCHANGED
+from camundactl.output import default_json_output, default_table_output
+from camundactl.output.decorator import with_output
+
+
+def _deployed_definitions(deployment: dict) -> dict:
+    """
+    returns the keys and versions of the definitions deployed by
+    resource name.
+    """
+    definitions = {}
+    for field in (
+        "deployedProcessDefinitions",
+        "deployedDecisionDefinitions",
+        "deployedCaseDefinitions",
+    ):
+        for definition in (deployment.get(field) or {}).values():
+            definitions[definition["resource"]] = (
+                f"{definition['key']}:{definition['version']}"
+            )
+    return definitions
+
+
+@root.command("deploy")
+@click.argument(
+    "directory", type=click.Path(exists=True, file_okay=False, path_type=Path)
+)
+@click.option(
+    "-n",
+    "--name",
+    "deployment_name",
+    default=None,
+    help="the name of the deployment (default=the name of DIRECTORY)",
+)
+@click.option("--tenant-id", "tenant_id", default=None, help="the tenant to deploy to")
+@click.option(
+    "--source",
+    "source",
+    default="cctl",
+    help="the source of the deployment (default=cctl)",
+)
+@click.option(
+    "--force",
+    "force",
+    is_flag=True,
+    default=False,
+    help="upload all resources, the engine still skips unchanged ones",
+)
+@click.option(
+    "--dry-run",
+    "dry_run",
+    is_flag=True,
+    default=False,
+    help="show the changed resources but do not deploy them",
+)
+@with_output(default_table_output, default_json_output)
+@click.pass_context
+@with_engine_options()
+@with_exception_handler()
+def deploy_directory(
+    ctx: click.Context,
+    directory: Path,
+    deployment_name: Optional[str],
+    tenant_id: Optional[str],
+    source: str,
+    force: bool,
+    dry_run: bool,
+):
+    """
+    deploys the bpmn, dmn, cmmn and form files below DIRECTORY which
+    changed since the last deploy (`POST /deployment/create`).
+
+    the hashes of the deployed resources are kept in the config dir. the
+    deployments of the last hashes are checked to still contain the
+    resources. only the changed resources are uploaded, as one
+    deployment with duplicate filtering. the files are streamed.
+    """
+    client = ctx.obj.get_client()
+    deployment_name = deployment_name or directory.resolve().name
+    paths = scan(directory)
+    if not paths:
+        raise click.ClickException(f"there are no resources in {directory}")
+    hashes = dict(zip(paths, map_concurrent(hash_file, paths.values())))
+
+    state = DeployState.load(ctx.obj.get_engine_name(), deployment_name, tenant_id)
+    if state.resources and (missing := state.verify(client)):
+        click.echo(
+            f"{len(missing)} resources are not deployed anymore: {', '.join(missing)}",
+            err=True,
+        )
+    deployed = (
+        {}
+        if force
+        else {name: resource["hash"] for name, resource in state.resources.items()}
+    )
+    changes = [
+        change for change in diff(hashes, deployed, paths) if change.status != MISSING
+    ]
+    upload = {
+        change.name: change.path
+        for change in changes
+        if change.status in (NEW, CHANGED)
+    }
+    click.echo(f"{len(upload)} of {len(paths)} resources changed", err=True)
+
+    definitions, deployment_id = {}, None
+    if upload and not dry_run:
+        deployment = deploy(client, deployment_name, upload, source, tenant_id)
+        deployment_id = deployment["id"]
+        definitions = _deployed_definitions(deployment)
+        state.update({name: hashes[name] for name in upload}, deployment_id)
+        state.save()
+        click.echo(f"deployment {deployment_id}", err=True)
+
+    return [
+        {
+            "resource": change.name,
+            "status": change.status,
+            "hash": change.hash[:12],
+            "deploymentId": deployment_id if change.name in upload else None,
+            "definition": definitions.get(change.name),
+        }
+        for change in changes
+    ]
+
+
+MANIFEST_FILE = "manifest.json"
+
+PULLED, SKIPPED = "pulled", "skipped"
+
+
+@root.group("deployment", cls=AliasGroup)
+@click.pass_context
+@with_engine_options()
+def deployment_group(ctx: click.Context):
+    """
+    pulls deployments and promotes them between engines
+    """
+
+
+def _resource_target(directory: Path, resource: Dict) -> Path:
+    base = (directory / resource["deploymentId"]).resolve()
+    target = (base / resource["name"]).resolve()
+    if base not in target.parents:
+        raise click.ClickException(f"invalid resource name: {resource['name']}")
+    return target
+
+
+@deployment_group.command("pull")
+@click.argument("deployment_ids", nargs=-1)
+@click.option(
+    "--all",
+    "all_",
+    is_flag=True,
+    default=False,
+    help="pull all deployments",
+)
+@click.option(
+    "--name",
+    "deployment_name",
+    default=None,
+    help="with --all: only deployments with this name",
+)
+@click.option(
+    "-d",
+    "--directory",
+    "directory",
+    type=click.Path(file_okay=False, path_type=Path),
+    default=Path("."),
+    help="the directory to pull into (default=.)",
+)
+@with_output(default_table_output, default_json_output)
+@click.pass_context
+@with_exception_handler()
+def pull(
+    ctx: click.Context,
+    deployment_ids: Tuple[str, ...],
+    all_: bool,
+    deployment_name: Optional[str],
+    directory: Path,
+):
+    """
+    downloads the resources of deployments into DIRECTORY/<deployment
+    id>/ (`/deployment/{id}/resources/{resourceId}/data`). the resources
+    of all deployments are downloaded concurrently.
+
+    the deployments, names and hashes of the resources are written to
+    DIRECTORY/manifest.json. resources pulled before are skipped, the
+    resources of a deployment never change.
+    """
+    if bool(deployment_ids) == all_:
+        raise click.UsageError("pass deployment ids or --all")
+    client = ctx.obj.get_client()
+    if all_:
+        deployments = list_deployments(
+            client, {"name": deployment_name} if deployment_name else None
+        )
+    else:
+        deployments = fetch_each(client, "/deployment/{id}", deployment_ids)
+
+    manifest_path = directory / MANIFEST_FILE
+    manifest = (
+        json.loads(manifest_path.read_text())
+        if manifest_path.exists()
+        else {"deployments": {}}
+    )
+    pulled = manifest["deployments"]
+    resources = [
+        resource
+        for items in list_resources(client, [item["id"] for item in deployments])
+        for resource in items
+    ]
+    targets = [_resource_target(directory, resource) for resource in resources]
+
+    def pull_resource(args: Tuple[Dict, Path]) -> Tuple[str, int, str]:
+        resource, target = args
+        known = (
+            pulled.get(resource["deploymentId"], {})
+            .get("resources", {})
+            .get(resource["id"])
+        )
+        if known and target.exists() and target.stat().st_size == known["size"]:
+            return known["hash"], known["size"], SKIPPED
+        return (*download_resource(client, resource, target), PULLED)
+
+    results = map_concurrent(pull_resource, zip(resources, targets))
+
+    for item in deployments:
+        pulled[item["id"]] = {
+            "name": item.get("name"),
+            "source": item.get("source"),
+            "tenantId": item.get("tenantId"),
+            "deploymentTime": item.get("deploymentTime"),
+            "resources": {},
+        }
+    rows = []
+    for resource, target, (hash_, size, status) in zip(resources, targets, results):
+        pulled[resource["deploymentId"]]["resources"][resource["id"]] = {
+            "name": resource["name"],
+            "path": target.relative_to(directory.resolve()).as_posix(),
+            "hash": hash_,
+            "size": size,
+        }
+        rows.append(
+            {
+                "deploymentId": resource["deploymentId"],
+                "resource": resource["name"],
+                "status": status,
+                "size": size,
+                "hash": hash_[:12],
+            }
+        )
+    manifest["engine"] = ctx.obj.get_engine_name()
+    directory.mkdir(parents=True, exist_ok=True)
+    manifest_path.write_text(json.dumps(manifest, indent=2))
+    click.echo(f"{len(rows)} resources, manifest {manifest_path}", err=True)
+    return rows
+
+
+@deployment_group.command("promote")
+@click.option(
+    "--from", "source_engine", required=True, help="the engine to deploy from"
+)
+@click.option("--to", "target_engine", required=True, help="the engine to deploy to")
+@click.option(
+    "--name",
+    "deployment_name",
+    default=None,
+    help="only deployments with this name",
+)
+@click.option(
+    "--tenant-id",
+    "tenant_id",
+    default=None,
+    help="only deployments of this tenant",
+)
+@click.option(
+    "--dry-run",
+    "dry_run",
+    is_flag=True,
+    default=False,
+    help="show the differing resources but do not deploy them",
+)
+@with_output(default_table_output, default_json_output)
+@click.pass_context
+@with_exception_handler()
+def promote(
+    ctx: click.Context,
+    source_engine: str,
+    target_engine: str,
+    deployment_name: Optional[str],
+    tenant_id: Optional[str],
+    dry_run: bool,
+):
+    """
+    deploys the resources of the engine --from which differ on the
+    engine --to.
+
+    the latest resources of each deployment name are compared by the
+    hash of their content. the differing ones are deployed to --to, one
+    deployment per deployment name with duplicate filtering.
+    """
+    if source_engine == target_engine:
+        raise click.UsageError("--from and --to are the same engine")
+    params: Dict[str, str] = {}
+    if deployment_name:
+        params["name"] = deployment_name
+    if tenant_id:
+        params["tenantIdIn"] = tenant_id
+
+    def load(engine: str):
+        with ctx.obj.use_engine(engine):
+            client = ctx.obj.get_client()
+            return client, latest_resources(client, list_deployments(client, params))
+
+    (source_client, source), (target_client, target) = map_concurrent(
+        load, [source_engine, target_engine]
+    )
+    contents = dict(
+        zip(
+            source,
+            map_concurrent(
+                lambda resource: fetch_resource(source_client, resource),
+                source.values(),
+            ),
+        )
+    )
+    shared = [key for key in source if key in target]
+    target_hashes = dict(
+        zip(shared, hash_resources(target_client, [target[key] for key in shared]))
+    )
+
+    changes: List[Tuple[tuple, str, str]] = []
+    for key, content in contents.items():
+        hash_ = hash_bytes(content)
+        if key not in target_hashes:
+            changes.append((key, NEW, hash_))
+        elif target_hashes[key] != hash_:
+            changes.append((key, CHANGED, hash_))
+        else:
+            changes.append((key, UNCHANGED, hash_))
+    changed = [key for key, status, _ in changes if status != UNCHANGED]
+    click.echo(
+        f"{len(changed)} of {len(changes)} resources differ on {target_engine}",
+        err=True,
+    )
+
+    deployment_ids: Dict[tuple, str] = {}
+    if not dry_run:
+        # one deployment per tenant and deployment name
+        for (tenant, name), keys in groupby(lambda key: key[:2], changed).items():
+            deployment = deploy(
+                target_client,
+                name,
+                {key[2]: contents[key] for key in keys},
+                source[keys[0]]["deployment"].get("source"),
+                tenant,
+            )
+            click.echo(f"deployment {deployment['id']} ({name})", err=True)
+            deployment_ids.update({key: deployment["id"] for key in keys})
+
+    return [
+        {
+            "tenantId": key[0],
+            "deployment": key[1],
+            "resource": key[2],
+            "status": status,
+            "hash": hash_[:12],
+            "deploymentId": deployment_ids.get(key),
+        }
+        for key, status, hash_ in changes
+    ]
@@ -0,0 +1,95 @@
+import logging
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Sequence
+
+import click
+from requests.models import HTTPError
+
+from camundactl.client import Client
+from camundactl.client.parallel import map_concurrent
+from camundactl.cmd.fanout import with_fan_out
+from camundactl.cmd.helpers import with_exception_handler
+from camundactl.output import TemplateOutputHandler, default_json_output
+from camundactl.output.decorator import with_output
+
+__all__ = ["DescribeQuery", "collect_describe_context", "create_describe_command"]
+
+logger = logging.getLogger(__name__)
+
+
+class DescribeQuery(NamedTuple):
+    """
+    a request a describe command needs to collect its information.
+    `path` and the values of `params` are formatted with the id of the
+    described object (e.g. `{"processInstanceId": "{id}"}`). the result
+    is merged into the template context as `name`. if the query is not
+    `required`, errors are logged and `default` is used instead.
+    """
+
+    name: str
+    path: str
+    params: Dict[str, str] = {}
+    required: bool = True
+    default: Any = None
+
+
+def _run_query(client: Client, query: DescribeQuery, id_: str) -> Any:
+    params = {key: value.format(id=id_) for key, value in query.params.items()}
+    resp = client.get(query.path.format(id=id_), params=params)
+    try:
+        resp.raise_for_status()
+    except HTTPError as error:
+        if query.required:
+            raise
+        logger.warning("describe query '%s' failed: %s", query.name, error)
+        return query.default
+    if "application/json" in resp.headers.get("Content-Type", ""):
+        return resp.json()
+    return resp.text
+
+
+def collect_describe_context(
+    client: Client, id_: str, path: str, queries: Sequence[DescribeQuery]
+) -> Dict[str, Any]:
+    """
+    requests the object at path and all related queries concurrently
+    and merges the results into one dict.
+    """
+    main_query = DescribeQuery("", path)
+    obj, *results = map_concurrent(
+        lambda query: _run_query(client, query, id_),
+        [main_query, *queries],
+    )
+    return {**obj, **{query.name: res for query, res in zip(queries, results)}}
+
+
+def create_describe_command(
+    group: click.Group,
+    name: str,
+    path: str,
+    queries: Sequence[DescribeQuery],
+    template: str,
+    help: Optional[str] = None,
+    autocomplete: Optional[Callable[..., List[str]]] = None,
+) -> click.Command:
+    """
+    creates and registers a describe command on group. it requests the
+    object at path (containing an `{id}` placeholder) and the given
+    related queries and renders the template with the merged results.
+    the template can be overridden by a user template file named
+    `describe_<name>.tpl`.
+    """
+    template_name = f"describe_{name}.tpl"
+
+    @group.command(name, help=help)
+    @with_output(
+        TemplateOutputHandler(template_name, templates={template_name: template}),
+        default_json_output,
+    )
+    @click.argument("id_", metavar="ID", nargs=1, shell_complete=autocomplete)
+    @click.pass_context
+    @with_exception_handler()
+    @with_fan_out()
+    def command(ctx: click.Context, id_: str, **kwargs):
+        return collect_describe_context(ctx.obj.get_client(), id_, path, queries)
+
+    return command
@@ -0,0 +1,54 @@
+from unittest.mock import Mock
+
+import pytest
+from requests.models import HTTPError
+
+from .describe import DescribeQuery, collect_describe_context
+
+
+def _response(json_data=None, error: bool = False) -> Mock:
+    resp = Mock()
+    resp.headers = {"Content-Type": "application/json"}
+    resp.json.return_value = json_data
+    if error:
+        resp.raise_for_status.side_effect = HTTPError()
+    return resp
+
+
+@pytest.fixture
+def client() -> Mock:
+    responses = {
+        "/process-instance/pi-1": _response({"id": "pi-1"}),
+        "/variable-instance": _response([{"name": "a"}]),
+        "/incident": _response([]),
+        "/broken": _response(error=True),
+    }
+    client = Mock()
+    client.get.side_effect = lambda path, params: responses[path]
+    return client
+
+
+def test_collect_describe_context(client: Mock):
+    queries = [
+        DescribeQuery("variables", "/variable-instance", {"processInstanceIdIn": "{id}"}),
+        DescribeQuery("incidents", "/incident", {"processInstanceId": "{id}"}),
+    ]
+
+    result = collect_describe_context(client, "pi-1", "/process-instance/{id}", queries)
+
+    assert result == {"id": "pi-1", "variables": [{"name": "a"}], "incidents": []}
+    client.get.assert_any_call(
+        "/variable-instance", params={"processInstanceIdIn": "pi-1"}
+    )
+
+
+def test_collect_describe_context_optional_query(client: Mock):
+    queries = [DescribeQuery("broken", "/broken", required=False, default=[])]
+    result = collect_describe_context(client, "pi-1", "/process-instance/{id}", queries)
+    assert result["broken"] == []
+
+
+def test_collect_describe_context_required_query(client: Mock):
+    queries = [DescribeQuery("broken", "/broken")]
+    with pytest.raises(HTTPError):
+        collect_describe_context(client, "pi-1", "/process-instance/{id}", queries)
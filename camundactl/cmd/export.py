@@ -0,0 +1,146 @@
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Optional
+
+import click
+
+from camundactl.client.paging import DEFAULT_PAGE_SIZE
+from camundactl.cmd.base import AliasGroup, root
+from camundactl.cmd.fanout import with_engine_options
+from camundactl.cmd.helpers import with_exception_handler
+from camundactl.export import (
+    COMPRESSIONS,
+    EXPORT_RESOURCES,
+    Checkpoint,
+    ExportResource,
+    parse_window,
+    run_export,
+)
+from camundactl.export.runner import DEFAULT_SHARD_SIZE
+from camundactl.output import default_json_output, default_object_table_output
+from camundactl.output.decorator import with_output
+
+
+def _parse_window(ctx: click.Context, param: click.Parameter, value: Optional[str]):
+    if value is None:
+        return None
+    try:
+        return parse_window(value)
+    except ValueError as error:
+        raise click.BadParameter(str(error))
+
+
+@root.group("export", cls=AliasGroup)
+@click.pass_context
+@with_engine_options()
+def export(ctx: click.Context):
+    """
+    exports history to compressed newline delimited json files.
+    """
+
+
+def _create_export_command(resource: ExportResource) -> click.Command:
+    @export.command(
+        resource.name,
+        help=(
+            f"exports {resource.name} (`{resource.path}`) window by window "
+            "into DIRECTORY. a checkpoint is written with every file, so an "
+            "interrupted export continues with --resume (the options of the "
+            "interrupted export are reused)."
+        ),
+    )
+    @click.argument("directory", type=click.Path(file_okay=False, path_type=Path))
+    @click.option(
+        "--from",
+        "start",
+        type=click.DateTime(),
+        default=None,
+        help="export the objects from this time on (utc)",
+    )
+    @click.option(
+        "--to",
+        "end",
+        type=click.DateTime(),
+        default=None,
+        help="export the objects until this time (utc, default=now)",
+    )
+    @click.option(
+        "--window",
+        "window",
+        default=None,
+        callback=_parse_window,
+        help="time window requested at once, e.g. 15m, 6h, 1d (default=1d)",
+    )
+    @click.option(
+        "--compression",
+        "compression",
+        type=click.Choice(list(COMPRESSIONS)),
+        default=None,
+        help="gzip (default) or xz",
+    )
+    @click.option(
+        "--shard-size",
+        "shard_size",
+        type=int,
+        default=DEFAULT_SHARD_SIZE,
+        help=f"objects per file (default={DEFAULT_SHARD_SIZE})",
+    )
+    @click.option(
+        "--page-size",
+        "page_size",
+        type=int,
+        default=DEFAULT_PAGE_SIZE,
+        help=f"objects per request (default={DEFAULT_PAGE_SIZE})",
+    )
+    @click.option(
+        "--resume",
+        "resume",
+        is_flag=True,
+        default=False,
+        help="continue an interrupted export in directory",
+    )
+    @with_output(default_json_output, default_object_table_output)
+    @click.pass_context
+    @with_exception_handler()
+    def command(
+        ctx: click.Context,
+        directory: Path,
+        start: Optional[datetime],
+        end: Optional[datetime],
+        window,
+        compression: Optional[str],
+        shard_size: int,
+        page_size: int,
+        resume: bool,
+    ) -> Dict:
+        def progress(checkpoint: Checkpoint) -> None:
+            click.echo(
+                f"{checkpoint.exported} exported until {checkpoint.window_start}",
+                err=True,
+            )
+
+        checkpoint = run_export(
+            ctx.obj.get_client(),
+            resource,
+            directory,
+            start=start,
+            end=end,
+            window=window,
+            compression=compression,
+            shard_size=shard_size,
+            page_size=page_size,
+            resume=resume,
+            progress=progress,
+        )
+        return {
+            "resource": checkpoint.resource,
+            "exported": checkpoint.exported,
+            "shards": checkpoint.next_shard,
+            "directory": str(directory),
+        }
+
+    return command
+
+
+for _resource in EXPORT_RESOURCES.values():
+    _create_export_command(_resource)
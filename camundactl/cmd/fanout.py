@@ -0,0 +1,135 @@
+import functools
+import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Callable, Dict, Iterator, List, Union
+
+import click
+
+from camundactl.cmd.context import ALL_ENGINES, ContextObject
+
+__all__ = ["fan_out", "tag_result", "with_engine_options", "with_fan_out"]
+
+logger = logging.getLogger(__name__)
+
+ENGINE_COLUMN = "engine"
+
+MAX_ENGINE_WORKERS = 16
+
+# used if multiple engines are requested without an explicit timeout.
+# one offline engine must not stall the whole command.
+DEFAULT_FAN_OUT_TIMEOUT = 30.0
+
+
+def _tag_item(engine: str, item: Any) -> Dict:
+    if isinstance(item, dict):
+        return {ENGINE_COLUMN: engine, **item}
+    return {ENGINE_COLUMN: engine, "value": item}
+
+
+def tag_result(engine: str, result: Any) -> Union[List[Dict], Dict]:
+    """
+    adds the engine name as first column to every row of the result.
+    """
+    if isinstance(result, list):
+        return [_tag_item(engine, item) for item in result]
+    return _tag_item(engine, result)
+
+
+def fan_out(obj: ContextObject, func: Callable[[], Any]) -> Iterator[Any]:
+    """
+    calls func concurrently once for every selected engine and yields
+    the engine tagged results as soon as they arrive. failing engines
+    are reported and skipped. raises if all engines failed.
+    """
+    engines = obj.get_selected_engines()
+
+    def run(engine: str) -> Any:
+        with obj.use_engine(engine):
+            return func()
+
+    failed = []
+    max_workers = min(len(engines), MAX_ENGINE_WORKERS) or 1
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {executor.submit(run, engine): engine for engine in engines}
+        for future in as_completed(futures):
+            engine = futures[future]
+            try:
+                result = future.result()
+            except Exception as error:
+                logger.debug("engine %s failed", engine, exc_info=True)
+                click.secho(f"engine '{engine}' failed: {error}", fg="red", err=True)
+                failed.append(engine)
+                continue
+            yield tag_result(engine, result)
+    if failed and len(failed) == len(engines):
+        raise click.ClickException("the command failed on all engines")
+
+
+def with_fan_out():
+    """
+    a command decorator which runs the command once for every selected
+    engine if multiple engines are selected and streams the merged
+    results. the command has to receive the click context first.
+    """
+
+    def inner(func):
+        @functools.wraps(func)
+        def wrapper(ctx: click.Context, *args, **kwargs):
+            if not ctx.obj.get_selected_engines():
+                return func(ctx, *args, **kwargs)
+            return fan_out(ctx.obj, functools.partial(func, ctx, *args, **kwargs))
+
+        return wrapper
+
+    return inner
+
+
+def with_engine_options(fan_out: bool = False):
+    """
+    adds the options to select the engine(s) and the request timeout
+    and applies them to the context object. with fan_out the commands
+    can run against multiple engines using `-e all` or `--engines a,b`.
+    """
+
+    def inner(func):
+        func = click.option(
+            "--timeout",
+            "timeout",
+            type=float,
+            default=None,
+            required=False,
+            help="request timeout in seconds",
+        )(func)
+        if fan_out:
+            func = click.option(
+                "--engines",
+                "engines",
+                default=None,
+                required=False,
+                help="comma seperated list of engines to run against",
+            )(func)
+        func = click.option(
+            "-e",
+            "--engine",
+            "engine",
+            required=False,
+            help="define the engine name to be used"
+            + (f" ('{ALL_ENGINES}' for all engines)" if fan_out else ""),
+        )(func)
+
+        @functools.wraps(func)
+        def wrapper(ctx: click.Context, *args, engine, timeout, engines=None, **kwargs):
+            if fan_out and engine == ALL_ENGINES:
+                engines, engine = ALL_ENGINES, None
+            ctx.obj.set_selected_engine(engine)
+            # always set (or reset) the selection. the context object
+            # may be reused for multiple commands (e.g. in the shell)
+            ctx.obj.set_selected_engines(engines)
+            if engines:
+                timeout = timeout or DEFAULT_FAN_OUT_TIMEOUT
+            ctx.obj.set_timeout(timeout)
+            return func(ctx, *args, **kwargs)
+
+        return wrapper
+
+    return inner
@@ -0,0 +1,65 @@
+from unittest.mock import Mock
+
+import click
+import pytest
+
+from camundactl.cmd.context import ContextObject
+
+from .fanout import fan_out, tag_result
+
+
+@pytest.fixture
+def context_object() -> ContextObject:
+    obj = ContextObject()
+    obj._config = {
+        "engines": [{"name": "a"}, {"name": "b"}, {"name": "c"}],
+        "current_engine": "a",
+    }
+    return obj
+
+
+def test_tag_result():
+    assert tag_result("a", [{"id": 1}]) == [{"engine": "a", "id": 1}]
+    assert tag_result("a", {"id": 1}) == {"engine": "a", "id": 1}
+    assert tag_result("a", "text") == {"engine": "a", "value": "text"}
+
+
+def test_set_selected_engines(context_object: ContextObject):
+    context_object.set_selected_engines("all")
+    assert context_object.get_selected_engines() == ["a", "b", "c"]
+    context_object.set_selected_engines("b, c")
+    assert context_object.get_selected_engines() == ["b", "c"]
+    with pytest.raises(Exception):
+        context_object.set_selected_engines("unknown")
+
+
+def test_fan_out(context_object: ContextObject):
+    context_object.set_selected_engines("all")
+
+    def func():
+        return [{"id": context_object.get_engine_name()}]
+
+    results = list(fan_out(context_object, func))
+    rows = sorted(row["engine"] for result in results for row in result)
+    assert rows == ["a", "b", "c"]
+    assert all(row["engine"] == row["id"] for result in results for row in result)
+    # the thread local engine does not leak
+    assert context_object.get_engine_name() == "a"
+
+
+def test_fan_out_tolerates_failures(context_object: ContextObject):
+    context_object.set_selected_engines("all")
+
+    def func():
+        if context_object.get_engine_name() == "b":
+            raise Exception("offline")
+        return []
+
+    assert len(list(fan_out(context_object, func))) == 2
+
+
+def test_fan_out_all_failed(context_object: ContextObject):
+    context_object.set_selected_engines("a,b")
+    func = Mock(side_effect=Exception("offline"))
+    with pytest.raises(click.ClickException):
+        list(fan_out(context_object, func))
@@ -1,6 +1,6 @@
 from functools import reduce
 from logging import getLogger
-from typing import Callable, List, Optional, cast
+from typing import Callable, Dict, List, Optional, Tuple, cast
 
 import click
 from toolz.functoolz import curry
@@ -28,12 +28,19 @@ def from_command_name(command_name: str, prefix: str) -> str:
 class OpenAPIMulitCommandBase(click.MultiCommand):
 
     verb: str
-    _command_factory: OpenAPICommandFactory
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # factories by spec and the created commands by spec, verb and
+        # operation id. creating commands is expensive and they can be
+        # reused if the process runs multiple commands (e.g. the shell).
+        self._command_factories: Dict[int, OpenAPICommandFactory] = {}
+        self._commands: Dict[Tuple[int, str, str], click.Command] = {}
 
     def _get_or_create_factory(self, spec, spec_cache=None):
-        if not hasattr(self, "_command_factory"):
-            self._command_factory = OpenAPICommandFactory(spec, spec_cache)
-        return self._command_factory
+        if id(spec) not in self._command_factories:
+            self._command_factories[id(spec)] = OpenAPICommandFactory(spec, spec_cache)
+        return self._command_factories[id(spec)]
 
     def get_factory_method(self, factory: OpenAPICommandFactory) -> Callable:
         raise NotImplementedError()
@@ -71,9 +78,12 @@ class OpenAPIMulitCommandBase(click.MultiCommand):
             if not cache.has_operation_id(name):
                 return None
             operation_id = name
-        factory = self._get_or_create_factory(spec, cache)
-        method = self.get_factory_method(factory)
-        return method(operation_id=operation_id)
+        key = (id(spec), self.verb, operation_id)
+        if key not in self._commands:
+            factory = self._get_or_create_factory(spec, cache)
+            method = self.get_factory_method(factory)
+            self._commands[key] = method(operation_id=operation_id)
+        return self._commands[key]
 
 
 class GetMulitCommand(OpenAPIMulitCommandBase):
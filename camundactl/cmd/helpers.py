@@ -7,6 +7,8 @@ import click
 from click.exceptions import ClickException
 from requests.models import HTTPError
 
+from camundactl.bulk.journal import Journal
+
 
 class OptionTuple(NamedTuple):
     name: str
@@ -20,6 +22,7 @@ class ArgumentTuple(NamedTuple):
     name: str
     help: str
     autocomplete: Optional[Callable]
+    nargs: int = 1
 
 
 def with_query_option_factory(options: List[OptionTuple], name: str):
@@ -100,7 +103,8 @@ def with_args_factory(args: List[ArgumentTuple], name: str):
         for arg in args:
             func = click.argument(
                 arg.name,
-                nargs=1,
+                nargs=arg.nargs,
+                required=True,
                 shell_complete=arg.autocomplete,
             )(func)
 
@@ -169,3 +173,43 @@ def with_exception_handler() -> Callable[[TFun], TFun]:
         return wrapper
 
     return inner
+
+
+def with_resume_option():
+    """
+    adds the options to resume the operation of a journal.
+    """
+
+    def inner(func):
+        func = click.option(
+            "--resend-in-flight",
+            "resend_in_flight",
+            is_flag=True,
+            default=False,
+            help="send the items in flight when the operation was "
+            "interrupted again. the engine may have processed them",
+        )(func)
+        return click.option(
+            "--resume",
+            "resume",
+            default=None,
+            metavar="JOURNAL",
+            help="resume the operation of the journal. finished items are "
+            "skipped, failed ones are sent again, items in flight are "
+            "reported as unknown",
+        )(func)
+
+    return inner
+
+
+def print_journal(journal: Journal, finished: bool = False) -> None:
+    if not finished:
+        click.echo(f"journal: {journal.path}", err=True)
+        if journal.unknown:
+            click.echo(
+                f"{len(journal.unknown)} items were in flight when the operation "
+                "was interrupted, the engine may have processed them",
+                err=True,
+            )
+    elif journal.failed or journal.in_flight:
+        click.echo(f"resume with: --resume {journal.path.name}", err=True)
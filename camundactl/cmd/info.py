@@ -1,35 +1,165 @@
-import click
+import json
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, TypedDict
 
-from typing import Dict
+import click
 
 from camundactl.client import create_client
 from camundactl.cmd.base import root
 from camundactl.cmd.context import ensure_object
+from camundactl.config import ConfigDict, EngineDict, get_configdir, get_configfile
 from camundactl.output.decorator import with_output
 from camundactl.output.template import TemplateOutputHandler
-from camundactl.config import EngineDict, get_configfile, ConfigDict
 
+logger = logging.getLogger(__name__)
 
-def camunda_engine_version(engine: EngineDict) -> str:
-    client = create_client(engine)
+OFFLINE = "OFFLINE"
+TIMEOUT = "TIMEOUT"
+
+# all engines are probed concurrently. the whole probing must not
+# take longer than this (in seconds)
+DEFAULT_PROBE_TIMEOUT = 2.0
+
+# how long (in seconds) probe results are reused from the cache file
+PROBE_CACHE_TTL = 60
+
+
+class EngineStatus(TypedDict):
+    version: str
+    latency: Optional[float]
+    probed_at: float
+
+
+def get_probe_cachefile() -> Path:
+    return get_configdir() / "cache" / "engine-status.json"
+
+
+def _cache_key(engine: EngineDict) -> str:
+    return f"{engine['name']}|{engine['url']}"
+
+
+def _load_probe_cache() -> Dict[str, EngineStatus]:
+    try:
+        with open(get_probe_cachefile(), "r") as fh:
+            return json.load(fh)
+    except (OSError, ValueError):
+        return {}
+
+
+def _write_probe_cache(cache: Dict[str, EngineStatus]) -> None:
+    cache_file = get_probe_cachefile()
+    try:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = cache_file.with_suffix(".tmp")
+        with open(tmp_file, "w") as fh:
+            json.dump(cache, fh)
+        os.replace(tmp_file, cache_file)
+    except OSError as error:
+        logger.warning("could not write engine status cache: %s", error)
+
+
+def probe_engine(
+    engine: EngineDict, timeout: float = DEFAULT_PROBE_TIMEOUT
+) -> EngineStatus:
+    """
+    requests the version of the engine and measures the latency
+    in milliseconds.
+    """
+    client = create_client(engine, timeout=timeout)
+    start = time.monotonic()
     try:
         resp = client.get("/version")
         resp.raise_for_status()
-    except Exception:
-        return "OFFLINE"
-    else:
-        resp_json: dict[str, str] = resp.json()
-        return resp_json["version"]
+        version = resp.json()["version"]
+    except Exception as error:
+        logger.debug("probing engine %s failed: %s", engine["name"], error)
+        return EngineStatus(version=OFFLINE, latency=None, probed_at=time.time())
+    latency = round((time.monotonic() - start) * 1000, 1)
+    return EngineStatus(version=version, latency=latency, probed_at=time.time())
+
+
+def probe_engines(
+    engines: List[EngineDict],
+    timeout: float = DEFAULT_PROBE_TIMEOUT,
+    use_cache: bool = True,
+) -> Dict[str, EngineStatus]:
+    """
+    probes all engines concurrently and returns their status by engine
+    name. engines not answering within timeout are reported as TIMEOUT.
+    recent results are reused from the cache file.
+    """
+    cache = _load_probe_cache() if use_cache else {}
+    now = time.time()
+    result: Dict[str, EngineStatus] = {}
+    to_probe = []
+    for engine in engines:
+        cached = cache.get(_cache_key(engine))
+        if cached and now - cached["probed_at"] < PROBE_CACHE_TTL:
+            result[engine["name"]] = cached
+        else:
+            to_probe.append(engine)
+
+    if to_probe:
+        probed: Dict[str, EngineStatus] = {}
+
+        def probe(engine: EngineDict) -> None:
+            probed[engine["name"]] = probe_engine(engine, timeout)
+
+        # daemon threads, so hanging requests (e.g. a slowly answering
+        # engine) neither block the deadline nor the exit of cctl
+        threads = [
+            threading.Thread(target=probe, args=(engine,), daemon=True)
+            for engine in to_probe
+        ]
+        for thread in threads:
+            thread.start()
+        deadline = time.monotonic() + timeout
+        for thread in threads:
+            thread.join(max(deadline - time.monotonic(), 0))
+        for engine in to_probe:
+            if status := probed.get(engine["name"]):
+                cache[_cache_key(engine)] = status
+            else:
+                status = EngineStatus(version=TIMEOUT, latency=None, probed_at=now)
+            result[engine["name"]] = status
+        _write_probe_cache(cache)
+
+    return result
+
+
+def camunda_engine_version(engine: EngineDict) -> str:
+    return probe_engine(engine)["version"]
 
 
 @root.command()
+@click.option(
+    "--timeout",
+    "timeout",
+    type=float,
+    default=DEFAULT_PROBE_TIMEOUT,
+    help="deadline in seconds for probing the engines "
+    f"(default={DEFAULT_PROBE_TIMEOUT})",
+)
+@click.option(
+    "--refresh",
+    "refresh",
+    is_flag=True,
+    default=False,
+    help="ignore cached engine status",
+)
 @with_output(TemplateOutputHandler(default_template="info.tpl"))
 @click.pass_context
-def info(ctx: click.Context) -> Dict:
+def info(ctx: click.Context, timeout: float, refresh: bool) -> Dict:
     config: ConfigDict = ctx.obj.get_config()
     return dict(
-            config=config,
-        openapi_specs= [],
-            camunda_engine_version=camunda_engine_version,
-            config_file=get_configfile(),
+        config=config,
+        openapi_specs=[],
+        engine_status=probe_engines(
+            config["engines"], timeout=timeout, use_cache=not refresh
+        ),
+        config_file=get_configfile(),
     )
@@ -0,0 +1,68 @@
+import time
+from unittest.mock import Mock, patch
+
+import pytest
+
+from camundactl.config import EngineDict
+
+from .info import TIMEOUT, EngineStatus, probe_engines
+
+
+@pytest.fixture
+def engines() -> list[EngineDict]:
+    return [
+        {"name": "fast", "url": "http://fast/engine-rest"},
+        {"name": "slow", "url": "http://slow/engine-rest"},
+    ]
+
+
+def _probe(engine: EngineDict, timeout: float) -> EngineStatus:
+    if engine["name"] == "slow":
+        time.sleep(0.5)
+    return EngineStatus(version="7.16.0", latency=1.0, probed_at=time.time())
+
+
+@patch("camundactl.cmd.info._write_probe_cache")
+@patch("camundactl.cmd.info._load_probe_cache")
+@patch("camundactl.cmd.info.probe_engine")
+def test_probe_engines_deadline(
+    probe_engine: Mock,
+    load_probe_cache: Mock,
+    write_probe_cache: Mock,
+    engines: list[EngineDict],
+):
+    probe_engine.side_effect = _probe
+    load_probe_cache.return_value = {}
+
+    start = time.monotonic()
+    result = probe_engines(engines, timeout=0.1)
+
+    assert time.monotonic() - start < 0.5
+    assert result["fast"]["version"] == "7.16.0"
+    assert result["slow"]["version"] == TIMEOUT
+    # only answered probes are cached
+    (cache,), _ = write_probe_cache.call_args
+    assert list(cache.keys()) == ["fast|http://fast/engine-rest"]
+
+
+@patch("camundactl.cmd.info._write_probe_cache")
+@patch("camundactl.cmd.info._load_probe_cache")
+@patch("camundactl.cmd.info.probe_engine")
+def test_probe_engines_cached(
+    probe_engine: Mock,
+    load_probe_cache: Mock,
+    write_probe_cache: Mock,
+    engines: list[EngineDict],
+):
+    load_probe_cache.return_value = {
+        f"{engine['name']}|{engine['url']}": EngineStatus(
+            version="7.15.0", latency=3.0, probed_at=time.time()
+        )
+        for engine in engines
+    }
+
+    result = probe_engines(engines)
+
+    assert probe_engine.called is False
+    assert write_probe_cache.called is False
+    assert result["slow"]["version"] == "7.15.0"
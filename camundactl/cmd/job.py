@@ -0,0 +1,57 @@
+from camundactl.cmd.base import describe
+from camundactl.cmd.describe import DescribeQuery, create_describe_command
+
+DESCRIBE_JOB_TEMPLATE = """
+Id: {{id}}
+JobDefinitionId: {{jobDefinitionId}}
+ProcessInstanceId: {{processInstanceId}}
+ProcessDefinition:
+    Id:  {{processDefinitionId}}
+    Key: {{processDefinitionKey}}
+ExecutionId: {{executionId}}
+TenantId: {{tenantId}}
+
+DueDate:   {{dueDate}}
+CreateTime: {{createTime}}
+Priority:  {{priority}}
+Retries:   {{retries}}
+Suspended: {{suspended}}
+
+Exception: {{exceptionMessage}}
+
+Stacktrace:
+{{stacktrace or "-"}}
+
+Log: {% for log in log %}
+    - Timestamp: {{log.timestamp}}
+      Creation:  {{log.creationLog}}
+      Failure:   {{log.failureLog}}
+      Success:   {{log.successLog}}
+      Deletion:  {{log.deletionLog}}
+      Message:   {{log.jobExceptionMessage}} {% endfor %}
+""".strip()
+
+
+describe_job = create_describe_command(
+    describe,
+    "job",
+    path="/job/{id}",
+    queries=[
+        # there is only a stacktrace if the job failed
+        DescribeQuery("stacktrace", "/job/{id}/stacktrace", required=False),
+        DescribeQuery(
+            "log",
+            "/history/job-log",
+            {
+                "jobId": "{id}",
+                "sortBy": "timestamp",
+                "sortOrder": "desc",
+                "maxResults": "10",
+            },
+            required=False,
+            default=[],
+        ),
+    ],
+    template=DESCRIBE_JOB_TEMPLATE,
+    help="describe one job with its stacktrace and latest log entries",
+)
@@ -0,0 +1,159 @@
+from typing import IO, Dict, Optional, Tuple
+
+import click
+import yaml
+
+from camundactl.bulk.migration import get_definition, get_plan, validate_plan
+from camundactl.cmd.base import root
+from camundactl.cmd.batch import (
+    build_instance_query,
+    run_batches,
+    with_batch_options,
+    with_instance_query_options,
+)
+from camundactl.cmd.fanout import with_engine_options
+from camundactl.cmd.helpers import with_exception_handler
+from camundactl.output import default_json_output, default_table_output
+from camundactl.output.decorator import with_output
+
+
+@root.command("migrate")
+@click.argument("key")
+@click.option(
+    "--from",
+    "source_version",
+    type=int,
+    required=True,
+    help="the version of the process definition to migrate from",
+)
+@click.option(
+    "--to",
+    "target_version",
+    type=int,
+    default=None,
+    help="the version to migrate to (default=the latest version)",
+)
+@click.option(
+    "--tenant-id", "tenant_id", default=None, help="the tenant of the definition"
+)
+@click.option(
+    "--plan",
+    "plan_file",
+    type=click.File("r"),
+    default=None,
+    help="a migration plan (yaml or json) instead of the generated one",
+)
+@click.option(
+    "--regenerate",
+    "regenerate",
+    is_flag=True,
+    default=False,
+    help="generate the plan again instead of using the cached one",
+)
+@click.option(
+    "--update-event-triggers",
+    "update_event_triggers",
+    is_flag=True,
+    default=False,
+    help="update the triggers of mapped events",
+)
+@click.option(
+    "--skip-custom-listeners",
+    "skip_custom_listeners",
+    is_flag=True,
+    default=False,
+    help="do not invoke execution listeners",
+)
+@click.option(
+    "--skip-io-mappings",
+    "skip_io_mappings",
+    is_flag=True,
+    default=False,
+    help="do not execute input/output mappings",
+)
+@with_instance_query_options()
+@with_batch_options()
+@with_output(default_table_output, default_json_output)
+@click.pass_context
+@with_engine_options()
+@with_exception_handler()
+def migrate(
+    ctx: click.Context,
+    key: str,
+    source_version: int,
+    target_version: Optional[int],
+    tenant_id: Optional[str],
+    plan_file: Optional[IO[str]],
+    regenerate: bool,
+    update_event_triggers: bool,
+    skip_custom_listeners: bool,
+    skip_io_mappings: bool,
+    activity_ids: Tuple[str, ...],
+    business_key_like: Optional[str],
+    with_incident: bool,
+    query_file: Optional[IO[str]],
+    **batch_options,
+):
+    """
+    migrates the process instances of process definition KEY from one
+    version to another (`POST /migration/executeAsync`).
+
+    the migration plan is generated once per pair of definitions and
+    cached in the config dir. it is validated before any instance is
+    migrated. the instances are selected by a query and submitted in
+    chunks, each chunk becomes a batch. use --dry-run to see the plan
+    and the number of instances.
+    """
+    client = ctx.obj.get_client()
+    source = get_definition(client, key, source_version, tenant_id)
+    target = get_definition(client, key, target_version, tenant_id)
+    if source["id"] == target["id"]:
+        raise click.ClickException(f"the instances are in version {source['version']}")
+
+    if plan_file:
+        plan = yaml.safe_load(plan_file)
+    else:
+        plan, cached = get_plan(
+            client,
+            ctx.obj.get_engine_name(),
+            source["id"],
+            target["id"],
+            update_event_triggers,
+            regenerate,
+        )
+        click.echo(
+            f"{'cached' if cached else 'generated'} plan: "
+            f"{len(plan.get('instructions') or ())} instructions",
+            err=True,
+        )
+    if failures := validate_plan(client, plan):
+        raise click.ClickException(
+            "the migration plan is invalid:\n" + "\n".join(failures)
+        )
+    click.echo(
+        f"migrating {key} version {source['version']} -> {target['version']}",
+        err=True,
+    )
+
+    def build(selection: Dict) -> Dict:
+        return {
+            "migrationPlan": plan,
+            "skipCustomListeners": skip_custom_listeners,
+            "skipIoMappings": skip_io_mappings,
+            **selection,
+        }
+
+    return run_batches(
+        ctx,
+        path="/migration/executeAsync",
+        query_path="/process-instance",
+        query=build_instance_query(
+            source["id"], activity_ids, business_key_like, with_incident, query_file
+        ),
+        sort_by="instanceId",
+        ids_field="processInstanceIds",
+        query_field="processInstanceQuery",
+        build=build,
+        params={"plan": plan},
+        **batch_options,
+    )
@@ -0,0 +1,94 @@
+import time
+from datetime import datetime
+from typing import Dict, List, Tuple
+
+import click
+
+from camundactl.client.paging import DEFAULT_PAGE_SIZE
+from camundactl.cmd.base import AliasGroup, root
+from camundactl.cmd.fanout import with_engine_options
+from camundactl.cmd.helpers import with_exception_handler
+from camundactl.mirror import MIRROR_RESOURCES, MirrorStore, get_mirror_file
+from camundactl.mirror.sync import sync_resource
+from camundactl.output import default_json_output, default_table_output
+from camundactl.output.decorator import with_output
+
+RESOURCE_NAMES = [resource.name for resource in MIRROR_RESOURCES]
+
+
+def _get_store(ctx: click.Context) -> MirrorStore:
+    return MirrorStore(get_mirror_file(ctx.obj.get_engine_name()))
+
+
+@root.group("mirror", cls=AliasGroup)
+@click.pass_context
+@with_engine_options()
+def mirror(ctx: click.Context):
+    """
+    local sqlite mirror of engine resources. `get` commands of mirrored
+    resources answer queries from the mirror with `--from-mirror`.
+    """
+
+
+@mirror.command("sync")
+@click.argument("resources", nargs=-1, type=click.Choice(RESOURCE_NAMES))
+@click.option(
+    "--with-history",
+    "with_history",
+    is_flag=True,
+    default=False,
+    help="sync historic process instances as well",
+)
+@click.option(
+    "--page-size",
+    "page_size",
+    type=int,
+    default=DEFAULT_PAGE_SIZE,
+    help=f"objects per request (default={DEFAULT_PAGE_SIZE})",
+)
+@with_output(default_table_output, default_json_output)
+@click.pass_context
+@with_exception_handler()
+def sync(
+    ctx: click.Context, resources: Tuple[str, ...], with_history: bool, page_size: int
+) -> List[Dict]:
+    """
+    pulls the resources from the engine into the mirror. resources with
+    timestamps (deployments, historic process instances) are synced
+    incrementally, the others are replaced.
+    """
+    store = _get_store(ctx)
+    client = ctx.obj.get_client()
+    result = []
+    for resource in MIRROR_RESOURCES:
+        if resources and resource.name not in resources:
+            continue
+        if not resources and resource.optional and not with_history:
+            continue
+        start = time.monotonic()
+        count = sync_resource(client, store, resource, page_size=page_size)
+        result.append(
+            {
+                "resource": resource.name,
+                "synced": count,
+                "seconds": round(time.monotonic() - start, 1),
+            }
+        )
+    return result
+
+
+@mirror.command("status")
+@with_output(default_table_output, default_json_output)
+@click.pass_context
+@with_exception_handler()
+def status(ctx: click.Context) -> List[Dict]:
+    """
+    shows the number of mirrored objects and the last sync by resource.
+    """
+    result = _get_store(ctx).status()
+    for row in result:
+        if row["synced_at"]:
+            row["synced_at"] = datetime.fromtimestamp(row["synced_at"]).isoformat(
+                timespec="seconds"
+            )
+    return result
@@ -0,0 +1,339 @@
+from datetime import datetime
+from typing import IO, Dict, List, Optional, Tuple
+
+import click
+import yaml
+
+from camundactl.bulk.migration import get_definition
+from camundactl.cmd.base import root
+from camundactl.cmd.batch import (
+    build_instance_query,
+    run_batches,
+    with_batch_options,
+    with_instance_query_options,
+)
+from camundactl.cmd.fanout import with_engine_options
+from camundactl.cmd.helpers import with_exception_handler
+from camundactl.export.runner import format_timestamp
+from camundactl.output import default_json_output, default_table_output
+from camundactl.output.decorator import with_output
+
+
+def with_instruction_options(cancel: bool = True):
+    """
+    adds the options to build the instructions of a modification.
+    """
+
+    def inner(func):
+        options = [
+            click.option(
+                "--start-before",
+                "start_before",
+                multiple=True,
+                help="start before this activity (repeatable)",
+            ),
+            click.option(
+                "--start-after",
+                "start_after",
+                multiple=True,
+                help="start after this activity (repeatable)",
+            ),
+            click.option(
+                "--instructions",
+                "instructions_file",
+                type=click.File("r"),
+                default=None,
+                help="a list of instructions (yaml or json) added after the "
+                "instructions of the options",
+            ),
+        ]
+        if cancel:
+            options.append(
+                click.option(
+                    "--cancel",
+                    "cancel",
+                    multiple=True,
+                    help="cancel all instances of this activity (repeatable)",
+                )
+            )
+        for option in reversed(options):
+            func = option(func)
+        return func
+
+    return inner
+
+
+def build_instructions(
+    start_before: Tuple[str, ...],
+    start_after: Tuple[str, ...],
+    instructions_file: Optional[IO[str]],
+    cancel: Tuple[str, ...] = (),
+) -> List[Dict]:
+    """
+    returns the instructions in the order: start before, start after,
+    cancel. starting first keeps the instances from ending when their
+    only activity is cancelled.
+    """
+    instructions = [
+        {"type": "startBeforeActivity", "activityId": activity_id}
+        for activity_id in start_before
+    ]
+    instructions += [
+        {"type": "startAfterActivity", "activityId": activity_id}
+        for activity_id in start_after
+    ]
+    instructions += [
+        {
+            "type": "cancel",
+            "activityId": activity_id,
+            "cancelCurrentActiveActivityInstances": True,
+        }
+        for activity_id in cancel
+    ]
+    if instructions_file:
+        instructions += yaml.safe_load(instructions_file) or []
+    if not instructions:
+        raise click.UsageError("no instructions given")
+    return instructions
+
+
+@root.command("modify")
+@click.argument("key")
+@click.option(
+    "--version",
+    "version",
+    type=int,
+    default=None,
+    help="the version of the process definition (default=the latest version)",
+)
+@click.option(
+    "--tenant-id", "tenant_id", default=None, help="the tenant of the definition"
+)
+@with_instruction_options()
+@click.option(
+    "--annotation",
+    "annotation",
+    default=None,
+    help="an annotation of the modification for the user operation log",
+)
+@click.option(
+    "--skip-custom-listeners",
+    "skip_custom_listeners",
+    is_flag=True,
+    default=False,
+    help="do not invoke execution listeners",
+)
+@click.option(
+    "--skip-io-mappings",
+    "skip_io_mappings",
+    is_flag=True,
+    default=False,
+    help="do not execute input/output mappings",
+)
+@with_instance_query_options()
+@with_batch_options()
+@with_output(default_table_output, default_json_output)
+@click.pass_context
+@with_engine_options()
+@with_exception_handler()
+def modify(
+    ctx: click.Context,
+    key: str,
+    version: Optional[int],
+    tenant_id: Optional[str],
+    start_before: Tuple[str, ...],
+    start_after: Tuple[str, ...],
+    instructions_file: Optional[IO[str]],
+    cancel: Tuple[str, ...],
+    annotation: Optional[str],
+    skip_custom_listeners: bool,
+    skip_io_mappings: bool,
+    activity_ids: Tuple[str, ...],
+    business_key_like: Optional[str],
+    with_incident: bool,
+    query_file: Optional[IO[str]],
+    **batch_options,
+):
+    """
+    modifies the running process instances of process definition KEY
+    (`POST /modification/executeAsync`), e.g. to move the tokens of a
+    broken activity:
+
+    cctl modify invoice --activity-id approve --start-before approve2
+    --cancel approve
+    """
+    instructions = build_instructions(
+        start_before, start_after, instructions_file, cancel
+    )
+    definition = get_definition(ctx.obj.get_client(), key, version, tenant_id)
+
+    def build(selection: Dict) -> Dict:
+        return {
+            "processDefinitionId": definition["id"],
+            "instructions": instructions,
+            "skipCustomListeners": skip_custom_listeners,
+            "skipIoMappings": skip_io_mappings,
+            "annotation": annotation,
+            **selection,
+        }
+
+    return run_batches(
+        ctx,
+        path="/modification/executeAsync",
+        query_path="/process-instance",
+        query=build_instance_query(
+            definition["id"], activity_ids, business_key_like, with_incident, query_file
+        ),
+        sort_by="instanceId",
+        ids_field="processInstanceIds",
+        query_field="processInstanceQuery",
+        build=build,
+        params={"instructions": instructions},
+        **batch_options,
+    )
+
+
+@root.command("restart")
+@click.argument("key")
+@click.option(
+    "--version",
+    "version",
+    type=int,
+    default=None,
+    help="the version of the process definition (default=the latest version)",
+)
+@click.option(
+    "--tenant-id", "tenant_id", default=None, help="the tenant of the definition"
+)
+@with_instruction_options(cancel=False)
+@click.option(
+    "--initial-variables",
+    "initial_variables",
+    is_flag=True,
+    default=False,
+    help="restart with the variables the instances were started with",
+)
+@click.option(
+    "--without-business-key",
+    "without_business_key",
+    is_flag=True,
+    default=False,
+    help="do not set the business keys of the instances",
+)
+@click.option(
+    "--skip-custom-listeners",
+    "skip_custom_listeners",
+    is_flag=True,
+    default=False,
+    help="do not invoke execution listeners",
+)
+@click.option(
+    "--skip-io-mappings",
+    "skip_io_mappings",
+    is_flag=True,
+    default=False,
+    help="do not execute input/output mappings",
+)
+@click.option(
+    "--finished-after",
+    "finished_after",
+    type=click.DateTime(),
+    default=None,
+    help="only instances finished after this time (utc)",
+)
+@click.option(
+    "--finished-before",
+    "finished_before",
+    type=click.DateTime(),
+    default=None,
+    help="only instances finished before this time (utc)",
+)
+@click.option(
+    "--canceled",
+    "canceled",
+    is_flag=True,
+    default=False,
+    help="only instances canceled externally (e.g. by a user)",
+)
+@click.option(
+    "--business-key-like",
+    "business_key_like",
+    default=None,
+    help="only instances with a business key like this (e.g. order-%)",
+)
+@click.option(
+    "-q",
+    "--query",
+    "query_file",
+    type=click.File("r"),
+    default=None,
+    help="a historic process instance query (yaml or json) adding filters",
+)
+@with_batch_options()
+@with_output(default_table_output, default_json_output)
+@click.pass_context
+@with_engine_options()
+@with_exception_handler()
+def restart(
+    ctx: click.Context,
+    key: str,
+    version: Optional[int],
+    tenant_id: Optional[str],
+    start_before: Tuple[str, ...],
+    start_after: Tuple[str, ...],
+    instructions_file: Optional[IO[str]],
+    initial_variables: bool,
+    without_business_key: bool,
+    skip_custom_listeners: bool,
+    skip_io_mappings: bool,
+    finished_after: Optional[datetime],
+    finished_before: Optional[datetime],
+    canceled: bool,
+    business_key_like: Optional[str],
+    query_file: Optional[IO[str]],
+    **batch_options,
+):
+    """
+    restarts finished process instances of process definition KEY
+    (`POST /process-definition/{id}/restart-async`), e.g. the instances
+    canceled by a bad deployment:
+
+    cctl restart invoice --canceled --finished-after 2024-03-01
+    --start-before approve --initial-variables
+    """
+    instructions = build_instructions(start_before, start_after, instructions_file)
+    definition = get_definition(ctx.obj.get_client(), key, version, tenant_id)
+
+    query = yaml.safe_load(query_file) if query_file else {}
+    query.update(processDefinitionId=definition["id"], finished=True)
+    if finished_after:
+        query["finishedAfter"] = format_timestamp(finished_after)
+    if finished_before:
+        query["finishedBefore"] = format_timestamp(finished_before)
+    if canceled:
+        query["externallyTerminated"] = True
+    if business_key_like:
+        query["processInstanceBusinessKeyLike"] = business_key_like
+
+    def build(selection: Dict) -> Dict:
+        return {
+            "instructions": instructions,
+            "initialVariables": initial_variables,
+            "withoutBusinessKey": without_business_key,
+            "skipCustomListeners": skip_custom_listeners,
+            "skipIoMappings": skip_io_mappings,
+            **selection,
+        }
+
+    return run_batches(
+        ctx,
+        path=f"/process-definition/{definition['id']}/restart-async",
+        query_path="/history/process-instance",
+        query=query,
+        sort_by="instanceId",
+        ids_field="processInstanceIds",
+        query_field="historicProcessInstanceQuery",
+        build=build,
+        params={"instructions": instructions},
+        **batch_options,
+    )
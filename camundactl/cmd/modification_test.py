@@ -0,0 +1,26 @@
+import io
+
+import click
+import pytest
+
+from .modification import build_instructions
+
+
+def test_build_instructions_starts_before_cancel():
+    instructions = build_instructions(
+        ("approve2",),
+        (),
+        io.StringIO("- {type: startTransition, transitionId: flow1}"),
+        cancel=("approve",),
+    )
+
+    assert [instruction["type"] for instruction in instructions] == [
+        "startBeforeActivity",
+        "cancel",
+        "startTransition",
+    ]
+
+
+def test_build_instructions_required():
+    with pytest.raises(click.UsageError):
+        build_instructions((), (), None)
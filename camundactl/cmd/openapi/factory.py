@@ -1,22 +1,38 @@
 import json
 import logging
 from functools import partial
-from typing import Callable, Dict, List, Optional, Tuple, TypedDict
+from typing import Callable, Dict, Iterator, List, Optional, Tuple, TypedDict
 
 import click
 import jsonschema
 import yaml
-from toolz import first
+from toolz import first, unique
 
+from camundactl.aggregate import Aggregation, GroupBy, parse_aggregations
+from camundactl.bulk import BulkStats, execute, open_journal
+from camundactl.bulk.executor import DEFAULT_CONCURRENCY
 from camundactl.client import Client
+from camundactl.client.paging import iter_pages
+from camundactl.client.parallel import fetch_by_ids, fetch_each
 from camundactl.cmd.context import ensure_object
+from camundactl.cmd.fanout import with_fan_out
+from camundactl.cmd.watch import (
+    DEFAULT_WATCH_INTERVAL,
+    get_time_filter,
+    watch_changes,
+)
 from camundactl.cmd.helpers import (
     ArgumentTuple,
     OptionTuple,
+    print_journal,
     with_args_factory,
     with_exception_handler,
     with_query_option_factory,
+    with_resume_option,
 )
+from camundactl.export.windows import get_time_window, iter_window_pages
+from camundactl.join import RELATION_NAMES, Relation, get_relations, join
+from camundactl.mirror import MirrorStore, get_mirror_file, get_resource_by_operation_id
 from camundactl.openapi.cache import OpenAPISpecCache
 from camundactl.output import (
     TemplateOutputHandler,
@@ -33,6 +49,54 @@ logger = logging.getLogger(__name__)
 
 get = None
 
+ID_PATH_SUFFIX = "/{id}"
+
+
+def _read_ids(ids: Tuple[str, ...]) -> List[str]:
+    """
+    returns the ids. the id `-` reads one id per line from stdin.
+    """
+    if "-" not in ids:
+        return list(ids)
+    stdin = click.get_text_stream("stdin")
+    result = []
+    for id_ in ids:
+        if id_ == "-":
+            result.extend(line.strip() for line in stdin if line.strip())
+        else:
+            result.append(id_)
+    return result
+
+
+def _parse_relations(
+    ctx: click.Context, param: click.Parameter, value: Optional[str]
+) -> List[Relation]:
+    if not value:
+        return []
+    try:
+        return get_relations(value)
+    except KeyError as error:
+        raise click.BadParameter(
+            f"unknown relation {error}, choose from {', '.join(RELATION_NAMES)}"
+        )
+
+
+def _parse_aggregations(
+    ctx: click.Context, param: click.Parameter, values: Tuple[str, ...]
+) -> List[Aggregation]:
+    try:
+        return [
+            aggregation for value in values for aggregation in parse_aggregations(value)
+        ]
+    except ValueError as error:
+        raise click.BadParameter(str(error))
+
+
+def _parse_fields(
+    ctx: click.Context, param: click.Parameter, value: Optional[str]
+) -> List[str]:
+    return [field.strip() for field in (value or "").split(",") if field.strip()]
+
 
 @ensure_object()
 def generic_autocomplete(
@@ -143,6 +207,7 @@ class OpenAPICommandFactory(object):
         self,
         definition,
         args_autocomplete: Optional[Dict[str, Callable]] = None,
+        multiple_args: Tuple[str, ...] = (),
     ):
         args_autocomplete = args_autocomplete or {}
 
@@ -151,6 +216,7 @@ class OpenAPICommandFactory(object):
                 param.get("name"),
                 param.get("description"),
                 args_autocomplete.get(param.get("name"), None),
+                -1 if param.get("name") in multiple_args else 1,
             )
             for param in definition.get("parameters", ())
             if param.get("in") == "path"
@@ -163,6 +229,7 @@ class OpenAPICommandFactory(object):
         output_handlers: Optional[Tuple[OutputHandler]] = None,
         args_autocomplete: Optional[Dict[str, Callable]] = None,
         options_autocomplete: Optional[Dict[str, Callable]] = None,
+        multiple_args: Tuple[str, ...] = (),
     ):
 
         path = self.openapi_cache.get_operation_id_path(operation_id)
@@ -188,7 +255,7 @@ class OpenAPICommandFactory(object):
         )
 
         options = self._get_options(definition, options_autocomplete)
-        args = self._get_args(definition, args_autocomplete)
+        args = self._get_args(definition, args_autocomplete, multiple_args)
 
         command = with_output(*output_handlers)(command)
         command = with_query_option_factory(options=options, name="options")(command)
@@ -213,6 +280,59 @@ class OpenAPICommandFactory(object):
         else:
             return schema.get("type") == "array"
 
+    def _has_multiple_ids(self, path: str) -> bool:
+        """
+        tests weather the path addresses one object by its id (`/.../{id}`)
+        and so the command can accept multiple ids.
+        """
+        return path.endswith(ID_PATH_SUFFIX) and path.count("{") == 1
+
+    def _get_id_list_filter(self, path: str) -> Optional[Tuple[str, str]]:
+        """
+        returns the path of the list operation and the name of its query
+        parameter that filters by a comma seperated list of ids
+        (e.g. `processInstanceIds` or `taskIdIn`) for an object path
+        like `/process-instance/{id}`. returns none if there is none.
+        """
+        list_path = path[: -len(ID_PATH_SUFFIX)]
+        list_operation_id = self.openapi_cache.get_operation_id_by_path(
+            list_path, "get"
+        )
+        if not list_operation_id:
+            return None
+        first_part, *parts = list_path.rsplit("/", 1)[-1].split("-")
+        resource = first_part + "".join(map(str.title, parts))
+        candidates = (f"{resource}Ids", f"{resource}IdIn")
+        list_definition = self.openapi_cache.get_operation_id_spec(list_operation_id)
+        for param in list_definition.get("parameters", ()):
+            if param.get("in") == "query" and param.get("name") in candidates:
+                return list_path, param["name"]
+        return None
+
+    def _get_many(
+        self, client: Client, path: str, ids: Tuple[str, ...], options: Dict
+    ) -> List[Dict]:
+        """
+        requests multiple objects by id. uses batched requests of the list
+        operation if it supports filtering by ids, otherwise requests the
+        objects concurrently one by one.
+        """
+        id_list_filter = self._get_id_list_filter(path)
+        # the query options belong to the object operation and are not
+        # necessarily supported by the list operation
+        if not id_list_filter or options:
+            return fetch_each(client, path, ids, params=options)
+
+        list_path, id_param = id_list_filter
+        lookup = fetch_by_ids(client, list_path, id_param, ids)
+        if missing := [id_ for id_ in unique(ids) if id_ not in lookup]:
+            click.secho(
+                f"the objects {', '.join(missing)} you requested do not exist",
+                fg="yellow",
+                err=True,
+            )
+        return [lookup[id_] for id_ in unique(ids) if id_ in lookup]
+
     def create_get_command(
         self,
         operation_id: str,
@@ -224,15 +344,162 @@ class OpenAPICommandFactory(object):
         path = self.openapi_cache.get_operation_id_path(operation_id)
         definition = self.openapi_cache.get_operation_id_spec(operation_id)
 
-        def command(ctx: click.Context, options: Dict, args: Dict):
+        has_multiple_ids = self._has_multiple_ids(path)
+        has_list_response = self._has_list_response(definition)
+        mirror_resource = get_resource_by_operation_id(operation_id)
+
+        def watch_command(ctx: click.Context, options: Dict, interval: float):
+            if ctx.obj.get_selected_engines():
+                raise click.ClickException("--watch supports a single engine only")
+            parameter_names = [
+                param.get("name") for param in definition.get("parameters", ())
+            ]
+            return watch_changes(
+                ctx.obj.get_client(),
+                path,
+                options,
+                interval=interval,
+                time_filter=get_time_filter(parameter_names),
+                has_count=bool(
+                    self.openapi_cache.get_operation_id_by_path(f"{path}/count", "get")
+                ),
+            )
+
+        def command(
+            ctx: click.Context,
+            options: Dict,
+            args: Dict,
+            from_mirror: bool = False,
+            watch: bool = False,
+            interval: float = DEFAULT_WATCH_INTERVAL,
+            relations: Tuple[Relation, ...] = (),
+            group_by: Tuple[str, ...] = (),
+            aggregations: Tuple[Aggregation, ...] = (),
+        ):
+            if watch:
+                if relations or group_by or aggregations:
+                    raise click.UsageError(
+                        "--join, --group-by and --agg can not be used with --watch"
+                    )
+                return watch_command(ctx, options, interval)
+            if group_by or aggregations:
+                return aggregate_command(
+                    ctx, options, args, from_mirror, relations, group_by, aggregations
+                )
+            return get_command(ctx, options, args, from_mirror, relations)
+
+        @with_fan_out()
+        def aggregate_command(
+            ctx: click.Context,
+            options: Dict,
+            args: Dict,
+            from_mirror: bool,
+            relations: Tuple[Relation, ...],
+            group_by: Tuple[str, ...],
+            aggregations: Tuple[Aggregation, ...],
+        ):
+            # paged lists are requested page by page, only the aggregates
+            # of the groups are kept. lists with a time filter are
+            # requested window by window, so the offsets stay small.
+            # lists which can not be paged are requested at once
+            group = GroupBy(group_by, aggregations)
+            client = ctx.obj.get_client()
+            parameter_names = [
+                param.get("name") for param in definition.get("parameters", ())
+            ]
+            paged = "firstResult" in parameter_names and "maxResults" in parameter_names
+            if from_mirror or not paged:
+                pages = iter([fetch(ctx, options, args, from_mirror)])
+            elif time_window := get_time_window(parameter_names):
+                pages = iter_window_pages(
+                    client, path.format(**args), options, time_window
+                )
+            else:
+                pages = iter_pages(client, path.format(**args), options)
+            for page in pages:
+                if relations:
+                    page = join(client, page, relations)
+                group.add_all(page)
+            return group.rows()
+
+        @with_fan_out()
+        def get_command(
+            ctx: click.Context,
+            options: Dict,
+            args: Dict,
+            from_mirror: bool,
+            relations: Tuple[Relation, ...],
+        ):
+            result = fetch(ctx, options, args, from_mirror)
+            if relations and isinstance(result, list):
+                return join(ctx.obj.get_client(), result, relations)
+            return result
+
+        def fetch(ctx: click.Context, options: Dict, args: Dict, from_mirror: bool):
+            if from_mirror:
+                store = MirrorStore(get_mirror_file(ctx.obj.get_engine_name()))
+                return store.query(mirror_resource, options)
             client: Client = ctx.obj["client"]
+            if has_multiple_ids:
+                ids = args["id"]
+                if len(ids) > 1:
+                    return self._get_many(client, path, ids, options)
+                args = {"id": first(ids)}
             resp = client.get(path.format(**args), params=options)
             resp.raise_for_status()
             if "application/json" in resp.headers.get("Content-Type"):
                 return resp.json()
             return resp.content
 
-        has_list_response = self._has_list_response(definition)
+        if mirror_resource:
+            command = click.option(
+                "--from-mirror",
+                "from_mirror",
+                is_flag=True,
+                default=False,
+                help="answer the query from the local mirror (see `cctl mirror`)",
+            )(command)
+
+        if has_list_response and not has_multiple_ids:
+            command = click.option(
+                "--watch",
+                "watch",
+                is_flag=True,
+                default=False,
+                help="poll the list and print added (+), changed (~) "
+                "and removed (-) rows",
+            )(command)
+            command = click.option(
+                "--interval",
+                "interval",
+                type=float,
+                default=DEFAULT_WATCH_INTERVAL,
+                help=f"seconds between polls (default={DEFAULT_WATCH_INTERVAL})",
+            )(command)
+            command = click.option(
+                "--join",
+                "relations",
+                default=None,
+                callback=_parse_relations,
+                help="comma seperated list of related objects to add fields of "
+                f"({', '.join(RELATION_NAMES)})",
+            )(command)
+            command = click.option(
+                "--group-by",
+                "group_by",
+                default=None,
+                callback=_parse_fields,
+                help="comma seperated list of fields to aggregate the list by",
+            )(command)
+            command = click.option(
+                "--agg",
+                "aggregations",
+                multiple=True,
+                callback=_parse_aggregations,
+                help="comma seperated list of aggregations: count, count(field), "
+                "min(field), max(field), sum(field), avg(field) or quantiles like "
+                "p95(field) (default=count)",
+            )(command)
 
         default_output_handlers = (
             default_table_output if has_list_response else default_object_table_output,
@@ -258,8 +525,61 @@ class OpenAPICommandFactory(object):
             args_autocomplete=args_autocomplete
             or self._get_default_args_autocomplete(path),
             options_autocomplete=options_autocomplete,
+            multiple_args=("id",) if has_multiple_ids else (),
         )
 
+    def _delete_many(
+        self,
+        ctx: click.Context,
+        path: str,
+        ids: List[str],
+        options: Dict,
+        concurrency: int,
+        resume: Optional[str],
+        resend_in_flight: bool = False,
+    ) -> Iterator[List[Dict]]:
+        """
+        deletes the objects concurrently and journaled, so an interrupted
+        run can be resumed. returns a stream of the results.
+        """
+        client: Client = ctx.obj["client"]
+        journal = open_journal(
+            resume,
+            f"DELETE {path}",
+            {"engine": ctx.obj.get_engine_name(), "options": options},
+        )
+        results = execute(
+            ids,
+            lambda id_: client.delete(path.format(id=id_), params=options),
+            concurrency=concurrency,
+            stats=(stats := BulkStats()),
+            journal=journal,
+            key=lambda index, id_: id_,
+            resend_in_flight=resend_in_flight,
+        )
+
+        def stream() -> Iterator[List[Dict]]:
+            print_journal(journal)
+            try:
+                for result in results:
+                    yield [
+                        {
+                            "id": result.item,
+                            "status": result.status,
+                            "httpStatus": result.http_status,
+                            "error": result.error,
+                        }
+                    ]
+            finally:
+                journal.close()
+                click.echo(
+                    " ".join(f"{k}={v}" for k, v in stats.snapshot().items()),
+                    err=True,
+                )
+                print_journal(journal, finished=True)
+
+        return stream()
+
     def create_delete_command(
         self,
         operation_id,
@@ -267,9 +587,24 @@ class OpenAPICommandFactory(object):
         options_autocomplete: Optional[Dict[str, Callable]] = None,
     ) -> click.Command:
         path, definition = self._get_operation_definition(operation_id, "delete")
+        has_multiple_ids = self._has_multiple_ids(path)
 
-        def command(ctx: click.Context, options: Dict, args: Dict):
+        def command(
+            ctx: click.Context,
+            options: Dict,
+            args: Dict,
+            concurrency: int = DEFAULT_CONCURRENCY,
+            resume: Optional[str] = None,
+            resend_in_flight: bool = False,
+        ):
             client: Client = ctx.obj["client"]
+            if has_multiple_ids:
+                ids = _read_ids(args["id"])
+                if len(ids) > 1 or resume:
+                    return self._delete_many(
+                        ctx, path, ids, options, concurrency, resume, resend_in_flight
+                    )
+                args = {"id": first(ids)}
             resp = client.delete(path.format(**args), params=options)
             resp.raise_for_status()
 
@@ -279,6 +614,18 @@ class OpenAPICommandFactory(object):
             ),
         )
 
+        if has_multiple_ids:
+            command = with_resume_option()(command)
+            command = click.option(
+                "--concurrency",
+                "concurrency",
+                type=int,
+                default=DEFAULT_CONCURRENCY,
+                help="maximal requests sent at once deleting multiple ids "
+                f"(default={DEFAULT_CONCURRENCY})",
+            )(command)
+            output_handlers += (default_table_output, default_json_output)
+
         return self.create_command(
             command=command,
             operation_id=operation_id,
@@ -287,6 +634,7 @@ class OpenAPICommandFactory(object):
             or self._get_default_args_autocomplete(path),
             options_autocomplete=options_autocomplete
             or self._get_default_options_autocomplete(definition),
+            multiple_args=("id",) if has_multiple_ids else (),
         )
 
     def create_apply_command(
@@ -0,0 +1,86 @@
+from unittest.mock import Mock, patch
+
+import click
+import pytest
+from click.testing import CliRunner
+
+from camundactl.cmd.context import ContextObject
+from camundactl.openapi.loader import load_spec
+
+from .factory import OpenAPICommandFactory, generic_autocomplete
+
+
+@pytest.fixture(scope="module")
+def factory() -> OpenAPICommandFactory:
+    return OpenAPICommandFactory(load_spec("latest"))
+
+
+def _invoke(command: click.Command, args: list, client: Mock) -> str:
+    obj = ContextObject()
+    obj._config = {
+        "engines": [{"name": "local", "url": "http://localhost:8080/engine-rest"}],
+        "current_engine": "local",
+    }
+    with patch("camundactl.cmd.context.ContextObject.get_client", return_value=client):
+        result = CliRunner().invoke(command, [*args, "-o", "json"], obj=obj)
+    assert result.exception is None, result.output
+    return result.output
+
+
+def _list_client(rows: list) -> Mock:
+    def get(path, params=None):
+        first = (params or {}).get("firstResult", 0)
+        size = (params or {}).get("maxResults", len(rows))
+        return Mock(
+            status_code=200,
+            headers={"Content-Type": "application/json"},
+            json=Mock(return_value=rows[first : first + size]),
+        )
+
+    return Mock(get=Mock(side_effect=get))
+
+
+def test_generic_autocomplete_creates_context_object():
+    client = Mock()
+    client.get.return_value.json.return_value = [{"id": "abc"}, {"id": "xyz"}]
+    ctx = click.Context(click.Command("get"))
+
+    with patch("camundactl.cmd.context.ContextObject.get_client", return_value=client):
+        result = generic_autocomplete(ctx, "id", "a", endpoint="/process-instance")
+
+    assert result == ["abc"]
+    client.get.assert_called_once_with("/process-instance")
+
+
+def test_aggregate_formats_the_path(factory: OpenAPICommandFactory):
+    command = factory.create_get_command("getActivityStatistics")
+    client = _list_client([{"id": "a", "instances": 1}, {"id": "a", "instances": 2}])
+
+    output = _invoke(command, ["def1", "--group-by", "id"], client)
+
+    assert '"count": 2' in output
+    client.get.assert_called_once_with("/process-definition/def1/statistics", params={})
+
+
+def test_aggregate_unpaged_list(factory: OpenAPICommandFactory):
+    # the statistics can not be paged. they are requested once
+    command = factory.create_get_command("getProcessDefinitionStatistics")
+    client = _list_client([{"id": f"d{i % 2}"} for i in range(600)])
+
+    output = _invoke(command, ["--group-by", "id"], client)
+
+    assert '"count": 300' in output
+    assert client.get.call_count == 1
+
+
+def test_aggregate_paged_list(factory: OpenAPICommandFactory):
+    command = factory.create_get_command("getProcessInstances")
+    client = _list_client([{"id": f"p{i}", "suspended": i < 100} for i in range(600)])
+
+    output = _invoke(command, ["--group-by", "suspended"], client)
+
+    assert '"count": 100' in output and '"count": 500' in output
+    offsets = [
+        call.kwargs["params"]["firstResult"] for call in client.get.call_args_list
+    ]
+    assert offsets == [0, 500]
@@ -0,0 +1,44 @@
+from camundactl.cmd.base import describe
+from camundactl.cmd.describe import DescribeQuery, create_describe_command
+from camundactl.cmd.openapi.factory import process_definition_autocomplete
+
+DESCRIBE_PROCESS_DEFINITION_TEMPLATE = """
+Id: {{id}}
+Key: {{key}}
+Name: {{name}}
+Version: {{version}}
+VersionTag: {{versionTag}}
+TenantId: {{tenantId}}
+DeploymentId: {{deploymentId}}
+Resource: {{resource}}
+
+Suspended: {{suspended}}
+
+RunningInstances: {{instances.count}}
+
+Activities: {% for act in statistics %}
+    - Id:         {{act.id}}
+      Instances:  {{act.instances}}
+      FailedJobs: {{act.failedJobs}}
+      Incidents:  {% for inc in act.incidents %}{{inc.incidentType}}={{inc.incidentCount}} {% endfor %}{% endfor %}
+""".strip()
+
+
+describe_process_definition = create_describe_command(
+    describe,
+    "processDefinition",
+    path="/process-definition/{id}",
+    queries=[
+        DescribeQuery(
+            "statistics",
+            "/process-definition/{id}/statistics",
+            {"failedJobs": "true", "incidents": "true"},
+        ),
+        DescribeQuery(
+            "instances", "/process-instance/count", {"processDefinitionId": "{id}"}
+        ),
+    ],
+    template=DESCRIBE_PROCESS_DEFINITION_TEMPLATE,
+    help="describe one process definition with its runtime statistics",
+    autocomplete=process_definition_autocomplete,
+)
@@ -0,0 +1,236 @@
+import re
+from typing import Callable, Dict, List, NamedTuple, Optional
+
+import click
+
+from camundactl.bulk import OK, BulkStats, execute, open_journal, query_ids
+from camundactl.cmd.base import AliasGroup, root
+from camundactl.cmd.batch import run_batches, with_batch_options
+from camundactl.cmd.fanout import with_engine_options
+from camundactl.cmd.helpers import print_journal, with_exception_handler
+from camundactl.output import default_json_output, default_table_output
+from camundactl.output.decorator import with_output
+
+
+class RetryResource(NamedTuple):
+    name: str
+    # the list operation (posted query)
+    path: str
+    sort_by: str
+    # the async operation creating a batch
+    async_path: str
+    ids_field: str
+    query_field: str
+    # the operation setting the retries of one object
+    path_by_id: str
+    # the field of the error message
+    message_field: str
+
+
+RETRY_RESOURCES = (
+    RetryResource(
+        "jobs",
+        "/job",
+        "jobId",
+        "/job/retries",
+        "jobIds",
+        "jobQuery",
+        "/job/{id}/retries",
+        "exceptionMessage",
+    ),
+    RetryResource(
+        "externalTasks",
+        "/external-task",
+        "id",
+        "/external-task/retries-async",
+        "externalTaskIds",
+        "externalTaskQuery",
+        "/external-task/{id}/retries",
+        "errorMessage",
+    ),
+)
+
+
+@root.group("retry", cls=AliasGroup)
+@click.pass_context
+@with_engine_options()
+def retry(ctx: click.Context):
+    """
+    resets the retries of failed jobs and external tasks
+    """
+
+
+def create_predicate(
+    message: Optional[str], message_field: str, definition_key: Optional[str]
+) -> Optional[Callable[[Dict], bool]]:
+    """
+    returns a filter for what the queries do not support: error messages
+    matching a pattern and the definition key of external tasks.
+    """
+    if not message and not definition_key:
+        return None
+    pattern = re.compile(message) if message else None
+
+    def predicate(item: Dict) -> bool:
+        if pattern and not pattern.search(item.get(message_field) or ""):
+            return False
+        if definition_key and item.get("processDefinitionKey") != definition_key:
+            return False
+        return True
+
+    return predicate
+
+
+def _retry_each(
+    ctx: click.Context,
+    resource: RetryResource,
+    query: Dict,
+    predicate: Optional[Callable[[Dict], bool]],
+    retries: int,
+    resume: Optional[str],
+    resend_in_flight: bool,
+    dry_run: bool,
+) -> List[Dict]:
+    """
+    sets the retries of every object by id. for engines without the
+    async operation. returns the objects failed.
+    """
+    client = ctx.obj.get_client()
+    if dry_run:
+        matching = query_ids(
+            client, resource.path, query, resource.sort_by, predicate=predicate
+        )
+        return [{"path": resource.path_by_id, "count": sum(1 for _ in matching)}]
+    journal = open_journal(
+        resume,
+        f"PUT {resource.path_by_id}",
+        {"engine": ctx.obj.get_engine_name(), "query": query, "retries": retries},
+    )
+    print_journal(journal)
+    ids = list(
+        query_ids(client, resource.path, query, resource.sort_by, predicate=predicate)
+    )
+    results = execute(
+        ids,
+        lambda id_: client.put(
+            resource.path_by_id.format(id=id_), json={"retries": retries}
+        ),
+        stats=(stats := BulkStats()),
+        journal=journal,
+        key=lambda index, id_: id_,
+        resend_in_flight=resend_in_flight,
+    )
+    try:
+        return [
+            {"id": result.item, "status": result.status, "error": result.error}
+            for result in results
+            if result.status != OK
+        ]
+    finally:
+        journal.close()
+        click.echo(" ".join(f"{k}={v}" for k, v in stats.snapshot().items()), err=True)
+        print_journal(journal, finished=True)
+
+
+def _create_retry_command(resource: RetryResource) -> click.Command:
+    @retry.command(
+        resource.name,
+        help=(
+            f"resets the retries of failed {resource.name} (`{resource.async_path}`). "
+            "the failed objects are counted and submitted in chunks, each chunk "
+            "becomes a batch. filters the queries do not support (--message) "
+            "select the objects by id."
+        ),
+    )
+    @click.option(
+        "--retries",
+        "retries",
+        type=click.IntRange(min=1),
+        default=1,
+        help="the retries to set (default=1)",
+    )
+    @click.option(
+        "--activity-id",
+        "activity_id",
+        default=None,
+        help="only objects of this activity",
+    )
+    @click.option(
+        "--definition",
+        "definition_key",
+        default=None,
+        help="only objects of the process definition with this key",
+    )
+    @click.option(
+        "--message",
+        "message",
+        default=None,
+        help="only objects with an error message matching this regular expression",
+    )
+    @click.option(
+        "--all",
+        "all_",
+        is_flag=True,
+        default=False,
+        help="also objects with retries left",
+    )
+    @with_batch_options()
+    @with_output(default_table_output, default_json_output)
+    @click.pass_context
+    @with_exception_handler()
+    def command(
+        ctx: click.Context,
+        retries: int,
+        activity_id: Optional[str],
+        definition_key: Optional[str],
+        message: Optional[str],
+        all_: bool,
+        **batch_options,
+    ):
+        query: Dict = {}
+        if not all_:
+            query["noRetriesLeft"] = True
+        if activity_id:
+            query["activityId"] = activity_id
+        if definition_key and resource.name == "jobs":
+            query["processDefinitionKey"] = definition_key
+            definition_key = None
+        predicate = create_predicate(message, resource.message_field, definition_key)
+
+        spec_cache = ctx.obj.get_spec_cache()
+        if not spec_cache.get_operation_id_by_path(resource.async_path, "post"):
+            click.echo(
+                f"the engine does not support {resource.async_path}. "
+                "setting the retries one by one",
+                err=True,
+            )
+            return _retry_each(
+                ctx,
+                resource,
+                query,
+                predicate,
+                retries,
+                batch_options["resume"],
+                batch_options["resend_in_flight"],
+                batch_options["dry_run"],
+            )
+
+        return run_batches(
+            ctx,
+            path=resource.async_path,
+            query_path=resource.path,
+            query=query,
+            sort_by=resource.sort_by,
+            ids_field=resource.ids_field,
+            query_field=resource.query_field,
+            build=lambda selection: {"retries": retries, **selection},
+            params={"retries": retries, "message": message},
+            predicate=predicate,
+            **batch_options,
+        )
+
+    return command
+
+
+for _resource in RETRY_RESOURCES:
+    _create_retry_command(_resource)
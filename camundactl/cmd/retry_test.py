@@ -0,0 +1,14 @@
+from .retry import create_predicate
+
+
+def test_create_predicate():
+    assert create_predicate(None, "exceptionMessage", None) is None
+
+    predicate = create_predicate("refused|timed out", "exceptionMessage", "invoice")
+    assert predicate(
+        {"exceptionMessage": "Connection refused", "processDefinitionKey": "invoice"}
+    )
+    assert not predicate(
+        {"exceptionMessage": "Connection refused", "processDefinitionKey": "order"}
+    )
+    assert not predicate({"exceptionMessage": None, "processDefinitionKey": "invoice"})
@@ -0,0 +1,166 @@
+import logging
+import shlex
+from typing import Callable, List, Optional
+
+import click
+from click.shell_completion import ShellComplete
+
+from camundactl.cmd.base import root
+from camundactl.cmd.context import ContextObject
+from camundactl.config import get_configdir
+
+try:
+    import readline
+except ImportError:  # e.g. windows
+    readline = None  # type: ignore
+
+
+logger = logging.getLogger(__name__)
+
+HISTORY_LENGTH = 1000
+
+SHELL_HELP = """
+Enter cctl commands without the leading `cctl` (e.g. `get processInstances`).
+
+Builtin commands:
+  use ENGINE   use another engine for the following commands
+  engine       show the engine in use
+  help         show this help
+  exit, quit   leave the shell (or press Ctrl-D)
+""".strip()
+
+
+def get_historyfile():
+    return get_configdir() / "shell_history"
+
+
+def run_command(obj: ContextObject, args: List[str]) -> int:
+    """
+    runs one cctl command in this process with the given context object
+    and returns the exit code.
+    """
+    try:
+        rv = root.main(args, prog_name="cctl", standalone_mode=False, obj=obj)
+    except click.exceptions.Exit as exit_:
+        return exit_.exit_code
+    except click.ClickException as error:
+        error.show()
+        return error.exit_code
+    except click.Abort:
+        click.echo("Aborted!", err=True)
+        return 1
+    except Exception as error:
+        # commands without exception handler must not end the shell
+        logger.debug("command failed", exc_info=True)
+        click.secho(f"Error: {error}", fg="red", err=True)
+        return 1
+    finally:
+        obj.reset_selection()
+    # without standalone mode click returns the code of ctx.exit
+    return rv if isinstance(rv, int) else 0
+
+
+def _create_completer(obj: ContextObject) -> Callable[[str, int], Optional[str]]:
+    """
+    creates a readline completer which uses the shell completion of
+    click. so the commands, options and argument values (e.g. process
+    instance ids) can be completed.
+    """
+    complete = ShellComplete(root, {"obj": obj}, "cctl", "_CCTL_COMPLETE")
+    matches: List[str] = []
+
+    def completer(text: str, state: int) -> Optional[str]:
+        if state == 0:
+            line = readline.get_line_buffer()[: readline.get_begidx()]
+            try:
+                args = shlex.split(line)
+                items = complete.get_completions(args, text)
+                matches[:] = [item.value for item in items]
+            except Exception as error:
+                logger.debug("completion failed: %s", error)
+                matches[:] = []
+        try:
+            return matches[state]
+        except IndexError:
+            return None
+
+    return completer
+
+
+def _setup_readline(obj: ContextObject) -> None:
+    if readline is None:
+        return
+    try:
+        readline.read_history_file(get_historyfile())
+    except OSError:
+        pass
+    readline.set_history_length(HISTORY_LENGTH)
+    readline.set_completer_delims(" \t\n")
+    readline.set_completer(_create_completer(obj))
+    readline.parse_and_bind("tab: complete")
+
+
+def _save_history() -> None:
+    if readline is None:
+        return
+    try:
+        readline.write_history_file(get_historyfile())
+    except OSError as error:
+        logger.warning("could not write shell history: %s", error)
+
+
+@root.command("shell")
+@click.option("-e", "--engine", "engine", required=False, help="engine to start with")
+@click.pass_context
+def shell(ctx: click.Context, engine: Optional[str]):
+    """
+    starts an interactive shell. the config, the openapi spec, the
+    connections to the engines and the created commands are kept
+    loaded, so every command runs without startup costs.
+    """
+    obj: ContextObject = ctx.obj
+    if engine:
+        obj.set_default_engine(engine)
+    _setup_readline(obj)
+    click.echo(f"cctl shell. engine: {obj.get_engine_name()}. type 'help' for help.")
+
+    try:
+        while True:
+            try:
+                line = input(f"cctl ({obj.get_engine_name()})> ")
+            except KeyboardInterrupt:
+                click.echo()
+                continue
+            except EOFError:
+                click.echo()
+                break
+
+            try:
+                args = shlex.split(line)
+            except ValueError as error:
+                click.secho(str(error), fg="red", err=True)
+                continue
+            if not args:
+                continue
+
+            name, *rest = args
+            if name in ("exit", "quit"):
+                break
+            if name == "help":
+                click.echo(SHELL_HELP)
+            elif name == "engine":
+                click.echo(obj.get_engine_name())
+            elif name == "use":
+                try:
+                    obj.set_default_engine(rest[0] if rest else None)
+                except Exception as error:
+                    click.secho(str(error), fg="red", err=True)
+            elif name == "shell":
+                click.secho("already in a shell", fg="yellow", err=True)
+            else:
+                try:
+                    run_command(obj, args)
+                except KeyboardInterrupt:
+                    click.echo("Aborted!", err=True)
+    finally:
+        _save_history()
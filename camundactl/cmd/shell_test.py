@@ -0,0 +1,44 @@
+from unittest.mock import Mock, patch
+
+import click
+
+from camundactl.cmd.context import ContextObject
+
+from .shell import run_command
+
+
+@patch("camundactl.cmd.shell.root")
+def test_run_command_reuses_context_object(root: Mock):
+    obj = ContextObject()
+    obj.set_selected_engine("other")
+
+    assert run_command(obj, ["get", "incidents"]) == 0
+
+    root.main.assert_called_with(
+        ["get", "incidents"], prog_name="cctl", standalone_mode=False, obj=obj
+    )
+    # the selection of one command must not leak into the next one
+    assert obj._selected_engine is None
+
+
+@patch("camundactl.cmd.shell.root")
+def test_run_command_error(root: Mock):
+    root.main.side_effect = click.ClickException("error")
+    assert run_command(ContextObject(), ["get", "unknown"]) == 1
+
+
+@patch("camundactl.cmd.shell.root")
+def test_run_command_unhandled_error(root: Mock):
+    root.main.side_effect = ValueError("invalid")
+    obj = ContextObject()
+    obj.set_selected_engine("other")
+
+    assert run_command(obj, ["get", "incidents"]) == 1
+    assert obj._selected_engine is None
+
+
+@patch("camundactl.cmd.shell.root")
+def test_run_command_exit_code(root: Mock):
+    # the code of ctx.exit without standalone mode
+    root.main.return_value = 2
+    assert run_command(ContextObject(), ["worker", "status"]) == 2
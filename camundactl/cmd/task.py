@@ -0,0 +1,54 @@
+from camundactl.cmd.base import describe
+from camundactl.cmd.describe import DescribeQuery, create_describe_command
+from camundactl.cmd.openapi.factory import task_id_autocomplete
+
+DESCRIBE_TASK_TEMPLATE = """
+Id: {{id}}
+Name: {{name}}
+TaskDefinitionKey: {{taskDefinitionKey}}
+Assignee: {{assignee}}
+Owner: {{owner}}
+ProcessInstanceId: {{processInstanceId}}
+ProcessDefinitionId: {{processDefinitionId}}
+TenantId: {{tenantId}}
+
+Created:   {{created}}
+Due:       {{due}}
+FollowUp:  {{followUp}}
+Priority:  {{priority}}
+Suspended: {{suspended}}
+
+IdentityLinks: {% for link in identityLinks %}
+    - Type:    {{link.type}}
+      UserId:  {{link.userId}}
+      GroupId: {{link.groupId}} {% endfor %}
+
+Comments: {% for comment in comments %}
+    - Time:    {{comment.time}}
+      UserId:  {{comment.userId}}
+      Message: {{comment.message}} {% endfor %}
+
+Variables: {% for name, var in variables.items() %}
+    - Name:  {{name}}
+      Type:  {{var.type}}
+      Value:
+        {{var.value}}
+      {% endfor %}
+""".strip()
+
+
+describe_task = create_describe_command(
+    describe,
+    "task",
+    path="/task/{id}",
+    queries=[
+        DescribeQuery(
+            "variables", "/task/{id}/variables", {"deserializeValues": "false"}
+        ),
+        DescribeQuery("identityLinks", "/task/{id}/identity-links"),
+        DescribeQuery("comments", "/task/{id}/comment"),
+    ],
+    template=DESCRIBE_TASK_TEMPLATE,
+    help="describe one task with its variables, identity links and comments",
+    autocomplete=task_id_autocomplete,
+)
@@ -0,0 +1,341 @@
+import logging
+import textwrap
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, wait
+from datetime import datetime
+from typing import (
+    Any,
+    Callable,
+    Deque,
+    Dict,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+import click
+from tabulate import tabulate
+
+from camundactl.client import Client
+from camundactl.cmd.base import root
+from camundactl.cmd.fanout import with_engine_options
+from camundactl.cmd.helpers import with_exception_handler
+from camundactl.config import MetricDict
+
+__all__ = ["Metric", "DEFAULT_METRICS", "Dashboard", "get_metrics"]
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TOP_INTERVAL = 5.0
+
+# the requests of a refresh are spread over this part of the interval,
+# so the engines do not get all of them at once
+STAGGER_FRACTION = 0.25
+
+# results arriving later than this part of the interval are shown with
+# the next refresh. until then the last value is kept.
+DEADLINE_FRACTION = 0.9
+
+# keep this below the connection pool size of the session
+MAX_TOP_WORKERS = 8
+
+
+class Metric(NamedTuple):
+    name: str
+    path: str
+    params: Dict[str, str] = {}
+    # attribute summed over the objects of a list response. without
+    # field the objects are counted (or the count of a count response).
+    field: Optional[str] = None
+
+
+DEFAULT_METRICS: Tuple[Metric, ...] = (
+    Metric("jobs", "/job/count"),
+    Metric("jobsDue", "/job/count", {"executable": "true"}),
+    Metric("jobsFailed", "/job/count", {"noRetriesLeft": "true"}),
+    Metric("incidents", "/incident/count"),
+    Metric("externalTasks", "/external-task/count"),
+    Metric("externalTasksLocked", "/external-task/count", {"locked": "true"}),
+    Metric("batches", "/batch/statistics"),
+    Metric("batchJobsRemaining", "/batch/statistics", field="remainingJobs"),
+    Metric("batchJobsFailed", "/batch/statistics", field="failedJobs"),
+    Metric("instances", "/process-definition/statistics", field="instances"),
+)
+
+
+def get_metrics(
+    custom: Optional[List[MetricDict]] = None, names: Optional[List[str]] = None
+) -> List[Metric]:
+    """
+    returns the default metrics and the metrics of the config. a custom
+    metric replaces the default metric with the same name. names select
+    the metrics to show.
+    """
+    metrics = {metric.name: metric for metric in DEFAULT_METRICS}
+    for metric in custom or []:
+        metrics[metric["name"]] = Metric(
+            metric["name"],
+            metric["path"],
+            metric.get("params") or {},
+            metric.get("field"),
+        )
+    if not names:
+        return list(metrics.values())
+    if unknown := [name for name in names if name not in metrics]:
+        raise ValueError(
+            f"unknown metrics {', '.join(unknown)}. "
+            f"choose from {', '.join(metrics)}"
+        )
+    return [metrics[name] for name in names]
+
+
+def get_metric_value(metric: Metric, data: Any) -> int:
+    if isinstance(data, dict):
+        return data[metric.field or "count"]
+    if metric.field is None:
+        return len(data)
+    return sum(item.get(metric.field) or 0 for item in data)
+
+
+# requests are shared by the metrics with the same path and params
+RequestKey = Tuple[str, str, Tuple[Tuple[str, str], ...]]
+
+
+def _short_error(error: Exception, max_length: int = 60) -> str:
+    lines = str(error).strip().splitlines() or [type(error).__name__]
+    return textwrap.shorten(lines[0], max_length, placeholder="...")
+
+
+class _Result(NamedTuple):
+    data: Any
+    latency: float
+    finished_at: float
+
+
+class Dashboard:
+    """
+    polls the metrics of multiple engines concurrently and keeps the
+    last two values of every metric to compute deltas and rates. a
+    request still running is not sent again and its metrics keep the
+    last value.
+    """
+
+    def __init__(
+        self,
+        clients: Dict[str, Client],
+        metrics: Sequence[Metric],
+        max_workers: int = MAX_TOP_WORKERS,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.clients = clients
+        self.metrics = list(metrics)
+        self._clock = clock
+        # the requests run in daemon threads, so hanging requests (single
+        # engines have no default timeout) do not block the exit of cctl
+        self._slots = threading.BoundedSemaphore(max_workers)
+        self._closed = threading.Event()
+        self._requests: List[RequestKey] = []
+        for engine in clients:
+            for metric in self.metrics:
+                key = self._request_key(engine, metric)
+                if key not in self._requests:
+                    self._requests.append(key)
+        self._pending: Dict[RequestKey, Tuple[Future, float]] = {}
+        self._latency: Dict[RequestKey, float] = {}
+        self._errors: Dict[RequestKey, str] = {}
+        self._samples: Dict[Tuple[str, str], Deque[Tuple[float, int]]] = {}
+
+    @staticmethod
+    def _request_key(engine: str, metric: Metric) -> RequestKey:
+        return engine, metric.path, tuple(sorted(metric.params.items()))
+
+    def _request(self, key: RequestKey) -> _Result:
+        engine, path, params = key
+        start = self._clock()
+        resp = self.clients[engine].get(path, params=dict(params))
+        resp.raise_for_status()
+        data = resp.json()
+        finished_at = self._clock()
+        return _Result(data, round((finished_at - start) * 1000, 1), finished_at)
+
+    def _submit(self, key: RequestKey) -> Future:
+        future: Future = Future()
+
+        def run() -> None:
+            with self._slots:
+                if self._closed.is_set() or not future.set_running_or_notify_cancel():
+                    return
+                try:
+                    future.set_result(self._request(key))
+                except Exception as error:
+                    future.set_exception(error)
+
+        threading.Thread(target=run, daemon=True).start()
+        return future
+
+    def _collect(self) -> None:
+        for key, (future, _) in list(self._pending.items()):
+            if not future.done():
+                continue
+            del self._pending[key]
+            try:
+                result = future.result()
+            except Exception as error:
+                logger.debug("requesting %s failed", key, exc_info=True)
+                self._errors[key] = _short_error(error)
+                continue
+            self._errors.pop(key, None)
+            self._latency[key] = result.latency
+            engine = key[0]
+            for metric in self.metrics:
+                if self._request_key(engine, metric) != key:
+                    continue
+                try:
+                    value = get_metric_value(metric, result.data)
+                except (KeyError, TypeError, AttributeError) as error:
+                    self._errors[key] = f"unexpected response: {error}"
+                    continue
+                samples = self._samples.setdefault(
+                    (engine, metric.name), deque(maxlen=2)
+                )
+                samples.append((result.finished_at, value))
+
+    def refresh(self, deadline: float, stagger: float = 0.0) -> None:
+        """
+        sends the requests not running anymore, spread over stagger
+        seconds, and waits for the results until deadline (a value
+        of the clock).
+        """
+        self._collect()
+        to_send = [key for key in self._requests if key not in self._pending]
+        gap = stagger / len(to_send) if to_send else 0.0
+        for index, key in enumerate(to_send):
+            if index and gap:
+                time.sleep(gap)
+            self._pending[key] = (
+                self._submit(key),
+                self._clock(),
+            )
+        futures = [future for future, _ in self._pending.values()]
+        wait(futures, timeout=max(deadline - self._clock(), 0))
+        self._collect()
+
+    def rows(self, engine: str) -> List[Dict]:
+        rows = []
+        now = self._clock()
+        for metric in self.metrics:
+            key = self._request_key(engine, metric)
+            samples = self._samples.get((engine, metric.name), ())
+            value = delta = rate = None
+            if samples:
+                _, value = samples[-1]
+            if len(samples) == 2:
+                (t1, v1), (t2, v2) = samples
+                delta = v2 - v1
+                if t2 > t1:
+                    rate = round(delta / (t2 - t1) * 60, 1)
+            if error := self._errors.get(key):
+                status = f"error: {error}"
+            elif key in self._pending:
+                status = f"slow ({now - self._pending[key][1]:.0f}s)"
+            else:
+                status = ""
+            rows.append(
+                {
+                    "metric": metric.name,
+                    "value": value,
+                    "delta": delta,
+                    "rate/min": rate,
+                    "ms": self._latency.get(key),
+                    "status": status,
+                }
+            )
+        return rows
+
+    def render(self) -> str:
+        screens = [f"cctl top - {datetime.now().strftime('%H:%M:%S')}"]
+        for engine in self.clients:
+            screens.append(
+                click.style(engine, bold=True)
+                + "\n"
+                + tabulate(self.rows(engine), headers="keys", missingval="-")
+            )
+        return "\n\n".join(screens)
+
+    def close(self) -> None:
+        # requests waiting for a thread are not sent anymore. running
+        # ones are not waited for, they end with the process.
+        self._closed.set()
+
+
+@root.command("top")
+@click.option(
+    "--interval",
+    "interval",
+    type=float,
+    default=None,
+    help=f"seconds between refreshes (default={DEFAULT_TOP_INTERVAL})",
+)
+@click.option(
+    "--metrics",
+    "metrics",
+    default=None,
+    help="comma seperated list of metrics to show (default=all)",
+)
+@click.option(
+    "-n",
+    "--iterations",
+    "iterations",
+    type=int,
+    default=None,
+    help="stop after this number of refreshes",
+)
+@click.pass_context
+@with_engine_options(fan_out=True)
+@with_exception_handler()
+def top(
+    ctx: click.Context,
+    interval: Optional[float],
+    metrics: Optional[str],
+    iterations: Optional[int],
+) -> None:
+    """
+    shows a refreshing dashboard of job, incident, external task, batch
+    and instance counts with their deltas and rates per engine.
+    """
+    top_config = ctx.obj.get_config().get("top") or {}
+    interval = interval or top_config.get("interval") or DEFAULT_TOP_INTERVAL
+    selected = get_metrics(
+        top_config.get("metrics"),
+        [name.strip() for name in metrics.split(",")] if metrics else None,
+    )
+    clients = {}
+    for engine in ctx.obj.get_selected_engines() or [ctx.obj.get_engine_name()]:
+        with ctx.obj.use_engine(engine):
+            clients[engine] = ctx.obj.get_client()
+
+    dashboard = Dashboard(clients, selected)
+    refreshes = 0
+    try:
+        while True:
+            started = time.monotonic()
+            dashboard.refresh(
+                deadline=started + interval * DEADLINE_FRACTION,
+                stagger=interval * STAGGER_FRACTION,
+            )
+            screen = dashboard.render()
+            if click.get_text_stream("stdout").isatty():
+                click.clear()
+            click.echo(screen)
+            refreshes += 1
+            if iterations is not None and refreshes >= iterations:
+                return
+            time.sleep(max(started + interval - time.monotonic(), 0))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        dashboard.close()
@@ -0,0 +1,105 @@
+import threading
+import time
+from unittest.mock import Mock
+
+import pytest
+
+from .top import Dashboard, Metric, get_metric_value, get_metrics
+
+
+class FakeEngine:
+    def __init__(self, responses: dict):
+        self.responses = responses
+        self.requests = []
+        self.release = threading.Event()
+        self.release.set()
+
+    def get(self, path, params):
+        self.requests.append(path)
+        response = self.responses[path]
+        if isinstance(response, Exception):
+            raise response
+        if path == "/slow":
+            self.release.wait(5)
+        return Mock(json=Mock(return_value=response))
+
+
+def _rows(dashboard: Dashboard, engine: str) -> dict:
+    return {row["metric"]: row for row in dashboard.rows(engine)}
+
+
+def test_get_metrics():
+    metrics = get_metrics(
+        [{"name": "incidents", "path": "/incident/count", "params": {"a": "b"}}],
+        ["jobs", "incidents"],
+    )
+    assert [m.name for m in metrics] == ["jobs", "incidents"]
+    assert metrics[1].params == {"a": "b"}
+    with pytest.raises(ValueError):
+        get_metrics(names=["unknown"])
+
+
+def test_get_metric_value():
+    assert get_metric_value(Metric("a", "/a"), {"count": 3}) == 3
+    assert get_metric_value(Metric("a", "/a"), [{}, {}]) == 2
+    batches = [{"remainingJobs": 4}, {"remainingJobs": None}, {"remainingJobs": 1}]
+    assert get_metric_value(Metric("a", "/a", field="remainingJobs"), batches) == 5
+
+
+def test_dashboard_rates():
+    now = [0.0]
+    engine = FakeEngine({"/job/count": {"count": 10}, "/batch/statistics": [{}]})
+    metrics = [
+        Metric("jobs", "/job/count"),
+        Metric("batches", "/batch/statistics"),
+        Metric("remaining", "/batch/statistics", field="remainingJobs"),
+    ]
+    dashboard = Dashboard({"a": engine}, metrics, clock=lambda: now[0])
+    dashboard.refresh(deadline=10)
+    rows = _rows(dashboard, "a")
+    assert rows["jobs"]["value"] == 10 and rows["jobs"]["delta"] is None
+    # metrics of the same request share it
+    assert engine.requests.count("/batch/statistics") == 1
+
+    now[0] = 30.0
+    engine.responses["/job/count"] = {"count": 25}
+    dashboard.refresh(deadline=40)
+    rows = _rows(dashboard, "a")
+    assert rows["jobs"]["value"] == 25
+    assert rows["jobs"]["delta"] == 15
+    assert rows["jobs"]["rate/min"] == 30.0
+    assert rows["batches"]["delta"] == 0
+    dashboard.close()
+
+
+def test_dashboard_degrades():
+    engine = FakeEngine(
+        {"/job/count": {"count": 1}, "/slow": {"count": 2}, "/fail": Exception("503")}
+    )
+    metrics = [
+        Metric("jobs", "/job/count"),
+        Metric("slow", "/slow"),
+        Metric("fail", "/fail"),
+    ]
+    dashboard = Dashboard({"a": engine}, metrics)
+    dashboard.refresh(deadline=time.monotonic() + 5)
+    assert _rows(dashboard, "a")["slow"]["value"] == 2
+
+    engine.release.clear()
+    dashboard.refresh(deadline=time.monotonic() + 0.1)
+    rows = _rows(dashboard, "a")
+    assert rows["jobs"]["status"] == ""
+    assert rows["slow"]["value"] == 2
+    assert rows["slow"]["status"].startswith("slow")
+    assert rows["fail"]["value"] is None
+    assert rows["fail"]["status"] == "error: 503"
+
+    # the running request is not sent again
+    dashboard.refresh(deadline=time.monotonic() + 0.1)
+    assert engine.requests.count("/slow") == 2
+    assert engine.requests.count("/job/count") == 3
+
+    engine.release.set()
+    dashboard.refresh(deadline=time.monotonic() + 5)
+    assert _rows(dashboard, "a")["slow"]["status"] == ""
+    dashboard.close()
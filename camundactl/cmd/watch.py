@@ -0,0 +1,152 @@
+import json
+import logging
+import time
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from camundactl.client import Client
+
+__all__ = [
+    "CHANGE_COLUMN",
+    "DEFAULT_WATCH_INTERVAL",
+    "get_time_filter",
+    "watch_changes",
+]
+
+logger = logging.getLogger(__name__)
+
+CHANGE_COLUMN = "change"
+ADDED, CHANGED, REMOVED = "+", "~", "-"
+
+DEFAULT_WATCH_INTERVAL = 2.0
+
+# query parameters requesting the objects after a timestamp and the
+# attribute of the objects holding this timestamp
+TIME_FILTERS = {
+    "incidentTimestampAfter": "incidentTimestamp",
+    "startedAfter": "startTime",
+    "createTimeAfter": "createTime",
+}
+
+# parameters limiting the result. a limited result can not be compared
+# with the count
+_PAGING_PARAMS = ("sortBy", "sortOrder", "firstResult", "maxResults")
+
+
+def get_time_filter(parameter_names: List[str]) -> Optional[Tuple[str, str]]:
+    """
+    returns the query parameter and the object attribute to request
+    only objects created after the last poll.
+    """
+    for param, attribute in TIME_FILTERS.items():
+        if param in parameter_names:
+            return param, attribute
+    return None
+
+
+def _key(row: Any) -> str:
+    if isinstance(row, dict) and "id" in row:
+        return row["id"]
+    return json.dumps(row, sort_keys=True)
+
+
+def _tag(change: str, row: Any) -> Dict:
+    if isinstance(row, dict):
+        return {CHANGE_COLUMN: change, **row}
+    return {CHANGE_COLUMN: change, "value": row}
+
+
+class _Poller:
+    def __init__(self, client: Client, path: str, params: Dict[str, Any]):
+        self.client = client
+        self.path = path
+        self.params = params
+        self._etag: Optional[str] = None
+
+    def fetch_all(self) -> Optional[List]:
+        """
+        requests the whole list. returns none if the engine tells
+        (by etag) that the list did not change.
+        """
+        headers = {"If-None-Match": self._etag} if self._etag else {}
+        resp = self.client.get(self.path, params=self.params, headers=headers)
+        if resp.status_code == 304:
+            return None
+        resp.raise_for_status()
+        self._etag = resp.headers.get("ETag")
+        return resp.json()
+
+    def fetch_after(self, param: str, value: str) -> List:
+        resp = self.client.get(self.path, params={**self.params, param: value})
+        resp.raise_for_status()
+        return resp.json()
+
+    def count(self) -> int:
+        params = {k: v for k, v in self.params.items() if k not in _PAGING_PARAMS}
+        resp = self.client.get(f"{self.path}/count", params=params)
+        resp.raise_for_status()
+        return resp.json()["count"]
+
+
+def watch_changes(
+    client: Client,
+    path: str,
+    params: Dict[str, Any],
+    interval: float = DEFAULT_WATCH_INTERVAL,
+    time_filter: Optional[Tuple[str, str]] = None,
+    has_count: bool = False,
+    polls: Optional[int] = None,
+) -> Iterator[List[Dict]]:
+    """
+    polls the list operation and yields the added, changed and removed
+    rows (tagged in the `change` column) of every poll with changes.
+
+    if the operation filters by time, only the objects after the newest
+    known timestamp are requested and the count tells if objects were
+    removed. the whole list is requested only if the count differs.
+    """
+    poller = _Poller(client, path, params)
+    limited = any(name in params for name in ("firstResult", "maxResults"))
+    incremental = time_filter is not None and not limited
+    known: Dict[str, Any] = {}
+    poll = 0
+
+    while True:
+        changes: List[Dict] = []
+        full = not known
+        if incremental and known:
+            param, attribute = time_filter
+            # the engine includes objects at the timestamp itself. these
+            # are known already and skipped.
+            timestamps = [
+                row[attribute] for row in known.values() if row.get(attribute)
+            ]
+            rows = poller.fetch_after(param, max(timestamps)) if timestamps else []
+            for row in rows:
+                key = _key(row)
+                if key not in known:
+                    changes.append(_tag(ADDED, row))
+                elif known[key] != row:
+                    changes.append(_tag(CHANGED, row))
+                known[key] = row
+            full = not (has_count and poller.count() == len(known))
+
+        if full or not incremental:
+            rows = poller.fetch_all()
+            if rows is not None:
+                current = {_key(row): row for row in rows}
+                for key, row in current.items():
+                    if key not in known:
+                        changes.append(_tag(ADDED, row))
+                    elif known[key] != row:
+                        changes.append(_tag(CHANGED, row))
+                for key, row in known.items():
+                    if key not in current:
+                        changes.append(_tag(REMOVED, row))
+                known = current
+
+        if changes:
+            yield changes
+        poll += 1
+        if polls is not None and poll >= polls:
+            return
+        time.sleep(interval)
@@ -0,0 +1,94 @@
+from unittest.mock import Mock
+
+from .watch import get_time_filter, watch_changes
+
+
+class FakeEngine:
+    """
+    a list operation with a time filter and a count endpoint
+    """
+
+    def __init__(self, incidents: list):
+        self.incidents = incidents
+        self.requests = []
+
+    def get(self, path, params, headers=None):
+        self.requests.append((path, params))
+        resp = Mock(status_code=200, headers={})
+        if path.endswith("/count"):
+            resp.json.return_value = {"count": len(self.incidents)}
+        elif after := params.get("incidentTimestampAfter"):
+            resp.json.return_value = [
+                i for i in self.incidents if i["incidentTimestamp"] >= after
+            ]
+        else:
+            resp.json.return_value = list(self.incidents)
+        return resp
+
+
+def _changes(result: list) -> list:
+    return [(row["change"], row["id"]) for row in result]
+
+
+def test_get_time_filter():
+    assert get_time_filter(["incidentId", "incidentTimestampAfter"]) == (
+        "incidentTimestampAfter",
+        "incidentTimestamp",
+    )
+    assert get_time_filter(["processInstanceId"]) is None
+
+
+def test_watch_changes_incremental():
+    engine = FakeEngine([{"id": "i1", "incidentTimestamp": "1"}])
+    changes = watch_changes(
+        engine,
+        "/incident",
+        {},
+        interval=0,
+        time_filter=("incidentTimestampAfter", "incidentTimestamp"),
+        has_count=True,
+    )
+
+    assert _changes(next(changes)) == [("+", "i1")]
+
+    engine.incidents.append({"id": "i2", "incidentTimestamp": "2"})
+    engine.requests.clear()
+    assert _changes(next(changes)) == [("+", "i2")]
+    # only the new incidents and the count are requested
+    assert engine.requests == [
+        ("/incident", {"incidentTimestampAfter": "1"}),
+        ("/incident/count", {}),
+    ]
+
+    # the count differs. the removed incident is found by the whole list.
+    del engine.incidents[0]
+    assert _changes(next(changes)) == [("-", "i1")]
+
+
+def test_watch_changes_full():
+    engine = FakeEngine([{"id": "j1", "retries": 3}, {"id": "j2", "retries": 3}])
+    changes = watch_changes(engine, "/job", {}, interval=0, polls=3)
+
+    assert _changes(next(changes)) == [("+", "j1"), ("+", "j2")]
+
+    engine.incidents[0] = {"id": "j1", "retries": 2}
+    engine.incidents.append({"id": "j3", "retries": 3})
+    assert _changes(next(changes)) == [("~", "j1"), ("+", "j3")]
+
+    # no changes, nothing is yielded
+    assert list(changes) == []
+
+
+def test_watch_changes_not_modified():
+    client = Mock()
+    client.get.return_value = Mock(status_code=200, headers={"ETag": "abc"})
+    client.get.return_value.json.return_value = [{"id": "i1"}]
+    changes = watch_changes(client, "/incident", {}, interval=0, polls=2)
+
+    assert _changes(next(changes)) == [("+", "i1")]
+
+    client.get.return_value = Mock(status_code=304)
+    assert list(changes) == []
+    client.get.assert_called_with(
+        "/incident", params={}, headers={"If-None-Match": "abc"}
+    )
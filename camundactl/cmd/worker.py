@@ -0,0 +1,189 @@
+import signal
+import threading
+from typing import Dict, List, Optional, Tuple
+
+import click
+
+from camundactl.cmd.base import AliasGroup, root
+from camundactl.cmd.fanout import with_engine_options
+from camundactl.cmd.helpers import with_exception_handler
+from camundactl.config import WorkerConfig
+from camundactl.output import (
+    default_json_output,
+    default_object_table_output,
+    default_table_output,
+)
+from camundactl.output.decorator import with_output
+from camundactl.worker import POOLS, Handler, Worker, get_handlers
+from camundactl.worker.runtime import (
+    DEFAULT_ASYNC_RESPONSE_TIMEOUT,
+    DEFAULT_MAX_WORKERS,
+)
+
+
+def _get_worker_config(ctx: click.Context) -> WorkerConfig:
+    return ctx.obj.get_config().get("worker") or {}
+
+
+def select_handlers(
+    handlers: Dict[str, Handler],
+    config: WorkerConfig,
+    topics: Tuple[str, ...] = (),
+) -> List[Handler]:
+    """
+    returns the handlers of the given topics (default the topics of
+    the config or all handlers). the config may override the lock
+    duration and variables of a topic.
+    """
+    topic_config = {topic["name"]: topic for topic in config.get("topics") or []}
+    names = list(topics) or list(topic_config) or list(handlers)
+    if missing := [name for name in names if name not in handlers]:
+        raise click.ClickException(
+            f"there is no handler for the topics {', '.join(missing)}. "
+            "handlers are registered with @external_task_handler in a "
+            "module of extra_paths"
+        )
+    selected = []
+    for name in names:
+        handler = handlers[name]
+        if override := topic_config.get(name):
+            handler = handler._replace(
+                lock_duration=override.get("lock_duration") or handler.lock_duration,
+                variables=override.get("variables", handler.variables),
+            )
+        selected.append(handler)
+    return selected
+
+
+@root.group("worker", cls=AliasGroup)
+@click.pass_context
+@with_engine_options()
+def worker(ctx: click.Context):
+    """
+    runs handlers of external tasks. handlers are registered with
+    `camundactl.worker.external_task_handler` in a module of
+    `extra_paths`.
+    """
+
+
+@worker.command("run")
+@click.option(
+    "-t",
+    "--topic",
+    "topics",
+    multiple=True,
+    help="the topics to work on (default=the configured topics or all)",
+)
+@click.option(
+    "--pool",
+    "pool",
+    type=click.Choice(POOLS),
+    default=None,
+    help="run the handlers in threads (default) or processes",
+)
+@click.option(
+    "--workers",
+    "max_workers",
+    type=int,
+    default=None,
+    help=f"handlers running at once (default={DEFAULT_MAX_WORKERS})",
+)
+@click.option(
+    "--max-tasks",
+    "max_tasks",
+    type=int,
+    default=None,
+    help="tasks locked at once (default=2 x workers)",
+)
+@click.option(
+    "--worker-id",
+    "worker_id",
+    default=None,
+    help="the worker id the tasks are locked with",
+)
+@click.option(
+    "--async-response-timeout",
+    "async_response_timeout",
+    type=int,
+    default=None,
+    help="milliseconds a fetch waits for tasks "
+    f"(default={DEFAULT_ASYNC_RESPONSE_TIMEOUT})",
+)
+@click.option(
+    "--stats-interval",
+    "stats_interval",
+    type=float,
+    default=60.0,
+    help="seconds between the metrics written to stderr (0 disables)",
+)
+@with_output(default_object_table_output, default_json_output)
+@click.pass_context
+@with_exception_handler()
+def run(
+    ctx: click.Context,
+    topics: Tuple[str, ...],
+    pool: Optional[str],
+    max_workers: Optional[int],
+    max_tasks: Optional[int],
+    worker_id: Optional[str],
+    async_response_timeout: Optional[int],
+    stats_interval: float,
+) -> Dict:
+    """
+    fetches and locks the tasks of the topics and runs their handlers
+    until interrupted. the running handlers are finished on SIGINT or
+    SIGTERM and the metrics are printed.
+    """
+    config = _get_worker_config(ctx)
+    handlers = select_handlers(get_handlers(), config, topics)
+
+    def on_stats(stats: Dict) -> None:
+        click.echo(" ".join(f"{k}={v}" for k, v in stats.items()), err=True)
+
+    runtime = Worker(
+        ctx.obj.get_client(),
+        handlers,
+        worker_id=worker_id or config.get("worker_id"),
+        pool=pool or config.get("pool") or "thread",
+        max_workers=max_workers or config.get("max_workers") or DEFAULT_MAX_WORKERS,
+        max_tasks=max_tasks or config.get("max_tasks"),
+        async_response_timeout=(
+            async_response_timeout
+            or config.get("async_response_timeout")
+            or DEFAULT_ASYNC_RESPONSE_TIMEOUT
+        ),
+        stats_interval=stats_interval or None,
+        on_stats=on_stats,
+    )
+    click.echo(
+        f"worker {runtime.worker_id} working on "
+        f"{', '.join(h.topic for h in handlers)}",
+        err=True,
+    )
+    # signal handlers can only be set in the main thread (not in the daemon)
+    if threading.current_thread() is not threading.main_thread():
+        return runtime.run()
+    previous = signal.signal(signal.SIGTERM, lambda *_: runtime.stop())
+    try:
+        return runtime.run()
+    finally:
+        signal.signal(signal.SIGTERM, previous)
+
+
+@worker.command("topics")
+@with_output(default_table_output, default_json_output)
+@click.pass_context
+@with_exception_handler()
+def topics(ctx: click.Context) -> List[Dict]:
+    """
+    lists the registered handlers.
+    """
+    return [
+        {
+            "topic": handler.topic,
+            "handler": f"{handler.func.__module__}.{handler.func.__qualname__}",
+            "lockDuration": handler.lock_duration,
+            "variables": ",".join(handler.variables or []) or "*",
+        }
+        for handler in select_handlers(get_handlers(), _get_worker_config(ctx))
+    ]
@@ -23,6 +23,10 @@ class EngineDict(TypedDict):
     auth: ContextAuthDict
     verify: bool
     spec_version: Optional[str]
+    timeout: Optional[float]
+    # limits of the concurrent requests and the requests per second
+    max_concurrency: Optional[int]
+    rps: Optional[float]
 
 
 CommandAliasLookup = dict[str, str]
@@ -33,6 +37,41 @@ class TemplateConfig(TypedDict):
     extra_patterns: Optional[List[str]]
 
 
+class MetricDict(TypedDict):
+    name: str
+    path: str
+    params: Optional[Dict[str, str]]
+    field: Optional[str]
+
+
+class TopConfig(TypedDict):
+    interval: Optional[float]
+    metrics: Optional[List[MetricDict]]
+
+
+class CacheConfig(TypedDict):
+    enabled: Optional[bool]
+    # megabytes
+    max_size: Optional[int]
+    # seconds to answer all gets from the cache (default 0)
+    ttl: Optional[float]
+
+
+class WorkerTopicDict(TypedDict):
+    name: str
+    lock_duration: Optional[int]
+    variables: Optional[List[str]]
+
+
+class WorkerConfig(TypedDict):
+    worker_id: Optional[str]
+    topics: Optional[List[WorkerTopicDict]]
+    pool: Optional[Literal["thread", "process"]]
+    max_workers: Optional[int]
+    max_tasks: Optional[int]
+    async_response_timeout: Optional[int]
+
+
 class ConfigDict(TypedDict):
     version: str
     current_engine: Optional[str]
@@ -43,6 +82,9 @@ class ConfigDict(TypedDict):
     spec_version: Optional[str]
     template: Optional[TemplateConfig]
     logging: Optional[Dict]
+    top: Optional[TopConfig]
+    worker: Optional[WorkerConfig]
+    cache: Optional[CacheConfig]
 
 
 CAMUNDA_CONFIG_FILE = "config"
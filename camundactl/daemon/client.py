@@ -0,0 +1,143 @@
+"""
+thin client of the cctl daemon. it only uses the standard library, so
+delegating a command does not pay for importing cctl itself.
+"""
+
+import base64
+import json
+import os
+import socket
+import sys
+import tempfile
+from typing import Any, Dict, Iterator, List, Optional
+
+# set to disable delegating commands to the daemon
+DISABLE_ENV = "CCTL_NO_DAEMON"
+SOCKET_ENV = "CCTL_DAEMON_SOCKET"
+
+# commands that have to run in the calling process. long running
+# commands (workers, pollers) have to stop with the calling process,
+# commands with path arguments have to resolve them in its directory
+LOCAL_COMMANDS = {
+    "daemon",
+    "shell",
+    "config",
+    "worker",
+    "top",
+    "deploy",
+    "deployment",
+    "export",
+}
+LOCAL_SUBCOMMANDS = {("bulk", "correlate"), ("bulk", "start")}
+
+# options of long running commands
+LOCAL_OPTIONS = {"--watch"}
+
+# options refering to local files. relative paths and stdin can not
+# be resolved by the daemon
+LOCAL_FILE_OPTIONS = {
+    "-f",
+    "--file",
+    "-oF",
+    "--output-file",
+    "-t",
+    "--template",
+    "-q",
+    "--query",
+    "--plan",
+    "--instructions",
+    "--resume",
+}
+
+
+def get_socket_path() -> str:
+    if path := os.environ.get(SOCKET_ENV):
+        return path
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR") or tempfile.gettempdir()
+    return os.path.join(runtime_dir, f"cctl-{os.getuid()}.sock")
+
+
+# options of the root command taking a value
+ROOT_VALUE_OPTIONS = {"-l", "--log-level", "--cache-ttl"}
+
+
+def _strip_root_options(argv: List[str]) -> List[str]:
+    """
+    returns the command and its arguments without the options of the
+    root command before it.
+    """
+    index = 0
+    while index < len(argv) and argv[index].startswith("-"):
+        index += 2 if argv[index] in ROOT_VALUE_OPTIONS else 1
+    return argv[index:]
+
+
+def should_delegate(argv: List[str]) -> bool:
+    """
+    tests weather the command can be run by a running daemon.
+    """
+    if os.environ.get(DISABLE_ENV) or not hasattr(socket, "AF_UNIX"):
+        return False
+    command = _strip_root_options(argv)
+    if not command or command[0] in LOCAL_COMMANDS:
+        return False
+    if tuple(command[:2]) in LOCAL_SUBCOMMANDS:
+        return False
+    for arg in argv:
+        if arg == "-" or arg in LOCAL_OPTIONS:
+            return False
+        if arg.split("=", 1)[0] in LOCAL_FILE_OPTIONS:
+            return False
+    return os.path.exists(get_socket_path())
+
+
+def _send(message: Dict[str, Any]) -> Optional[Iterator[Dict[str, Any]]]:
+    """
+    sends the message to the daemon and returns an iterator over the
+    response messages. returns none if the daemon is not reachable.
+    """
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(get_socket_path())
+    except OSError:
+        sock.close()
+        return None
+    sock.sendall(json.dumps(message).encode() + b"\n")
+
+    def responses() -> Iterator[Dict[str, Any]]:
+        with sock, sock.makefile("rb") as fh:
+            for line in fh:
+                yield json.loads(line)
+
+    return responses()
+
+
+def run(argv: List[str]) -> Optional[int]:
+    """
+    runs the command in the daemon, writes its output to stdout and
+    stderr and returns the exit code. returns none if the daemon is
+    not reachable and the command has to run locally.
+    """
+    responses = _send({"argv": argv, "tty": sys.stdout.isatty()})
+    if responses is None:
+        return None
+    streams = {1: sys.stdout.buffer, 2: sys.stderr.buffer}
+    for response in responses:
+        if "exit" in response:
+            return int(response["exit"])
+        stream = streams[response["fd"]]
+        stream.write(base64.b64decode(response["data"]))
+        stream.flush()
+    sys.stderr.write("cctl: the daemon closed the connection\n")
+    return 1
+
+
+def control(command: str) -> Optional[Dict[str, Any]]:
+    """
+    sends a control command (`ping`, `shutdown`) to the daemon. returns
+    none if the daemon is not reachable.
+    """
+    responses = _send({"control": command})
+    if responses is None:
+        return None
+    return next(responses, None)
@@ -0,0 +1,53 @@
+import pytest
+
+from . import client
+
+
+@pytest.fixture
+def socket_path(tmp_path, monkeypatch):
+    path = tmp_path / "cctl.sock"
+    path.touch()
+    monkeypatch.setenv(client.SOCKET_ENV, str(path))
+    monkeypatch.delenv(client.DISABLE_ENV, raising=False)
+    return path
+
+
+@pytest.mark.parametrize(
+    "argv,expected",
+    [
+        (["get", "processInstances"], True),
+        (["-e", "prod", "get", "incidents"], True),
+        ([], False),
+        (["daemon", "stop"], False),
+        (["shell"], False),
+        (["apply", "variable", "-f", "vars.json"], False),
+        (["apply", "variable", "--file=vars.json"], False),
+        (["get", "processInstances", "-oF", "out.json"], False),
+        (["worker", "run"], False),
+        (["top"], False),
+        (["get", "incidents", "--watch"], False),
+        (["deploy", "./models"], False),
+        (["--no-cache", "--cache-ttl", "60", "deploy", "./models"], False),
+        (["-l", "DEBUG", "get", "incidents"], True),
+        (["deployment", "pull", "--all"], False),
+        (["export", "processInstances", "out"], False),
+        (["bulk", "correlate", "messages.ndjson"], False),
+        (["bulk", "delete", "processInstance"], True),
+        (["migrate", "invoice", "--from", "1", "--plan", "plan.json"], False),
+        (["restart", "invoice", "-q", "query.yaml"], False),
+        (["modify", "invoice", "--instructions=instructions.yaml"], False),
+    ],
+)
+def test_should_delegate(socket_path, argv, expected):
+    assert client.should_delegate(argv) is expected
+
+
+def test_should_delegate_disabled(socket_path, monkeypatch):
+    monkeypatch.setenv(client.DISABLE_ENV, "1")
+    assert client.should_delegate(["get", "processInstances"]) is False
+
+
+def test_not_running(tmp_path, monkeypatch):
+    monkeypatch.setenv(client.SOCKET_ENV, str(tmp_path / "missing.sock"))
+    assert client.run(["get", "processInstances"]) is None
+    assert client.control("ping") is None
@@ -0,0 +1,202 @@
+import base64
+import json
+import logging
+import os
+import socketserver
+import sys
+import threading
+import time
+import traceback
+from typing import Any, BinaryIO, Dict, List, Optional, TextIO
+
+from camundactl.cmd.context import ContextObject
+from camundactl.cmd.shell import run_command
+from camundactl.config import get_configfile
+
+__all__ = ["DaemonServer", "serve"]
+
+logger = logging.getLogger(__name__)
+
+# the request the current thread works on
+_local = threading.local()
+
+
+class _Request:
+    """
+    the connection of one delegated command. the output is sent back
+    to the thin client as json lines.
+    """
+
+    def __init__(self, wfile: BinaryIO, tty: bool):
+        self._wfile = wfile
+        self._lock = threading.Lock()
+        self.tty = tty
+
+    def send(self, message: Dict[str, Any]) -> None:
+        with self._lock:
+            self._wfile.write(json.dumps(message).encode() + b"\n")
+            self._wfile.flush()
+
+    def write(self, fd: int, data: bytes) -> None:
+        if data:
+            self.send({"fd": fd, "data": base64.b64encode(data).decode()})
+
+
+class _RoutingBinaryStream:
+    """
+    binary stream which writes to the request of the current thread
+    or to the original stream if the thread handles no request.
+    """
+
+    def __init__(self, fd: int, fallback: BinaryIO):
+        self.fd = fd
+        self.fallback = fallback
+
+    def write(self, data: bytes) -> int:
+        request: Optional[_Request] = getattr(_local, "request", None)
+        if request is None:
+            return self.fallback.write(data)
+        request.write(self.fd, bytes(data))
+        return len(data)
+
+    def flush(self) -> None:
+        if getattr(_local, "request", None) is None:
+            self.fallback.flush()
+
+
+class _RoutingTextStream:
+    """
+    text stream (replaces sys.stdout and sys.stderr) which writes to
+    the request of the current thread.
+    """
+
+    encoding = "utf-8"
+    errors = "replace"
+
+    def __init__(self, fd: int, fallback: TextIO):
+        self.fallback = fallback
+        self.buffer = _RoutingBinaryStream(fd, fallback.buffer)
+
+    def write(self, text: str) -> int:
+        if getattr(_local, "request", None) is None:
+            return self.fallback.write(text)
+        if not isinstance(text, str):
+            raise TypeError(f"write() argument must be str, not {type(text)}")
+        self.buffer.write(text.encode(self.encoding, self.errors))
+        return len(text)
+
+    def flush(self) -> None:
+        if getattr(_local, "request", None) is None:
+            self.fallback.flush()
+
+    def isatty(self) -> bool:
+        request: Optional[_Request] = getattr(_local, "request", None)
+        if request is None:
+            return self.fallback.isatty()
+        return request.tty
+
+    def writable(self) -> bool:
+        return True
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+
+    server: "DaemonServer"
+
+    def handle(self) -> None:
+        try:
+            message = json.loads(self.rfile.readline())
+        except ValueError:
+            return
+        try:
+            if control := message.get("control"):
+                self.wfile.write(json.dumps(self.server.control(control)).encode())
+                self.wfile.write(b"\n")
+                return
+            request = _Request(self.wfile, bool(message.get("tty")))
+            exit_code = self.server.dispatch(request, list(message["argv"]))
+            request.send({"exit": exit_code})
+        except OSError as error:
+            # the client went away (e.g. Ctrl-C)
+            logger.debug("client disconnected: %s", error)
+
+
+class DaemonServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """
+    serves cctl commands over a unix socket. the config, the specs,
+    the connection pools and the created commands stay loaded.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, socket_path: str):
+        self.socket_path = socket_path
+        self.started_at = time.time()
+        self.requests = 0
+        self._obj: Optional[ContextObject] = None
+        self._config_mtime: Optional[float] = None
+        self._obj_lock = threading.Lock()
+        super().__init__(socket_path, _RequestHandler)
+
+    def get_context_object(self) -> ContextObject:
+        """
+        returns a context object for one command. reloads everything
+        if the config file changed.
+        """
+        mtime = get_configfile().stat().st_mtime
+        with self._obj_lock:
+            if self._obj is None or mtime != self._config_mtime:
+                logger.info("loading config")
+                self._obj = ContextObject()
+                self._config_mtime = mtime
+            self.requests += 1
+            return self._obj.fork()
+
+    def dispatch(self, request: _Request, argv: List[str]) -> int:
+        _local.request = request
+        try:
+            return run_command(self.get_context_object(), argv)
+        except SystemExit as exit_:
+            return exit_.code if isinstance(exit_.code, int) else 1
+        except Exception:
+            traceback.print_exc()
+            return 1
+        finally:
+            _local.request = None
+
+    def control(self, command: str) -> Dict[str, Any]:
+        if command == "shutdown":
+            threading.Thread(target=self.shutdown).start()
+        return {
+            "pid": os.getpid(),
+            "uptime": round(time.time() - self.started_at),
+            "requests": self.requests,
+        }
+
+
+def serve(socket_path: str) -> None:
+    """
+    runs the daemon in the foreground until it is shut down.
+    """
+    if os.path.exists(socket_path):
+        # the socket of a daemon that did not shut down cleanly
+        os.unlink(socket_path)
+    umask = os.umask(0o177)
+    try:
+        server = DaemonServer(socket_path)
+    finally:
+        os.umask(umask)
+
+    sys.stdout = _RoutingTextStream(1, sys.stdout)  # type: ignore
+    sys.stderr = _RoutingTextStream(2, sys.stderr)  # type: ignore
+    logger.info("daemon listening on %s", socket_path)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+        sys.stdout = sys.stdout.fallback  # type: ignore
+        sys.stderr = sys.stderr.fallback  # type: ignore
@@ -0,0 +1,99 @@
+import base64
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import Mock, patch
+
+import click
+import pytest
+
+from camundactl.output import default_json_output, default_template_output
+from camundactl.output.decorator import with_output
+
+from . import client
+from .server import DaemonServer, _RoutingTextStream
+
+
+@pytest.fixture
+def server(tmp_path, monkeypatch):
+    socket_path = str(tmp_path / "cctl.sock")
+    monkeypatch.setenv(client.SOCKET_ENV, socket_path)
+    server = DaemonServer(socket_path)
+    server.get_context_object = Mock()  # type: ignore
+    thread = threading.Thread(target=server.serve_forever)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+    thread.join()
+
+
+def _run_command(obj, argv):
+    click.echo(" ".join(argv))
+    click.echo("warning", err=True)
+    return 3
+
+
+@patch("camundactl.daemon.server.run_command", _run_command)
+def test_run(server, capsysbinary):
+    stdout = _RoutingTextStream(1, sys.stdout)
+    stderr = _RoutingTextStream(2, sys.stderr)
+    with patch.object(sys, "stdout", stdout), patch.object(sys, "stderr", stderr):
+        assert client.run(["get", "processInstances"]) == 3
+
+    captured = capsysbinary.readouterr()
+    assert captured.out == b"get processInstances\n"
+    assert captured.err == b"warning\n"
+
+
+def test_control(server):
+    assert client.control("ping")["requests"] == 0
+    assert client.control("shutdown") is not None
+
+
+# the commands of the concurrency test have to overlap
+_barrier = threading.Barrier(8)
+
+
+@click.command()
+@click.argument("value")
+@with_output(default_json_output, default_template_output)
+def _echo(value):
+    _barrier.wait(timeout=5)
+    return {"value": value}
+
+
+def _run_echo(obj, argv):
+    _echo.main(argv, standalone_mode=False)
+    return 0
+
+
+def _collect_stdout(argv) -> bytes:
+    output = b""
+    for response in client._send({"argv": argv}):
+        if "exit" in response:
+            break
+        output += base64.b64decode(response["data"])
+    return output
+
+
+@patch("camundactl.daemon.server.run_command", _run_echo)
+def test_run_concurrent(server):
+    stdout = _RoutingTextStream(1, sys.stdout)
+    commands = [
+        (
+            [str(i), "-o", "template", "-oT", "{{value}}"]
+            if i % 2
+            else [str(i), "-o", "json"]
+        )
+        for i in range(32)
+    ]
+    with patch.object(sys, "stdout", stdout):
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            outputs = list(executor.map(_collect_stdout, commands))
+
+    for i, output in enumerate(outputs):
+        if i % 2:
+            assert output == f"{i}\n".encode()
+        else:
+            assert output == f'{{\n  "value": "{i}"\n}}\n'.encode()
@@ -0,0 +1,18 @@
+from camundactl.deployment.sync import (  # noqa
+    RESOURCE_SUFFIXES,
+    DeployState,
+    ResourceChange,
+    deploy,
+    diff,
+    hash_bytes,
+    hash_file,
+    scan,
+)
+from camundactl.deployment.remote import (  # noqa
+    download_resource,
+    fetch_resource,
+    hash_resources,
+    latest_resources,
+    list_deployments,
+    list_resources,
+)
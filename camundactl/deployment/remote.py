@@ -0,0 +1,116 @@
+import hashlib
+import logging
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from camundactl.client import Client
+from camundactl.client.paging import iter_pages
+from camundactl.client.parallel import map_concurrent
+from camundactl.deployment.sync import HASH_CHUNK_SIZE, hash_bytes
+
+__all__ = [
+    "download_resource",
+    "fetch_resource",
+    "hash_resources",
+    "latest_resources",
+    "list_deployments",
+    "list_resources",
+]
+
+logger = logging.getLogger(__name__)
+
+# (tenant id, deployment name, resource name). the engine filters
+# duplicates by deployment and resource name
+ResourceKey = Tuple[Optional[str], str, str]
+
+
+def list_deployments(
+    client: Client, params: Optional[Dict[str, Any]] = None
+) -> List[Dict]:
+    """
+    returns the deployments matching params, the oldest first.
+    """
+    params = {**(params or {}), "sortBy": "deploymentTime", "sortOrder": "asc"}
+    return [
+        deployment
+        for page in iter_pages(client, "/deployment", params)
+        for deployment in page
+    ]
+
+
+def list_resources(client: Client, deployment_ids: Iterable[str]) -> List[List[Dict]]:
+    """
+    requests the resources of the deployments concurrently. returns
+    them in the order of the ids, deleted deployments have none.
+    """
+
+    def fetch(deployment_id: str) -> List[Dict]:
+        resp = client.get(f"/deployment/{deployment_id}/resources")
+        if resp.status_code == 404:
+            return []
+        resp.raise_for_status()
+        return resp.json()
+
+    return map_concurrent(fetch, deployment_ids)
+
+
+def _data_path(resource: Dict) -> str:
+    return f"/deployment/{resource['deploymentId']}/resources/{resource['id']}/data"
+
+
+def fetch_resource(client: Client, resource: Dict) -> bytes:
+    resp = client.get(_data_path(resource))
+    resp.raise_for_status()
+    return resp.content
+
+
+def download_resource(client: Client, resource: Dict, target: Path) -> Tuple[str, int]:
+    """
+    streams the content of the resource into target. returns its hash
+    and size.
+    """
+    digest, size = hashlib.sha256(), 0
+    target.parent.mkdir(parents=True, exist_ok=True)
+    with client.get(_data_path(resource), stream=True) as resp:
+        resp.raise_for_status()
+        with open(target, "wb") as fh:
+            for chunk in resp.iter_content(HASH_CHUNK_SIZE):
+                digest.update(chunk)
+                fh.write(chunk)
+                size += len(chunk)
+    return digest.hexdigest(), size
+
+
+def latest_resources(
+    client: Client, deployments: List[Dict]
+) -> Dict[ResourceKey, Dict]:
+    """
+    returns the resources of the deployments (oldest first) by tenant,
+    deployment and resource name. resources deployed again replace the
+    older ones. the deployment is added as `deployment`. deployments
+    without name are skipped, they can not be told apart.
+    """
+    unnamed = [deployment for deployment in deployments if not deployment.get("name")]
+    if unnamed:
+        logger.warning("skipping %d deployments without name", len(unnamed))
+        deployments = [
+            deployment for deployment in deployments if deployment.get("name")
+        ]
+    resources: Dict[ResourceKey, Dict] = {}
+    deployment_resources = list_resources(
+        client, [deployment["id"] for deployment in deployments]
+    )
+    for deployment, items in zip(deployments, deployment_resources):
+        for resource in items:
+            key = (deployment.get("tenantId"), deployment["name"], resource["name"])
+            resources[key] = {**resource, "deployment": deployment}
+    return resources
+
+
+def hash_resources(client: Client, resources: Iterable[Dict]) -> List[str]:
+    """
+    downloads the resources concurrently and returns their hashes.
+    """
+    return map_concurrent(
+        lambda resource: hash_bytes(fetch_resource(client, resource)), resources
+    )
@@ -0,0 +1,46 @@
+from unittest.mock import MagicMock, Mock
+
+from .remote import download_resource, latest_resources
+from .sync import hash_bytes
+
+
+def test_latest_resources():
+    resources = {
+        "d1": [{"id": "r1", "name": "invoice.bpmn"}, {"id": "r2", "name": "a.dmn"}],
+        "d2": [{"id": "r3", "name": "invoice.bpmn"}],
+        "d3": [{"id": "r4", "name": "invoice.bpmn"}],
+    }
+
+    def get(path):
+        return Mock(
+            status_code=200, json=Mock(return_value=resources[path.split("/")[2]])
+        )
+
+    deployments = [
+        {"id": "d1", "name": "invoice"},
+        {"id": "d2", "name": "invoice"},
+        {"id": "d3", "name": "invoice", "tenantId": "acme"},
+        # not requested, deployments without name are skipped
+        {"id": "d4", "name": None},
+    ]
+    latest = latest_resources(Mock(get=get), deployments)
+
+    assert {key: resource["id"] for key, resource in latest.items()} == {
+        (None, "invoice", "invoice.bpmn"): "r3",
+        (None, "invoice", "a.dmn"): "r2",
+        ("acme", "invoice", "invoice.bpmn"): "r4",
+    }
+
+
+def test_download_resource(tmp_path):
+    resp = MagicMock(status_code=200)
+    resp.__enter__.return_value = resp
+    resp.iter_content.return_value = [b"<definitions>", b"</definitions>"]
+    client = Mock(get=Mock(return_value=resp))
+    target = tmp_path / "d1" / "invoice.bpmn"
+
+    hash_, size = download_resource(client, {"id": "r1", "deploymentId": "d1"}, target)
+
+    client.get.assert_called_once_with("/deployment/d1/resources/r1/data", stream=True)
+    assert target.read_bytes() == b"<definitions></definitions>"
+    assert (hash_, size) == (hash_bytes(target.read_bytes()), 27)
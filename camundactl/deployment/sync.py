@@ -0,0 +1,179 @@
+import hashlib
+import json
+import re
+from pathlib import Path
+from typing import Any, Dict, List, NamedTuple, Optional, Union
+
+from camundactl.client import Client
+from camundactl.client.multipart import MultipartStream
+from camundactl.client.parallel import map_concurrent
+from camundactl.config import get_configdir
+
+__all__ = [
+    "RESOURCE_SUFFIXES",
+    "DeployState",
+    "ResourceChange",
+    "deploy",
+    "diff",
+    "hash_bytes",
+    "hash_file",
+    "scan",
+]
+
+# the resources the engine parses. other files are ignored
+RESOURCE_SUFFIXES = (".bpmn", ".bpmn20.xml", ".dmn", ".dmn11.xml", ".cmmn", ".form")
+
+NEW, CHANGED, UNCHANGED, MISSING = "new", "changed", "unchanged", "missing"
+
+HASH_CHUNK_SIZE = 64 * 1024
+
+
+def hash_file(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as fh:
+        while chunk := fh.read(HASH_CHUNK_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def hash_bytes(content: bytes) -> str:
+    return hashlib.sha256(content).hexdigest()
+
+
+def scan(directory: Path) -> Dict[str, Path]:
+    """
+    returns the resources below directory by their name, the path
+    relative to directory (e.g. `invoice/invoice.bpmn`).
+    """
+    return {
+        path.relative_to(directory).as_posix(): path
+        for path in sorted(directory.rglob("*"))
+        if path.is_file() and path.name.endswith(RESOURCE_SUFFIXES)
+    }
+
+
+class DeployState:
+    """
+    the hashes of the resources deployed last (by name) and the
+    deployments containing them. stored in the config dir per engine
+    and deployment name.
+    """
+
+    def __init__(self, path: Path, resources: Optional[Dict[str, Dict]] = None):
+        self.path = path
+        self.resources: Dict[str, Dict[str, str]] = resources or {}
+
+    @classmethod
+    def load(
+        cls, engine: str, deployment_name: str, tenant_id: Optional[str] = None
+    ) -> "DeployState":
+        parts = filter(None, (engine, tenant_id, deployment_name))
+        name = re.sub(r"[^\w.-]+", "_", "-".join(parts))
+        path = get_configdir() / "deploy" / f"{name}.json"
+        if not path.exists():
+            return cls(path)
+        return cls(path, json.loads(path.read_text())["resources"])
+
+    def save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.path.write_text(json.dumps({"resources": self.resources}, indent=2))
+
+    def update(self, hashes: Dict[str, str], deployment_id: str) -> None:
+        for name, hash_ in hashes.items():
+            self.resources[name] = {"hash": hash_, "deploymentId": deployment_id}
+
+    def verify(self, client: Client) -> List[str]:
+        """
+        checks the deployments of the state still contain the resources
+        (e.g. they were not deleted) and forgets the others. returns the
+        names forgotten.
+        """
+
+        def deployed_names(deployment_id: str) -> List[str]:
+            resp = client.get(f"/deployment/{deployment_id}/resources")
+            if resp.status_code == 404:
+                return []
+            resp.raise_for_status()
+            return [resource["name"] for resource in resp.json()]
+
+        deployment_ids = sorted(
+            {resource["deploymentId"] for resource in self.resources.values()}
+        )
+        deployed = {
+            (deployment_id, name)
+            for deployment_id, names in zip(
+                deployment_ids, map_concurrent(deployed_names, deployment_ids)
+            )
+            for name in names
+        }
+        missing = [
+            name
+            for name, resource in self.resources.items()
+            if (resource["deploymentId"], name) not in deployed
+        ]
+        for name in missing:
+            del self.resources[name]
+        return missing
+
+
+class ResourceChange(NamedTuple):
+    name: str
+    status: str
+    hash: str
+    path: Optional[Path] = None
+
+
+def diff(
+    hashes: Dict[str, str],
+    deployed: Dict[str, str],
+    paths: Optional[Dict[str, Path]] = None,
+) -> List[ResourceChange]:
+    """
+    compares the hashes of the local resources with the hashes
+    deployed (both by name).
+    """
+    changes = []
+    for name, hash_ in hashes.items():
+        if name not in deployed:
+            status = NEW
+        elif deployed[name] != hash_:
+            status = CHANGED
+        else:
+            status = UNCHANGED
+        changes.append(ResourceChange(name, status, hash_, (paths or {}).get(name)))
+    for name in deployed.keys() - hashes.keys():
+        changes.append(ResourceChange(name, MISSING, deployed[name]))
+    return sorted(changes, key=lambda change: change.name)
+
+
+def deploy(
+    client: Client,
+    deployment_name: Optional[str],
+    resources: Dict[str, Union[Path, bytes]],
+    source: Optional[str] = None,
+    tenant_id: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    creates one deployment of the resources (`POST /deployment/create`),
+    given as path or content. the engine skips resources deployed
+    unchanged before (by deployment name, a deployment without name
+    deploys all resources).
+    """
+    form: Dict[str, str] = {
+        "enable-duplicate-filtering": "true",
+        "deploy-changed-only": "true",
+    }
+    if deployment_name:
+        form["deployment-name"] = deployment_name
+    if source:
+        form["deployment-source"] = source
+    if tenant_id:
+        form["tenant-id"] = tenant_id
+    body = MultipartStream(form, resources)
+    resp = client.post(
+        "/deployment/create",
+        data=body,
+        headers={"Content-Type": body.content_type},
+    )
+    resp.raise_for_status()
+    return resp.json()
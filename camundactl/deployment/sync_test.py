@@ -0,0 +1,37 @@
+from unittest.mock import Mock
+
+from .sync import CHANGED, MISSING, NEW, UNCHANGED, DeployState, diff, scan
+
+
+def test_scan(tmp_path):
+    (tmp_path / "invoice").mkdir()
+    (tmp_path / "invoice" / "invoice.bpmn").write_text("<bpmn/>")
+    (tmp_path / "rules.dmn").write_text("<dmn/>")
+    (tmp_path / "README.md").write_text("")
+
+    assert list(scan(tmp_path)) == ["invoice/invoice.bpmn", "rules.dmn"]
+
+
+def test_diff():
+    changes = diff({"a": "1", "b": "2", "c": "3"}, {"a": "1", "b": "0", "d": "4"})
+
+    assert [(change.name, change.status) for change in changes] == [
+        ("a", UNCHANGED),
+        ("b", CHANGED),
+        ("c", NEW),
+        ("d", MISSING),
+    ]
+
+
+def test_verify_forgets_undeployed_resources(tmp_path):
+    def get(path):
+        if path == "/deployment/d1/resources":
+            return Mock(status_code=200, json=Mock(return_value=[{"name": "a"}]))
+        return Mock(status_code=404)
+
+    state = DeployState(tmp_path / "state.json")
+    state.update({"a": "1", "b": "2"}, "d1")
+    state.update({"c": "3"}, "d2")
+
+    assert sorted(state.verify(Mock(get=get))) == ["b", "c"]
+    assert list(state.resources) == ["a"]
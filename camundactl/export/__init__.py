@@ -0,0 +1,10 @@
+from camundactl.export.checkpoint import Checkpoint, CheckpointMismatch  # noqa
+from camundactl.export.runner import (  # noqa
+    EXPORT_RESOURCES,
+    ExportExists,
+    ExportResource,
+    parse_window,
+    run_export,
+)
+from camundactl.export.shards import COMPRESSIONS, ShardWriter  # noqa
+from camundactl.export.windows import get_time_window, iter_window_pages  # noqa
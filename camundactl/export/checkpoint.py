@@ -0,0 +1,59 @@
+import json
+import os
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+__all__ = ["Checkpoint", "CheckpointMismatch", "load_checkpoint", "save_checkpoint"]
+
+CHECKPOINT_FILE = "checkpoint.json"
+
+
+class CheckpointMismatch(Exception):
+    pass
+
+
+@dataclass
+class Checkpoint:
+    # the parameters of the export. a resumed export must not change them.
+    resource: str
+    params: Dict[str, Any]
+    # start of the window and the offset in the window to continue at
+    window_start: str
+    offset: int = 0
+    next_shard: int = 0
+    exported: int = 0
+    done: bool = False
+
+    def check(self, resource: str, params: Dict[str, Any]) -> None:
+        if resource != self.resource or params != self.params:
+            raise CheckpointMismatch(
+                f"the checkpoint belongs to an export of {self.resource} "
+                f"with {self.params}"
+            )
+
+
+def get_checkpoint_file(directory: Path) -> Path:
+    return directory / CHECKPOINT_FILE
+
+
+def load_checkpoint(directory: Path) -> Optional[Checkpoint]:
+    try:
+        with open(get_checkpoint_file(directory), "r") as fh:
+            return Checkpoint(**json.load(fh))
+    except FileNotFoundError:
+        return None
+
+
+def save_checkpoint(directory: Path, checkpoint: Checkpoint) -> None:
+    """
+    writes the checkpoint atomically. an interrupted write keeps the
+    previous checkpoint.
+    """
+    path = get_checkpoint_file(directory)
+    tmp_path = path.with_suffix(".tmp")
+    with open(tmp_path, "w") as fh:
+        json.dump(asdict(checkpoint), fh, indent=2)
+        fh.flush()
+        os.fsync(fh.fileno())
+    os.replace(tmp_path, path)
@@ -0,0 +1,285 @@
+import logging
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
+
+from toolz import partition_all
+
+from camundactl.client import Client
+from camundactl.client.paging import DEFAULT_PAGE_SIZE, iter_pages
+from camundactl.export.checkpoint import (
+    Checkpoint,
+    load_checkpoint,
+    save_checkpoint,
+)
+from camundactl.export.shards import ShardWriter
+from camundactl.export.windows import (
+    format_timestamp,
+    iter_windows,
+    parse_timestamp,
+    parse_window,
+    window_filters,
+)
+
+__all__ = [
+    "ExportResource",
+    "EXPORT_RESOURCES",
+    "ExportExists",
+    "format_timestamp",
+    "parse_window",
+    "run_export",
+]
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SHARD_SIZE = 100_000
+
+DEFAULT_WINDOW = timedelta(days=1)
+
+DEFAULT_COMPRESSION = "gzip"
+
+# process instance ids per variable request
+INSTANCE_CHUNK_SIZE = 100
+
+
+class ExportExists(Exception):
+    pass
+
+
+class ExportResource(NamedTuple):
+    name: str
+    path: str
+    # query parameters restricting the objects to a time window
+    after_param: str
+    before_param: str
+    # the objects of a window are paged in the order of these keys. the
+    # last key is unique, so the pages do not overlap. multiple keys are
+    # posted as query (`sorting`), a single key is passed as sortBy.
+    sorting: Tuple[str, ...]
+    # the objects have no timestamp. they are requested for the historic
+    # process instances started in the window, by this parameter.
+    process_instance_param: Optional[str] = None
+    params: Dict[str, str] = {}
+
+
+_PROCESS_INSTANCES = ExportResource(
+    name="processInstances",
+    path="/history/process-instance",
+    after_param="startedAfter",
+    before_param="startedBefore",
+    sorting=("startTime", "instanceId"),
+)
+
+EXPORT_RESOURCES: Dict[str, ExportResource] = {
+    resource.name: resource
+    for resource in (
+        _PROCESS_INSTANCES,
+        ExportResource(
+            name="activityInstances",
+            path="/history/activity-instance",
+            after_param="startedAfter",
+            before_param="startedBefore",
+            sorting=("startTime", "activityInstanceId"),
+        ),
+        ExportResource(
+            name="variableInstances",
+            path="/history/variable-instance",
+            after_param=_PROCESS_INSTANCES.after_param,
+            before_param=_PROCESS_INSTANCES.before_param,
+            # variables can not be sorted by id. they are requested for
+            # a few process instances at once and duplicates are removed
+            sorting=("instanceId", "variableName"),
+            process_instance_param="processInstanceIdIn",
+            params={"deserializeValues": "false"},
+        ),
+        ExportResource(
+            name="incidents",
+            path="/history/incident",
+            after_param="createTimeAfter",
+            before_param="createTimeBefore",
+            # incidents can not be queried by post
+            sorting=("incidentId",),
+        ),
+    )
+}
+
+
+def _as_utc(value: datetime) -> datetime:
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def _window_filters(
+    resource: ExportResource, start: datetime, end: datetime
+) -> Dict[str, Any]:
+    return window_filters(resource.after_param, resource.before_param, start, end)
+
+
+def _query(
+    resource: ExportResource, filters: Dict[str, Any]
+) -> Tuple[Dict[str, Any], Optional[Dict[str, Any]]]:
+    """
+    returns the query parameters and the posted query (none for a get)
+    requesting the filtered objects of the resource in order.
+    """
+    if len(resource.sorting) == 1:
+        filters = {
+            name: ",".join(value) if isinstance(value, list) else value
+            for name, value in filters.items()
+        }
+        params = {"sortBy": resource.sorting[0], "sortOrder": "asc"}
+        return {**resource.params, **filters, **params}, None
+    sorting = [{"sortBy": key, "sortOrder": "asc"} for key in resource.sorting]
+    return dict(resource.params), {**filters, "sorting": sorting}
+
+
+def _fetch_page(
+    client: Client,
+    resource: ExportResource,
+    start: datetime,
+    end: datetime,
+    offset: int,
+    page_size: int,
+) -> Tuple[List[Dict], int]:
+    """
+    returns the objects of the page of the window at offset and the
+    number of objects the offset advances by.
+    """
+    if not resource.process_instance_param:
+        params, query = _query(resource, _window_filters(resource, start, end))
+        pages = iter_pages(client, resource.path, params, page_size, offset, query)
+        page = next(pages, [])
+        return page, len(page)
+
+    params, query = _query(
+        _PROCESS_INSTANCES, _window_filters(_PROCESS_INSTANCES, start, end)
+    )
+    instances = next(
+        iter_pages(client, _PROCESS_INSTANCES.path, params, page_size, offset, query),
+        [],
+    )
+    objects: Dict[str, Dict] = {}
+    for chunk in partition_all(INSTANCE_CHUNK_SIZE, instances):
+        params, query = _query(
+            resource, {resource.process_instance_param: [i["id"] for i in chunk]}
+        )
+        for page in iter_pages(client, resource.path, params, page_size, json=query):
+            for obj in page:
+                objects.setdefault(obj["id"], obj)
+    return list(objects.values()), len(instances)
+
+
+def _resolve_params(
+    checkpoint: Optional[Checkpoint],
+    start: Optional[datetime],
+    end: Optional[datetime],
+    window: Optional[timedelta],
+    compression: Optional[str],
+) -> Dict[str, Any]:
+    """
+    returns the parameters of the export. parameters not passed are
+    taken from the checkpoint of a resumed export or the defaults.
+    """
+    stored = checkpoint.params if checkpoint else {}
+    if start is None:
+        if "from" not in stored:
+            raise ValueError("the start of the export (--from) is required")
+        start = parse_timestamp(stored["from"])
+    if end is None:
+        if "to" in stored:
+            end = parse_timestamp(stored["to"])
+        else:
+            end = datetime.now(timezone.utc).replace(second=0, microsecond=0)
+    if window is None:
+        window = timedelta(seconds=stored.get("window", DEFAULT_WINDOW.total_seconds()))
+    return {
+        "from": format_timestamp(_as_utc(start)),
+        "to": format_timestamp(_as_utc(end)),
+        "window": int(window.total_seconds()),
+        "compression": compression or stored.get("compression", DEFAULT_COMPRESSION),
+    }
+
+
+def run_export(
+    client: Client,
+    resource: ExportResource,
+    directory: Path,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    window: Optional[timedelta] = None,
+    compression: Optional[str] = None,
+    shard_size: int = DEFAULT_SHARD_SIZE,
+    page_size: int = DEFAULT_PAGE_SIZE,
+    resume: bool = False,
+    progress: Optional[Callable[[Checkpoint], None]] = None,
+) -> Checkpoint:
+    """
+    exports the objects of the resource from start to end (default now)
+    window by window into compressed ndjson shards in directory. a
+    checkpoint is written with every shard, so an interrupted export
+    can be resumed. a resumed export takes the parameters not passed
+    from the checkpoint.
+    """
+    checkpoint = load_checkpoint(directory)
+    if checkpoint and not resume:
+        raise ExportExists(
+            f"{directory} contains an export already. pass --resume to continue it"
+        )
+    params = _resolve_params(checkpoint, start, end, window, compression)
+    if checkpoint:
+        checkpoint.check(resource.name, params)
+        logger.info("resuming at %s (+%d)", checkpoint.window_start, checkpoint.offset)
+    else:
+        directory.mkdir(parents=True, exist_ok=True)
+        checkpoint = Checkpoint(
+            resource=resource.name, params=params, window_start=params["from"]
+        )
+    if checkpoint.done:
+        return checkpoint
+
+    writer = ShardWriter(
+        directory, resource.name, params["compression"], checkpoint.next_shard
+    )
+    # objects written to the current shard, not yet in the checkpoint
+    pending = 0
+
+    def commit(window_start: datetime, offset: int) -> None:
+        nonlocal pending
+        shard = writer.commit()
+        checkpoint.window_start = format_timestamp(window_start)
+        checkpoint.offset = offset
+        checkpoint.next_shard = writer.next_shard
+        checkpoint.exported += pending
+        pending = 0
+        save_checkpoint(directory, checkpoint)
+        if progress and shard:
+            progress(checkpoint)
+
+    end = parse_timestamp(params["to"])
+    window = timedelta(seconds=params["window"])
+    resume_start = parse_timestamp(checkpoint.window_start)
+    offset = checkpoint.offset
+    try:
+        for window_start, window_end in iter_windows(resume_start, end, window):
+            while True:
+                objects, consumed = _fetch_page(
+                    client, resource, window_start, window_end, offset, page_size
+                )
+                writer.write(objects)
+                pending += len(objects)
+                offset += consumed
+                if consumed < page_size:
+                    break
+                if writer.rows >= shard_size:
+                    commit(window_start, offset)
+            offset = 0
+            if writer.rows >= shard_size:
+                commit(window_end, 0)
+        checkpoint.done = True
+        commit(end, 0)
+    except BaseException:
+        # the objects since the last checkpoint are exported again
+        writer.discard()
+        raise
+    return checkpoint
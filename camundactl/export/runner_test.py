@@ -0,0 +1,138 @@
+import gzip
+import json
+from datetime import datetime, timedelta
+from pathlib import Path
+from unittest.mock import Mock
+
+import pytest
+
+from .checkpoint import CheckpointMismatch, load_checkpoint
+from .runner import EXPORT_RESOURCES, ExportExists, _query, parse_window, run_export
+
+PROCESS_INSTANCES = EXPORT_RESOURCES["processInstances"]
+
+START = datetime(2021, 1, 1)
+END = datetime(2021, 1, 3)
+
+# two instances every hour of the export range
+INSTANCES = [
+    {"id": f"p{i}", "startTime": f"2021-01-0{1 + i // 48}T{(i // 2) % 24:02d}:00"}
+    for i in range(96)
+]
+
+
+def _client(fail_after: int = None) -> Mock:
+    def post(path, params, json):
+        if fail_after is not None and client.post.call_count > fail_after:
+            raise ConnectionError()
+        after = json["startedAfter"][:16]
+        before = json["startedBefore"][:16]
+        items = [i for i in INSTANCES if after <= i["startTime"] <= before]
+        start = params["firstResult"]
+        resp = Mock()
+        resp.json.return_value = items[start : start + params["maxResults"]]
+        return resp
+
+    client = Mock()
+    client.post.side_effect = post
+    return client
+
+
+def _read_export(directory: Path) -> list:
+    return [
+        json.loads(line)
+        for path in sorted(directory.glob("*.ndjson.gz"))
+        for line in gzip.open(path, "rt")
+    ]
+
+
+def _export(client, directory, **kwargs):
+    return run_export(
+        client,
+        PROCESS_INSTANCES,
+        directory,
+        start=START,
+        end=END,
+        window=timedelta(hours=6),
+        shard_size=10,
+        page_size=4,
+        **kwargs,
+    )
+
+
+def test_parse_window():
+    assert parse_window("15m") == timedelta(minutes=15)
+    assert parse_window("2d") == timedelta(days=2)
+    with pytest.raises(ValueError):
+        parse_window("1y")
+
+
+def test_run_export(tmp_path: Path):
+    client = _client()
+    checkpoint = _export(client, tmp_path)
+
+    assert checkpoint.done
+    assert checkpoint.exported == len(INSTANCES)
+    # a shard is committed after the page exceeding the shard size
+    assert checkpoint.next_shard == 8
+    assert _read_export(tmp_path) == INSTANCES
+    assert not list(tmp_path.glob("*.tmp"))
+
+    # the windows end a millisecond before the next one starts
+    query = client.post.call_args_list[0].kwargs["json"]
+    assert query["startedAfter"] == "2021-01-01T00:00:00.000+0000"
+    assert query["startedBefore"] == "2021-01-01T05:59:59.999+0000"
+    # the last sort key is unique (instances start at the same time)
+    assert query["sorting"][-1] == {"sortBy": "instanceId", "sortOrder": "asc"}
+
+
+def test_query_get():
+    params, query = _query(
+        EXPORT_RESOURCES["incidents"], {"processInstanceIdIn": ["p1", "p2"]}
+    )
+
+    assert query is None
+    assert params == {
+        "processInstanceIdIn": "p1,p2",
+        "sortBy": "incidentId",
+        "sortOrder": "asc",
+    }
+
+
+def test_run_export_exists(tmp_path: Path):
+    _export(_client(), tmp_path)
+    with pytest.raises(ExportExists):
+        _export(_client(), tmp_path)
+
+
+def test_run_export_resume(tmp_path: Path):
+    with pytest.raises(ConnectionError):
+        _export(_client(fail_after=15), tmp_path)
+
+    checkpoint = load_checkpoint(tmp_path)
+    assert not checkpoint.done
+    assert 0 < checkpoint.exported < len(INSTANCES)
+    assert not list(tmp_path.glob("*.tmp"))
+
+    checkpoint = _export(_client(), tmp_path, resume=True)
+
+    assert checkpoint.done
+    assert checkpoint.exported == len(INSTANCES)
+    # no object is missing or exported twice
+    assert _read_export(tmp_path) == INSTANCES
+
+
+def test_run_export_resume_other_params(tmp_path: Path):
+    with pytest.raises(ConnectionError):
+        _export(_client(fail_after=15), tmp_path)
+
+    with pytest.raises(CheckpointMismatch):
+        run_export(
+            _client(),
+            PROCESS_INSTANCES,
+            tmp_path,
+            start=START,
+            end=END,
+            window=timedelta(hours=1),
+            resume=True,
+        )
@@ -0,0 +1,78 @@
+import gzip
+import json
+import lzma
+import os
+from pathlib import Path
+from typing import IO, Dict, Iterable, List, Optional
+
+__all__ = ["COMPRESSIONS", "ShardWriter"]
+
+# file suffix and open function by compression
+COMPRESSIONS = {
+    "gzip": (".ndjson.gz", gzip.open),
+    "xz": (".ndjson.xz", lzma.open),
+}
+
+TMP_SUFFIX = ".tmp"
+
+
+class ShardWriter:
+    """
+    writes objects as compressed newline delimited json into numbered
+    shards. a shard is written to a temporary file and only gets its
+    final name on `commit`, so a crash never leaves a partial shard.
+    """
+
+    def __init__(
+        self, directory: Path, prefix: str, compression: str, next_shard: int = 0
+    ):
+        self.directory = directory
+        self.prefix = prefix
+        self.suffix, self._open = COMPRESSIONS[compression]
+        self.next_shard = next_shard
+        self.rows = 0
+        self._fh: Optional[IO] = None
+
+    def shard_path(self, shard: int) -> Path:
+        return self.directory / f"{self.prefix}-{shard:05d}{self.suffix}"
+
+    def _tmp_path(self) -> Path:
+        path = self.shard_path(self.next_shard)
+        return path.with_name(path.name + TMP_SUFFIX)
+
+    def write(self, objects: Iterable[Dict]) -> None:
+        for obj in objects:
+            if self._fh is None:
+                self.directory.mkdir(parents=True, exist_ok=True)
+                self._fh = self._open(self._tmp_path(), "wt", encoding="utf-8")
+            self._fh.write(json.dumps(obj))
+            self._fh.write("\n")
+            self.rows += 1
+
+    def commit(self) -> Optional[Path]:
+        """
+        finishes the current shard and returns its path. returns none if
+        nothing was written since the last commit.
+        """
+        if self._fh is None:
+            return None
+        self._fh.close()
+        self._fh = None
+        path = self.shard_path(self.next_shard)
+        os.replace(self._tmp_path(), path)
+        self.next_shard += 1
+        self.rows = 0
+        return path
+
+    def discard(self) -> None:
+        """
+        drops the objects written since the last commit.
+        """
+        if self._fh is not None:
+            self._fh.close()
+            self._fh = None
+            self._tmp_path().unlink()
+        self.rows = 0
+
+    def shards(self) -> List[Path]:
+        return [self.shard_path(shard) for shard in range(self.next_shard)]
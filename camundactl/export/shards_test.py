@@ -0,0 +1,35 @@
+import lzma
+from pathlib import Path
+
+import pytest
+
+from .shards import ShardWriter
+
+
+def test_shard_writer_commit(tmp_path: Path):
+    writer = ShardWriter(tmp_path, "incidents", "xz")
+    writer.write([{"id": 1}, {"id": 2}])
+
+    # not visible before the commit
+    assert list(tmp_path.glob("*.ndjson.xz")) == []
+
+    path = writer.commit()
+    assert path == tmp_path / "incidents-00000.ndjson.xz"
+    assert lzma.open(path, "rt").read() == '{"id": 1}\n{"id": 2}\n'
+    assert writer.commit() is None
+    assert writer.next_shard == 1
+
+
+def test_shard_writer_discard(tmp_path: Path):
+    writer = ShardWriter(tmp_path, "incidents", "gzip", next_shard=3)
+    writer.write([{"id": 1}])
+    writer.discard()
+
+    assert list(tmp_path.iterdir()) == []
+    assert writer.rows == 0
+    assert writer.shard_path(3).name == "incidents-00003.ndjson.gz"
+
+
+def test_shard_writer_compression(tmp_path: Path):
+    with pytest.raises(KeyError):
+        ShardWriter(tmp_path, "incidents", "zip")
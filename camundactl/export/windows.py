@@ -0,0 +1,142 @@
+import re
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from camundactl.client import Client
+from camundactl.client.paging import DEFAULT_PAGE_SIZE, iter_pages
+
+__all__ = [
+    "TIME_WINDOWS",
+    "format_timestamp",
+    "get_time_window",
+    "iter_window_pages",
+    "iter_windows",
+    "parse_timestamp",
+    "parse_window",
+    "window_filters",
+]
+
+# the query parameters requesting the objects after and before a
+# timestamp and the attribute holding it (which is its sortBy value, too)
+TIME_WINDOWS: Dict[str, Tuple[str, str]] = {
+    "startedAfter": ("startedBefore", "startTime"),
+    "createTimeAfter": ("createTimeBefore", "createTime"),
+    "incidentTimestampAfter": ("incidentTimestampBefore", "incidentTimestamp"),
+}
+
+DEFAULT_SCAN_WINDOW = timedelta(days=1)
+
+# the windows of `iter_window_pages` adapt to the objects in them. a
+# window is halved after more than this number of pages and doubled
+# after less than a quarter of them
+SCAN_WINDOW_PAGES = 20
+MIN_SCAN_WINDOW = timedelta(seconds=1)
+MAX_SCAN_WINDOW = timedelta(days=365)
+
+
+def format_timestamp(value: datetime) -> str:
+    """
+    formats the datetime like the engine does (`2021-08-30T10:00:00.000+0000`).
+    naive datetimes are in utc.
+    """
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.strftime("%Y-%m-%dT%H:%M:%S.") + (
+        f"{value.microsecond // 1000:03d}{value.strftime('%z')}"
+    )
+
+
+def parse_timestamp(value: str) -> datetime:
+    return datetime.strptime(value, "%Y-%m-%dT%H:%M:%S.%f%z")
+
+
+_WINDOW_UNITS = {"m": "minutes", "h": "hours", "d": "days", "w": "weeks"}
+
+
+def parse_window(value: str) -> timedelta:
+    """
+    parses a window size like `15m`, `6h`, `1d` or `2w`.
+    """
+    if not (match := re.fullmatch(r"(\d+)([mhdw])", value.strip())):
+        raise ValueError(f"invalid window '{value}'. use e.g. 15m, 6h, 1d or 2w")
+    amount, unit = match.groups()
+    if int(amount) <= 0:
+        raise ValueError("the window must be positive")
+    return timedelta(**{_WINDOW_UNITS[unit]: int(amount)})
+
+
+def iter_windows(
+    start: datetime, end: datetime, window: timedelta
+) -> Iterator[Tuple[datetime, datetime]]:
+    while start < end:
+        yield start, min(start + window, end)
+        start += window
+
+
+def window_filters(
+    after_param: str, before_param: str, start: datetime, end: datetime
+) -> Dict[str, str]:
+    # the engine includes both bounds. end the window a millisecond
+    # earlier so the objects at the bounds are requested once.
+    return {
+        after_param: format_timestamp(start),
+        before_param: format_timestamp(end - timedelta(milliseconds=1)),
+    }
+
+
+def get_time_window(parameter_names: List[str]) -> Optional[str]:
+    """
+    returns the parameter of TIME_WINDOWS the operation with the given
+    parameters can be requested window by window with.
+    """
+    for after_param, (before_param, _) in TIME_WINDOWS.items():
+        if after_param in parameter_names and before_param in parameter_names:
+            return after_param
+    return None
+
+
+def iter_window_pages(
+    client: Client,
+    path: str,
+    params: Dict[str, Any],
+    after_param: str,
+    page_size: int = DEFAULT_PAGE_SIZE,
+    window: timedelta = DEFAULT_SCAN_WINDOW,
+) -> Iterator[List[Dict]]:
+    """
+    requests the list operation at path window by window (by after_param
+    of TIME_WINDOWS) and page by page. unlike paging through the whole
+    list the offsets stay small, so huge lists are requested in linear
+    time. the windows start at after_param in params (or the oldest
+    object) and end at its before param (or now).
+    """
+    before_param, attribute = TIME_WINDOWS[after_param]
+    params = {"sortBy": attribute, "sortOrder": "asc", **params}
+    if params.get(after_param):
+        start = parse_timestamp(params[after_param])
+    else:
+        oldest_params = {**params, "sortBy": attribute, "sortOrder": "asc"}
+        oldest = next(iter_pages(client, path, oldest_params, page_size=1), [])
+        if not oldest:
+            return
+        start = parse_timestamp(oldest[0][attribute])
+    if params.get(before_param):
+        end = parse_timestamp(params[before_param]) + timedelta(milliseconds=1)
+    else:
+        end = datetime.now(timezone.utc) + timedelta(milliseconds=1)
+
+    while start < end:
+        window_end = min(start + window, end)
+        window_params = {
+            **params,
+            **window_filters(after_param, before_param, start, window_end),
+        }
+        rows = 0
+        for page in iter_pages(client, path, window_params, page_size):
+            rows += len(page)
+            yield page
+        start = window_end
+        if rows > page_size * SCAN_WINDOW_PAGES:
+            window = max(window / 2, MIN_SCAN_WINDOW)
+        elif rows < page_size * SCAN_WINDOW_PAGES / 4:
+            window = min(window * 2, MAX_SCAN_WINDOW)
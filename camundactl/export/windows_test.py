@@ -0,0 +1,67 @@
+from datetime import datetime, timedelta
+from unittest.mock import Mock
+
+from .windows import format_timestamp, get_time_window, iter_window_pages
+
+START = datetime(2021, 1, 1)
+
+# four objects every hour of ten days
+OBJECTS = [
+    {"id": f"i{i}", "startTime": format_timestamp(START + timedelta(minutes=15 * i))}
+    for i in range(960)
+]
+
+
+def _client() -> Mock:
+    def get(path, params):
+        items = [
+            item
+            for item in OBJECTS
+            if params.get("startedAfter", "") <= item["startTime"]
+            and item["startTime"] <= params.get("startedBefore", "9")
+        ]
+        first = params["firstResult"]
+        resp = Mock()
+        resp.json.return_value = items[first : first + params["maxResults"]]
+        return resp
+
+    client = Mock()
+    client.get.side_effect = get
+    return client
+
+
+def test_get_time_window():
+    assert get_time_window(["startedAfter", "startedBefore"]) == "startedAfter"
+    assert get_time_window(["createTimeAfter", "createTimeBefore"]) == "createTimeAfter"
+    # both bounds are required
+    assert get_time_window(["startedAfter"]) is None
+
+
+def test_iter_window_pages():
+    client = _client()
+    pages = list(
+        iter_window_pages(
+            client, "/history/process-instance", {}, "startedAfter", page_size=2
+        )
+    )
+
+    # every object once, starting at the oldest one
+    assert [item for page in pages for item in page] == OBJECTS
+    offsets = [
+        call.kwargs["params"]["firstResult"] for call in client.get.call_args_list
+    ]
+    # paging through the whole list would reach an offset of 958
+    assert max(offsets) < len(OBJECTS) // 8
+
+
+def test_iter_window_pages_bounds():
+    params = {
+        "startedAfter": format_timestamp(START + timedelta(days=1)),
+        "startedBefore": format_timestamp(START + timedelta(days=2)),
+    }
+    pages = iter_window_pages(
+        _client(), "/history/process-instance", params, "startedAfter"
+    )
+
+    # both bounds are included, like in the engine
+    assert len([item for page in pages for item in page]) == 97
@@ -0,0 +1,7 @@
+from camundactl.join.enrich import foreign_key, join  # noqa
+from camundactl.join.relations import (  # noqa
+    RELATION_NAMES,
+    RELATIONS,
+    Relation,
+    get_relations,
+)
@@ -0,0 +1,48 @@
+import logging
+from typing import Dict, Iterable, List, Optional
+
+from camundactl.client import Client
+from camundactl.client.parallel import DEFAULT_ID_CHUNK_SIZE, fetch_by_ids
+from camundactl.join.relations import Relation
+
+__all__ = ["join", "foreign_key"]
+
+logger = logging.getLogger(__name__)
+
+
+def foreign_key(row: Dict, relation: Relation) -> Optional[str]:
+    for key in relation.keys:
+        if value := row.get(key):
+            return value
+    return None
+
+
+def join(
+    client: Client,
+    rows: Iterable[Dict],
+    relations: Iterable[Relation],
+    chunk_size: int = DEFAULT_ID_CHUNK_SIZE,
+) -> List[Dict]:
+    """
+    adds the fields of the related objects to the rows, named
+    `<relation>.<field>` (e.g. `processInstance.businessKey`). the
+    related objects are requested by the distinct ids referenced by the
+    rows, chunk_size ids per request, and looked up by id. fields of
+    objects not found (e.g. deleted) are none.
+    """
+    rows = list(rows)
+    for relation in relations:
+        ids = {key for row in rows if (key := foreign_key(row, relation))}
+        index = (
+            fetch_by_ids(
+                client, relation.path, relation.id_param, ids, chunk_size=chunk_size
+            )
+            if ids
+            else {}
+        )
+        logger.debug("joined %s of %s %s", len(index), len(ids), relation.name)
+        for row in rows:
+            related = index.get(foreign_key(row, relation)) or {}
+            for field in relation.fields:
+                row[f"{relation.name}.{field}"] = related.get(field)
+    return rows
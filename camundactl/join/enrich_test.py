@@ -0,0 +1,59 @@
+from unittest.mock import Mock
+
+from .enrich import join
+from .relations import get_relations
+
+INSTANCES = {
+    "pi1": {"id": "pi1", "businessKey": "order-1", "suspended": False},
+    "pi2": {"id": "pi2", "businessKey": "order-2", "suspended": True},
+}
+DEFINITIONS = {"pd1": {"id": "pd1", "key": "invoice", "version": 3, "name": "Invoice"}}
+
+
+def _client():
+    def get(path, params):
+        objects = INSTANCES if path == "/process-instance" else DEFINITIONS
+        ids = next(v for k, v in params.items() if k.endswith(("Ids", "IdIn")))
+        resp = Mock()
+        resp.json.return_value = [
+            objects[id_] for id_ in ids.split(",") if id_ in objects
+        ]
+        return resp
+
+    return Mock(get=Mock(side_effect=get))
+
+
+def test_join():
+    rows = [
+        {"id": f"i{i}", "processInstanceId": f"pi{i % 3}", "processDefinitionId": "pd1"}
+        for i in range(250)
+    ]
+    client = _client()
+
+    result = join(
+        client, rows, get_relations("processInstance,processDefinition"), chunk_size=2
+    )
+
+    assert result[1] == {
+        "id": "i1",
+        "processInstanceId": "pi1",
+        "processDefinitionId": "pd1",
+        "processInstance.businessKey": "order-1",
+        "processInstance.suspended": False,
+        "processDefinition.key": "invoice",
+        "processDefinition.version": 3,
+        "processDefinition.name": "Invoice",
+    }
+    # pi0 does not exist
+    assert result[0]["processInstance.businessKey"] is None
+    # the distinct ids are requested in chunks: 2 instance and 1 definition request
+    assert client.get.call_count == 3
+
+
+def test_join_alternative_keys():
+    rows = [{"id": "pi1", "definitionId": "pd1"}, {"id": "pi2"}]
+
+    result = join(_client(), rows, get_relations("processDefinition"))
+
+    assert result[0]["processDefinition.key"] == "invoice"
+    assert result[1]["processDefinition.key"] is None
@@ -0,0 +1,88 @@
+from typing import List, NamedTuple, Tuple
+
+__all__ = ["Relation", "RELATIONS", "RELATION_NAMES", "get_relations"]
+
+
+class Relation(NamedTuple):
+    name: str
+    # the fields of the rows referencing the related object. the first
+    # one set is used (e.g. process instances call it `definitionId`)
+    keys: Tuple[str, ...]
+    # the list operation and its parameter filtering by a list of ids
+    path: str
+    id_param: str
+    # the fields of the related object added to the rows
+    fields: Tuple[str, ...]
+
+
+RELATIONS = (
+    Relation(
+        "processInstance",
+        ("processInstanceId",),
+        "/process-instance",
+        "processInstanceIds",
+        ("businessKey", "suspended"),
+    ),
+    Relation(
+        "rootProcessInstance",
+        ("rootProcessInstanceId",),
+        "/process-instance",
+        "processInstanceIds",
+        ("businessKey",),
+    ),
+    Relation(
+        "historicProcessInstance",
+        ("processInstanceId",),
+        "/history/process-instance",
+        "processInstanceIds",
+        ("businessKey", "state", "startTime", "endTime"),
+    ),
+    Relation(
+        "processDefinition",
+        ("processDefinitionId", "definitionId"),
+        "/process-definition",
+        "processDefinitionIdIn",
+        ("key", "version", "name"),
+    ),
+    Relation(
+        "decisionDefinition",
+        ("decisionDefinitionId",),
+        "/decision-definition",
+        "decisionDefinitionIdIn",
+        ("key", "version", "name"),
+    ),
+    # the configuration of failed job incidents is the job id, of failed
+    # external task incidents the external task id
+    Relation(
+        "job",
+        ("jobId", "configuration"),
+        "/job",
+        "jobIds",
+        ("retries", "exceptionMessage", "dueDate"),
+    ),
+    Relation(
+        "externalTask",
+        ("externalTaskId", "configuration"),
+        "/external-task",
+        "externalTaskIdIn",
+        ("retries", "errorMessage", "workerId"),
+    ),
+    Relation(
+        "task",
+        ("taskId",),
+        "/task",
+        "taskIdIn",
+        ("name", "assignee"),
+    ),
+)
+
+RELATION_NAMES = [relation.name for relation in RELATIONS]
+
+
+def get_relations(names: str) -> List[Relation]:
+    """
+    returns the relations of a comma seperated list of names. raises
+    a KeyError for unknown names.
+    """
+    relations = {relation.name: relation for relation in RELATIONS}
+    return [relations[name.strip()] for name in names.split(",") if name.strip()]
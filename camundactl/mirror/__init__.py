@@ -0,0 +1,11 @@
+from camundactl.mirror.resources import (  # noqa
+    MIRROR_RESOURCES,
+    MirrorResource,
+    get_resource_by_operation_id,
+)
+from camundactl.mirror.store import (  # noqa
+    MirrorQueryError,
+    MirrorStore,
+    get_mirror_file,
+)
+from camundactl.mirror.sync import sync_resource  # noqa
@@ -0,0 +1,313 @@
+from typing import Any, Dict, NamedTuple, Optional, Tuple
+
+__all__ = [
+    "Filter",
+    "Watermark",
+    "MirrorResource",
+    "MIRROR_RESOURCES",
+    "get_resource_by_operation_id",
+]
+
+
+class Filter(NamedTuple):
+    """
+    translates a query parameter of the engine into a condition on a
+    column of the mirror. filters with a value are flags (e.g.
+    `suspended=true`) which compare the column with this value.
+    """
+
+    column: str
+    operator: str = "="
+    value: Any = None
+
+
+class Watermark(NamedTuple):
+    """
+    an incremental sync requests the objects with the query parameter
+    `param` after the highest value of `column` seen so far.
+    """
+
+    param: str
+    column: str
+    sort_by: str
+
+
+class MirrorResource(NamedTuple):
+    # name of the table and of the resource in `cctl mirror sync`
+    name: str
+    path: str
+    # the get command which can be answered from the mirror
+    operation_id: str
+    # attributes of the objects stored (and indexed) as columns
+    columns: Tuple[str, ...]
+    filters: Dict[str, Filter]
+    # sortBy values of the engine by column
+    sort_by: Dict[str, str]
+    # columns compared as numbers (query parameters are strings)
+    numeric_columns: Tuple[str, ...] = ()
+    # resources without watermarks are replaced on every sync
+    watermarks: Tuple[Watermark, ...] = ()
+    # synced only if requested explicitly (e.g. big history tables)
+    optional: bool = False
+
+
+def _equals(*columns: str) -> Dict[str, Filter]:
+    return {column: Filter(column) for column in columns}
+
+
+_TENANT_FILTERS = {
+    "tenantIdIn": Filter("tenantId", "in"),
+    "withoutTenantId": Filter("tenantId", "null", True),
+}
+
+
+MIRROR_RESOURCES: Tuple[MirrorResource, ...] = (
+    MirrorResource(
+        name="processDefinitions",
+        path="/process-definition",
+        operation_id="getProcessDefinitions",
+        columns=(
+            "key",
+            "name",
+            "category",
+            "version",
+            "deploymentId",
+            "resource",
+            "versionTag",
+            "suspended",
+            "tenantId",
+        ),
+        filters={
+            **_equals("name", "deploymentId", "key", "category", "version"),
+            **_equals("versionTag"),
+            **_TENANT_FILTERS,
+            "processDefinitionId": Filter("id"),
+            "processDefinitionIdIn": Filter("id", "in"),
+            "nameLike": Filter("name", "like"),
+            "keysIn": Filter("key", "in"),
+            "keyLike": Filter("key", "like"),
+            "categoryLike": Filter("category", "like"),
+            "resourceName": Filter("resource"),
+            "resourceNameLike": Filter("resource", "like"),
+            "versionTagLike": Filter("versionTag", "like"),
+            "withoutVersionTag": Filter("versionTag", "null", True),
+            "active": Filter("suspended", "=", False),
+            "suspended": Filter("suspended", "=", True),
+        },
+        sort_by={
+            "id": "id",
+            "key": "key",
+            "name": "name",
+            "category": "category",
+            "version": "version",
+            "deploymentId": "deploymentId",
+            "versionTag": "versionTag",
+            "tenantId": "tenantId",
+        },
+        numeric_columns=("version",),
+    ),
+    MirrorResource(
+        name="deployments",
+        path="/deployment",
+        operation_id="getDeployments",
+        columns=("name", "source", "deploymentTime", "tenantId"),
+        filters={
+            **_equals("id", "name", "source"),
+            **_TENANT_FILTERS,
+            "nameLike": Filter("name", "like"),
+            "withoutSource": Filter("source", "null", True),
+            "after": Filter("deploymentTime", ">"),
+            "before": Filter("deploymentTime", "<"),
+        },
+        sort_by={
+            "id": "id",
+            "name": "name",
+            "deploymentTime": "deploymentTime",
+            "tenantId": "tenantId",
+        },
+        watermarks=(Watermark("after", "deploymentTime", "deploymentTime"),),
+    ),
+    MirrorResource(
+        name="incidents",
+        path="/incident",
+        operation_id="getIncidents",
+        columns=(
+            "incidentType",
+            "incidentTimestamp",
+            "incidentMessage",
+            "processDefinitionId",
+            "processInstanceId",
+            "executionId",
+            "activityId",
+            "failedActivityId",
+            "causeIncidentId",
+            "rootCauseIncidentId",
+            "configuration",
+            "jobDefinitionId",
+            "tenantId",
+        ),
+        filters={
+            **_equals(
+                "incidentType",
+                "incidentMessage",
+                "processDefinitionId",
+                "processInstanceId",
+                "executionId",
+                "activityId",
+                "failedActivityId",
+                "causeIncidentId",
+                "rootCauseIncidentId",
+                "configuration",
+            ),
+            "tenantIdIn": Filter("tenantId", "in"),
+            "incidentId": Filter("id"),
+            "incidentMessageLike": Filter("incidentMessage", "like"),
+            "incidentTimestampBefore": Filter("incidentTimestamp", "<"),
+            "incidentTimestampAfter": Filter("incidentTimestamp", ">"),
+            "jobDefinitionIdIn": Filter("jobDefinitionId", "in"),
+        },
+        sort_by={
+            "incidentId": "id",
+            "incidentMessage": "incidentMessage",
+            "incidentTimestamp": "incidentTimestamp",
+            "incidentType": "incidentType",
+            "executionId": "executionId",
+            "activityId": "activityId",
+            "processInstanceId": "processInstanceId",
+            "processDefinitionId": "processDefinitionId",
+            "causeIncidentId": "causeIncidentId",
+            "rootCauseIncidentId": "rootCauseIncidentId",
+            "configuration": "configuration",
+            "tenantId": "tenantId",
+        },
+    ),
+    MirrorResource(
+        name="jobs",
+        path="/job",
+        operation_id="getJobs",
+        columns=(
+            "jobDefinitionId",
+            "processInstanceId",
+            "executionId",
+            "processDefinitionId",
+            "processDefinitionKey",
+            "retries",
+            "exceptionMessage",
+            "failedActivityId",
+            "dueDate",
+            "suspended",
+            "priority",
+            "createTime",
+            "tenantId",
+        ),
+        filters={
+            **_equals(
+                "jobDefinitionId",
+                "processInstanceId",
+                "executionId",
+                "processDefinitionId",
+                "processDefinitionKey",
+                "exceptionMessage",
+                "failedActivityId",
+            ),
+            **_TENANT_FILTERS,
+            "jobId": Filter("id"),
+            "jobIds": Filter("id", "in"),
+            "processInstanceIds": Filter("processInstanceId", "in"),
+            "withException": Filter("exceptionMessage", "notnull", True),
+            "withRetriesLeft": Filter("retries", ">", 0),
+            "noRetriesLeft": Filter("retries", "=", 0),
+            "active": Filter("suspended", "=", False),
+            "suspended": Filter("suspended", "=", True),
+            "priorityLowerThanOrEquals": Filter("priority", "<="),
+            "priorityHigherThanOrEquals": Filter("priority", ">="),
+        },
+        sort_by={
+            "jobId": "id",
+            "executionId": "executionId",
+            "processInstanceId": "processInstanceId",
+            "processDefinitionId": "processDefinitionId",
+            "processDefinitionKey": "processDefinitionKey",
+            "jobPriority": "priority",
+            "jobRetries": "retries",
+            "jobDueDate": "dueDate",
+            "tenantId": "tenantId",
+        },
+        numeric_columns=("retries", "priority"),
+    ),
+    MirrorResource(
+        name="historicProcessInstances",
+        path="/history/process-instance",
+        operation_id="getHistoricProcessInstances",
+        columns=(
+            "businessKey",
+            "processDefinitionId",
+            "processDefinitionKey",
+            "processDefinitionName",
+            "processDefinitionVersion",
+            "startTime",
+            "endTime",
+            "durationInMillis",
+            "startUserId",
+            "superProcessInstanceId",
+            "rootProcessInstanceId",
+            "tenantId",
+            "state",
+        ),
+        filters={
+            **_equals(
+                "processDefinitionId",
+                "processDefinitionKey",
+                "processDefinitionName",
+                "superProcessInstanceId",
+            ),
+            **_TENANT_FILTERS,
+            "processInstanceId": Filter("id"),
+            "processInstanceIds": Filter("id", "in"),
+            "processDefinitionKeyIn": Filter("processDefinitionKey", "in"),
+            "processDefinitionKeyNotIn": Filter("processDefinitionKey", "not in"),
+            "processDefinitionNameLike": Filter("processDefinitionName", "like"),
+            "processInstanceBusinessKey": Filter("businessKey"),
+            "processInstanceBusinessKeyLike": Filter("businessKey", "like"),
+            "rootProcessInstances": Filter("superProcessInstanceId", "null", True),
+            "finished": Filter("endTime", "notnull", True),
+            "unfinished": Filter("endTime", "null", True),
+            "startedBefore": Filter("startTime", "<"),
+            "startedAfter": Filter("startTime", ">"),
+            "finishedBefore": Filter("endTime", "<"),
+            "finishedAfter": Filter("endTime", ">"),
+            "startedBy": Filter("startUserId"),
+            "active": Filter("state", "=", "ACTIVE"),
+            "suspended": Filter("state", "=", "SUSPENDED"),
+            "completed": Filter("state", "=", "COMPLETED"),
+            "externallyTerminated": Filter("state", "=", "EXTERNALLY_TERMINATED"),
+            "internallyTerminated": Filter("state", "=", "INTERNALLY_TERMINATED"),
+        },
+        sort_by={
+            "instanceId": "id",
+            "definitionId": "processDefinitionId",
+            "definitionKey": "processDefinitionKey",
+            "definitionName": "processDefinitionName",
+            "definitionVersion": "processDefinitionVersion",
+            "businessKey": "businessKey",
+            "startTime": "startTime",
+            "endTime": "endTime",
+            "duration": "durationInMillis",
+            "tenantId": "tenantId",
+        },
+        numeric_columns=("processDefinitionVersion", "durationInMillis"),
+        # new instances by their start and finished ones by their end
+        watermarks=(
+            Watermark("startedAfter", "startTime", "startTime"),
+            Watermark("finishedAfter", "endTime", "endTime"),
+        ),
+        optional=True,
+    ),
+)
+
+
+def get_resource_by_operation_id(operation_id: str) -> Optional[MirrorResource]:
+    for resource in MIRROR_RESOURCES:
+        if resource.operation_id == operation_id:
+            return resource
+    return None
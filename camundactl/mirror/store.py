@@ -0,0 +1,234 @@
+import json
+import sqlite3
+import time
+from contextlib import closing
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from camundactl.config import get_configdir
+from camundactl.mirror.resources import MIRROR_RESOURCES, MirrorResource
+
+__all__ = ["MirrorStore", "MirrorQueryError", "get_mirror_file"]
+
+# query parameters handled by every resource
+_PAGING_PARAMS = ("sortBy", "sortOrder", "firstResult", "maxResults")
+
+_COMPARISONS = ("=", "<", ">", "<=", ">=", "like")
+
+
+class MirrorQueryError(Exception):
+    pass
+
+
+def get_mirror_file(engine: str) -> Path:
+    return get_configdir() / "mirror" / f"{engine}.sqlite"
+
+
+def _is_true(value: Any) -> bool:
+    return value in (True, "true")
+
+
+def _as_list(value: Any) -> List[Any]:
+    """
+    string options can be passed multiple times (tuples) and list
+    parameters are comma seperated.
+    """
+    values = value if isinstance(value, (list, tuple)) else [value]
+    return [
+        item
+        for value in values
+        for item in (value.split(",") if isinstance(value, str) else [value])
+    ]
+
+
+class MirrorStore:
+    """
+    local sqlite copy of the resources of one engine. every resource is
+    a table with the object id, the (indexed) columns of the resource
+    and the original object as json.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+
+    def connect(self) -> sqlite3.Connection:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        connection = sqlite3.connect(self.path)
+        connection.execute("PRAGMA journal_mode=WAL")
+        self._create_tables(connection)
+        return connection
+
+    def _create_tables(self, connection: sqlite3.Connection) -> None:
+        with connection:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS sync_state "
+                "(resource TEXT PRIMARY KEY, synced_at REAL)"
+            )
+            for resource in MIRROR_RESOURCES:
+                columns = "".join(
+                    (
+                        f', "{column}" INTEGER'
+                        if column in resource.numeric_columns
+                        else f', "{column}"'
+                    )
+                    for column in resource.columns
+                )
+                connection.execute(
+                    f'CREATE TABLE IF NOT EXISTS "{resource.name}" '
+                    f"(id TEXT PRIMARY KEY{columns}, data TEXT NOT NULL)"
+                )
+                for column in resource.columns:
+                    connection.execute(
+                        f'CREATE INDEX IF NOT EXISTS "{resource.name}_{column}" '
+                        f'ON "{resource.name}" ("{column}")'
+                    )
+
+    def upsert(
+        self,
+        connection: sqlite3.Connection,
+        resource: MirrorResource,
+        objects: Iterable[Dict],
+    ) -> int:
+        names = ", ".join(f'"{name}"' for name in ("id", *resource.columns, "data"))
+        placeholders = ", ".join("?" * (len(resource.columns) + 2))
+        rows = [
+            (
+                obj["id"],
+                *(obj.get(column) for column in resource.columns),
+                json.dumps(obj),
+            )
+            for obj in objects
+        ]
+        connection.executemany(
+            f'INSERT OR REPLACE INTO "{resource.name}" ({names}) '
+            f"VALUES ({placeholders})",
+            rows,
+        )
+        return len(rows)
+
+    def clear(self, connection: sqlite3.Connection, resource: MirrorResource) -> None:
+        connection.execute(f'DELETE FROM "{resource.name}"')
+
+    def get_watermark(
+        self, connection: sqlite3.Connection, resource: MirrorResource, column: str
+    ) -> Optional[Any]:
+        (value,) = connection.execute(
+            f'SELECT max("{column}") FROM "{resource.name}"'
+        ).fetchone()
+        return value
+
+    def set_synced(
+        self, connection: sqlite3.Connection, resource: MirrorResource
+    ) -> None:
+        connection.execute(
+            "INSERT OR REPLACE INTO sync_state (resource, synced_at) VALUES (?, ?)",
+            (resource.name, time.time()),
+        )
+
+    def status(self) -> List[Dict[str, Any]]:
+        """
+        returns the number of objects and the time of the last sync
+        by resource.
+        """
+        with closing(self.connect()) as connection:
+            synced_at = dict(
+                connection.execute("SELECT resource, synced_at FROM sync_state")
+            )
+            return [
+                {
+                    "resource": resource.name,
+                    "count": connection.execute(
+                        f'SELECT count(*) FROM "{resource.name}"'
+                    ).fetchone()[0],
+                    "synced_at": synced_at.get(resource.name),
+                }
+                for resource in MIRROR_RESOURCES
+            ]
+
+    def _build_query(
+        self, resource: MirrorResource, params: Dict[str, Any]
+    ) -> Tuple[str, List[Any]]:
+        # string options are passed as tuples (they can be repeated)
+        params = {
+            name: (
+                value[0]
+                if isinstance(value, (list, tuple)) and len(value) == 1
+                else value
+            )
+            for name, value in params.items()
+        }
+        if unsupported := [
+            name
+            for name in params
+            if name not in resource.filters and name not in _PAGING_PARAMS
+        ]:
+            raise MirrorQueryError(
+                f"the mirror can not filter {resource.name} by "
+                f"{', '.join(unsupported)}"
+            )
+
+        conditions: List[str] = []
+        values: List[Any] = []
+        for name, value in params.items():
+            if name in _PAGING_PARAMS:
+                continue
+            column, operator, flag_value = resource.filters[name]
+            if flag_value is not None:
+                # a flag. only `--<flag>` filters, not `--not-<flag>`
+                if not _is_true(value):
+                    continue
+                value = flag_value
+            elif operator == "=" and isinstance(value, (list, tuple)):
+                operator = "in"
+            if operator == "null":
+                conditions.append(f'"{column}" IS NULL')
+            elif operator == "notnull":
+                conditions.append(f'"{column}" IS NOT NULL')
+            elif operator in ("in", "not in"):
+                items = _as_list(value)
+                placeholders = ", ".join("?" * len(items))
+                conditions.append(f'"{column}" {operator.upper()} ({placeholders})')
+                values.extend(items)
+            elif operator in _COMPARISONS:
+                if isinstance(value, (list, tuple)):
+                    raise MirrorQueryError(f"{name} can only be passed once")
+                conditions.append(f'"{column}" {operator.upper()} ?')
+                values.append(value)
+            else:
+                raise MirrorQueryError(f"invalid operator {operator}")
+
+        sql = f'SELECT data FROM "{resource.name}"'
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+
+        if sort_by := params.get("sortBy"):
+            try:
+                column = resource.sort_by[sort_by]
+            except KeyError:
+                raise MirrorQueryError(
+                    f"the mirror can not sort {resource.name} by {sort_by}"
+                )
+            order = "DESC" if params.get("sortOrder") == "desc" else "ASC"
+            sql += f' ORDER BY "{column}" {order}, id'
+        else:
+            sql += " ORDER BY id"
+
+        if "maxResults" in params or "firstResult" in params:
+            sql += " LIMIT ? OFFSET ?"
+            values.extend(
+                [int(params.get("maxResults", -1)), int(params.get("firstResult", 0))]
+            )
+        return sql, values
+
+    def query(self, resource: MirrorResource, params: Dict[str, Any]) -> List[Dict]:
+        """
+        answers the query parameters of the get operation of the
+        resource from the mirror.
+        """
+        if not self.path.exists():
+            raise MirrorQueryError(
+                f"there is no mirror at {self.path}. run `cctl mirror sync` first"
+            )
+        sql, values = self._build_query(resource, params)
+        with closing(self.connect()) as connection:
+            return [json.loads(data) for (data,) in connection.execute(sql, values)]
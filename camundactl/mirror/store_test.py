@@ -0,0 +1,86 @@
+from contextlib import closing
+
+import pytest
+
+from .resources import get_resource_by_operation_id
+from .store import MirrorQueryError, MirrorStore
+
+JOBS = get_resource_by_operation_id("getJobs")
+
+
+@pytest.fixture
+def store(tmp_path) -> MirrorStore:
+    store = MirrorStore(tmp_path / "engine.sqlite")
+    with closing(store.connect()) as connection, connection:
+        store.upsert(
+            connection,
+            JOBS,
+            [
+                {
+                    "id": "j1",
+                    "retries": 0,
+                    "processInstanceId": "p1",
+                    "suspended": False,
+                },
+                {
+                    "id": "j2",
+                    "retries": 3,
+                    "processInstanceId": "p2",
+                    "suspended": True,
+                },
+                {
+                    "id": "j3",
+                    "retries": 1,
+                    "processInstanceId": "p3",
+                    "suspended": False,
+                },
+            ],
+        )
+    return store
+
+
+def _ids(result: list) -> list:
+    return [item["id"] for item in result]
+
+
+@pytest.mark.parametrize(
+    "params,expected",
+    [
+        ({}, ["j1", "j2", "j3"]),
+        ({"jobId": ("j2",)}, ["j2"]),
+        ({"processInstanceId": ("p1", "p3")}, ["j1", "j3"]),
+        ({"processInstanceIds": ("p1,p2",)}, ["j1", "j2"]),
+        ({"noRetriesLeft": "true"}, ["j1"]),
+        ({"withRetriesLeft": "true"}, ["j2", "j3"]),
+        ({"suspended": "true"}, ["j2"]),
+        ({"suspended": "false"}, ["j1", "j2", "j3"]),
+        ({"sortBy": ("jobRetries",), "sortOrder": ("desc",)}, ["j2", "j3", "j1"]),
+        ({"sortBy": ("jobId",), "firstResult": 1, "maxResults": 1}, ["j2"]),
+    ],
+)
+def test_query(store: MirrorStore, params: dict, expected: list):
+    assert _ids(store.query(JOBS, params)) == expected
+
+
+def test_query_returns_original_objects(store: MirrorStore):
+    (job,) = store.query(JOBS, {"jobId": "j2"})
+    assert job == {
+        "id": "j2",
+        "retries": 3,
+        "processInstanceId": "p2",
+        "suspended": True,
+    }
+
+
+def test_query_numeric_column(store: MirrorStore):
+    assert _ids(store.query(JOBS, {"priorityHigherThanOrEquals": "0"})) == []
+
+
+def test_query_unsupported_filter(store: MirrorStore):
+    with pytest.raises(MirrorQueryError):
+        store.query(JOBS, {"dueDates": ("lt_2021",)})
+
+
+def test_query_without_mirror(tmp_path):
+    with pytest.raises(MirrorQueryError):
+        MirrorStore(tmp_path / "missing.sqlite").query(JOBS, {})
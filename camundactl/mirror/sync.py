@@ -0,0 +1,99 @@
+import logging
+from contextlib import closing
+from typing import Callable, Optional
+
+from camundactl.client import Client
+from camundactl.client.paging import DEFAULT_PAGE_SIZE, iter_pages
+from camundactl.mirror.resources import MirrorResource, Watermark
+from camundactl.mirror.store import MirrorStore
+
+__all__ = ["sync_resource"]
+
+logger = logging.getLogger(__name__)
+
+
+def _id_sort_by(resource: MirrorResource) -> str:
+    """
+    returns the sortBy value which sorts by id (stable paging).
+    """
+    for sort_by, column in resource.sort_by.items():
+        if column == "id":
+            return sort_by
+    return next(iter(resource.sort_by))
+
+
+def _sync_snapshot(
+    client: Client,
+    store: MirrorStore,
+    resource: MirrorResource,
+    page_size: int,
+    progress: Callable[[int], None],
+) -> int:
+    """
+    replaces all objects of the resource. the resource is replaced in
+    one transaction, so a failed sync keeps the old objects.
+    """
+    count = 0
+    with closing(store.connect()) as connection, connection:
+        store.clear(connection, resource)
+        params = {"sortBy": _id_sort_by(resource), "sortOrder": "asc"}
+        for page in iter_pages(client, resource.path, params, page_size):
+            count += store.upsert(connection, resource, page)
+            progress(count)
+        store.set_synced(connection, resource)
+    return count
+
+
+def _sync_incremental(
+    client: Client,
+    store: MirrorStore,
+    resource: MirrorResource,
+    page_size: int,
+    progress: Callable[[int], None],
+) -> int:
+    """
+    requests the objects after the watermarks only. every page is
+    committed, so an interrupted sync continues where it stopped.
+    """
+    count = 0
+    with closing(store.connect()) as connection:
+        previous: Optional[Watermark] = None
+        previous_value = None
+        for watermark in resource.watermarks:
+            value = store.get_watermark(connection, resource, watermark.column)
+            if value is None and previous:
+                # a column without values (e.g. no instance finished yet)
+                # continues where the previous pass started. objects
+                # changing later have later timestamps.
+                value = previous_value or store.get_watermark(
+                    connection, resource, previous.column
+                )
+            previous, previous_value = watermark, value
+            params = {"sortBy": watermark.sort_by, "sortOrder": "asc"}
+            if value is not None:
+                params[watermark.param] = value
+            logger.debug("syncing %s with %s=%s", resource.name, watermark.param, value)
+            for page in iter_pages(client, resource.path, params, page_size):
+                with connection:
+                    count += store.upsert(connection, resource, page)
+                progress(count)
+        with connection:
+            store.set_synced(connection, resource)
+    return count
+
+
+def sync_resource(
+    client: Client,
+    store: MirrorStore,
+    resource: MirrorResource,
+    page_size: int = DEFAULT_PAGE_SIZE,
+    progress: Optional[Callable[[int], None]] = None,
+) -> int:
+    """
+    syncs the resource from the engine into the mirror and returns the
+    number of objects requested.
+    """
+    progress = progress or (lambda count: None)
+    if resource.watermarks:
+        return _sync_incremental(client, store, resource, page_size, progress)
+    return _sync_snapshot(client, store, resource, page_size, progress)
@@ -0,0 +1,75 @@
+from contextlib import closing
+from unittest.mock import Mock
+
+import pytest
+
+from .resources import get_resource_by_operation_id
+from .store import MirrorStore
+from .sync import sync_resource
+
+HISTORY = get_resource_by_operation_id("getHistoricProcessInstances")
+INCIDENTS = get_resource_by_operation_id("getIncidents")
+
+
+def _client(items: list) -> Mock:
+    def get(path, params):
+        result = items
+        if after := params.get("startedAfter"):
+            result = [item for item in result if item["startTime"] > after]
+        if after := params.get("finishedAfter"):
+            result = [item for item in result if (item["endTime"] or "") > after]
+        start = params["firstResult"]
+        resp = Mock()
+        resp.json.return_value = result[start : start + params["maxResults"]]
+        return resp
+
+    client = Mock()
+    client.get.side_effect = get
+    return client
+
+
+@pytest.fixture
+def store(tmp_path) -> MirrorStore:
+    return MirrorStore(tmp_path / "engine.sqlite")
+
+
+def test_sync_incremental(store: MirrorStore):
+    instances = [
+        {"id": "p1", "startTime": "2021-01-01", "endTime": None},
+        {"id": "p2", "startTime": "2021-01-02", "endTime": None},
+    ]
+    client = _client(instances)
+    assert sync_resource(client, store, HISTORY, page_size=10) == 2
+
+    # p1 finished and p3 started since the last sync
+    instances[0] = {"id": "p1", "startTime": "2021-01-01", "endTime": "2021-01-03"}
+    instances.append({"id": "p3", "startTime": "2021-01-04", "endTime": None})
+    client.get.reset_mock()
+    assert sync_resource(client, store, HISTORY, page_size=10) == 2
+
+    started, finished = [call.kwargs["params"] for call in client.get.call_args_list]
+    assert started["startedAfter"] == "2021-01-02"
+    # nothing had finished before. continue from the start watermark.
+    assert finished["finishedAfter"] == "2021-01-02"
+    assert store.query(HISTORY, {"finished": "true"}) == [instances[0]]
+    assert len(store.query(HISTORY, {})) == 3
+
+
+def test_sync_snapshot_replaces(store: MirrorStore):
+    sync_resource(_client([{"id": "i1"}, {"id": "i2"}]), store, INCIDENTS)
+    sync_resource(_client([{"id": "i2"}]), store, INCIDENTS)
+
+    assert store.query(INCIDENTS, {}) == [{"id": "i2"}]
+
+
+def test_sync_snapshot_failure_keeps_objects(store: MirrorStore):
+    sync_resource(_client([{"id": "i1"}]), store, INCIDENTS)
+    client = Mock()
+    client.get.side_effect = ConnectionError()
+
+    with pytest.raises(ConnectionError):
+        sync_resource(client, store, INCIDENTS)
+
+    assert store.query(INCIDENTS, {}) == [{"id": "i1"}]
+    with closing(store.connect()) as connection:
+        assert store.get_watermark(connection, INCIDENTS, "id") == "i1"
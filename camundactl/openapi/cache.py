@@ -16,6 +16,7 @@ class OpenAPISpecCache:
         self.operation_id_paths = {}
         self.verb_operation_ids = defaultdict(list)
         self.operation_id_schema_names = {}
+        self.path_verb_operation_ids = {}
 
         for path, config in self.spec["paths"].items():
             for verb, op_conf in config.items():
@@ -25,6 +26,7 @@ class OpenAPISpecCache:
                 self.operation_id_verbs[operation_id] = verb
                 self.operation_id_paths[operation_id] = path
                 self.verb_operation_ids[verb].append(operation_id)
+                self.path_verb_operation_ids[(path, verb)] = operation_id
 
                 try:
                     content = op_conf["requestBody"]["content"]
@@ -53,6 +55,9 @@ class OpenAPISpecCache:
     def get_operation_id_path(self, operation_id: str) -> str:
         return self.operation_id_paths[operation_id]
 
+    def get_operation_id_by_path(self, path: str, verb: str) -> Optional[str]:
+        return self.path_verb_operation_ids.get((path, verb))
+
     def get_operation_id_schema_name(self, operation_id: str) -> str:
         return self.operation_id_schema_names[operation_id]
 
@@ -1,16 +1,17 @@
 import json
 from functools import lru_cache
 from importlib.resources import files, open_text
-from typing import Dict, cast
+from typing import Dict, Optional, cast
 
 from camundactl.config import load_config
 
 
-def load_spec() -> Dict:
+def load_spec(spec_version: Optional[str] = None) -> Dict:
     spec_module = "camundactl.openapi.specs"
 
-    config = load_config()
-    spec_version = config.get("spec_version", "latest") or "latest"
+    if spec_version is None:
+        config = load_config()
+        spec_version = config.get("spec_version", "latest") or "latest"
     spec_filename = f"openapi-{spec_version}.json"
     try:
         spec_file = open_text(spec_module, spec_filename)
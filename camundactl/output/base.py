@@ -1,48 +1,34 @@
-import functools
-from typing import Any, Callable, Optional
-
-import click
+import inspect
+from typing import Any, Iterable
 
 
 class OutputHandler:
+    """
+    renders the result of a command. handlers are shared between
+    commands (and threads), so they must not keep any state of a
+    single invocation. the selected output options are passed to
+    `handle` instead.
+    """
 
     name: str = ""
     options = {}
-    ctx: Optional[click.Context] = None
-
-    def set_current_output(self, output):
-        self.current_output = output
-
-    def _extract_context(
-        self, func: Callable, args: tuple, kwargs: dict
-    ) -> Optional[click.Context]:
-        for arg in list(args) + list(kwargs.values()):
-            if isinstance(arg, click.Context):
-                return arg
-        return None
 
-    def apply(self, func: Callable) -> Callable:
+    def output(self, result, **kwargs) -> Any:
         """
-        applies the output options to the call
-        funcs and returns a call wrapper which
-        handles the output if it is activated.
+        handles the result of a command. generators are handled as
+        streams.
         """
-
-        for option in self.options.values():
-            func = option(func)
-
-        @functools.wraps(func)
-        def wrapper(*args, **kwargs):
-            handle_kwargs = {}
-            for name in self.options.keys():
-                handle_kwargs[name] = kwargs.pop(name)
-            self.ctx = self._extract_context(func, args, kwargs)
-            result = func(*args, **kwargs)
-            if self.current_output == self.name:
-                self.handle(result, **handle_kwargs)
-            return result
-
-        return wrapper
+        if inspect.isgenerator(result):
+            return self.handle_stream(result, **kwargs)
+        return self.handle(result, **kwargs)
 
     def handle(self, result, **kwargs) -> Any:
         raise NotImplementedError()
+
+    def handle_stream(self, results: Iterable, **kwargs) -> Any:
+        """
+        handles a result that is streamed in chunks (the command returned
+        a generator). every chunk is handled as soon as it arrives.
+        """
+        for result in results:
+            self.handle(result, **kwargs)
@@ -3,45 +3,32 @@ from unittest.mock import Mock
 from .base import OutputHandler
 
 
-def test_outputhandler():
-
-    result = "result"
-    func_mock = Mock()
-    func_mock.return_value = result
-
+def test_outputhandler_output():
     oh = Mock()
-    oh.name = "output-name"
-    oh.current_output = "output-name"
 
-    option = Mock()
-    option.return_value = func_mock
-    oh.options = {"output_format": option}
+    OutputHandler.output(oh, "result", output_format="some-format")
 
-    func_args = Mock()
+    oh.handle.assert_called_with("result", output_format="some-format")
+    assert oh.handle_stream.called is False
 
-    wrapper = OutputHandler.apply(oh, func_mock)
-    wrapper(func_args, output_format="some-format")
 
-    option.assert_called_with(func_mock)
-    func_mock.assert_called_with(func_args)
+def test_outputhandler_stream():
+    def results():
+        yield [1]
+        yield [2]
 
-    oh.handle.assert_called_with(result, output_format="some-format")
+    oh = Mock()
 
+    OutputHandler.output(oh, results())
 
-def test_outputhandler_outher_output():
-    func_mock = Mock()
+    assert oh.handle.called is False
+    oh.handle_stream.assert_called_once()
 
-    option = Mock()
-    option.return_value = func_mock
 
+def test_outputhandler_handle_stream():
     oh = Mock()
-    oh.name = "name"
-    oh.current_output = "another"
-
-    oh.options = {"output_format": option}
 
-    wrapper = OutputHandler.apply(oh, func_mock)
-    wrapper(output_format=None)
+    OutputHandler.handle_stream(oh, iter([[1], [2]]), output_format=None)
 
-    func_mock.assert_called()
-    assert oh.handle.called is False
+    assert oh.handle.call_count == 2
+    oh.handle.assert_called_with([2], output_format=None)
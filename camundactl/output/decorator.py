@@ -1,5 +1,4 @@
 import functools
-from contextlib import contextmanager
 from typing import Optional
 
 import click
@@ -7,16 +6,13 @@ import click
 from camundactl.output.base import OutputHandler
 
 
-@contextmanager
-def set_current_output(output_handlers: list[OutputHandler], output: str):
-    for w in output_handlers:
-        w.set_current_output(output)
-    yield
-    for w in output_handlers:
-        w.set_current_output(None)
-
-
 def with_output(*wrappers: OutputHandler, default: Optional[str] = None):
+    """
+    adds the --output option and the options of all output handlers to
+    the command. the selected handler and its options are resolved per
+    invocation, so the same command can run concurrently.
+    """
+
     def inner(func):
 
         if not wrappers:
@@ -24,16 +20,22 @@ def with_output(*wrappers: OutputHandler, default: Optional[str] = None):
 
         output_lookup = dict((oh.name, oh) for oh in wrappers)
 
+        # handlers may share options (e.g. table and object table).
+        # every option is added once.
+        options = {}
+        for oh in wrappers:
+            options.update(oh.options)
+
         func = click.option(
             "-o",
             "--output",
             "output",
             default=default or wrappers[0].name,
-            type=click.Choice([oh.name for oh in wrappers]),
+            type=click.Choice(list(output_lookup.keys())),
         )(func)
 
-        for oh in wrappers:
-            func = oh.apply(func)
+        for option in options.values():
+            func = option(func)
 
         @functools.wraps(func)
         def wrapper(*args, output, **kwargs):
@@ -43,8 +45,13 @@ def with_output(*wrappers: OutputHandler, default: Optional[str] = None):
                     "Has to be one of: %s"
                     % (output, ", ".join(oh.name for oh in wrappers))
                 )
-            with set_current_output(wrappers, output):
-                return func(*args, **kwargs)
+            output_handler = output_lookup[output]
+            option_values = {name: kwargs.pop(name, None) for name in options}
+            result = func(*args, **kwargs)
+            output_handler.output(
+                result, **{name: option_values[name] for name in output_handler.options}
+            )
+            return result
 
         return wrapper
 
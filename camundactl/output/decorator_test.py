@@ -1,4 +1,6 @@
-from unittest.mock import Mock, call
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import Mock
 
 import click
 import pytest
@@ -8,27 +10,48 @@ from camundactl.output.base import OutputHandler
 from .decorator import with_output
 
 
+class RecordingOutputHandler(OutputHandler):
+    def __init__(self, name: str, option: str):
+        self.name = name
+        self.options = {option: click.option(f"--{option}", option)}
+        self.handled = []
+
+    def handle(self, result, **kwargs):
+        self.handled.append((result, kwargs))
+
+
 def test_with_output():
     output_handler = Mock(spec=OutputHandler)
     output_handler.name = "test"
-
-    output_name = "test"
+    output_handler.options = {}
 
     @with_output(output_handler)
     def func(*a, **kw):
-        pass
+        return "result"
+
+    func(ctx=Mock(), output="test")
 
-    func(ctx=Mock(), output=output_name)
+    output_handler.output.assert_called_once_with("result")
 
-    output_handler.apply.assert_called()
-    assert output_handler.set_current_output.call_count == 2
 
-    output_handler.set_current_output.assert_has_calls([call(output_name), call(None)])
+def test_with_output_selects_handler_and_options():
+    first = RecordingOutputHandler("first", "first_option")
+    second = RecordingOutputHandler("second", "second_option")
+
+    @with_output(first, second)
+    def func(value):
+        return value
+
+    func(value=1, output="second", first_option="a", second_option="b")
+
+    assert first.handled == []
+    assert second.handled == [(1, {"second_option": "b"})]
 
 
 def test_with_output_invalid_output():
     output_handler = Mock(spec=OutputHandler)
     output_handler.name = "test"
+    output_handler.options = {}
 
     @with_output(output_handler)
     def func(*a, **kw):
@@ -44,3 +67,41 @@ def test_with_output_no_handler_error():
         @with_output()
         def func(*a, **kw):
             pass
+
+
+def test_with_output_concurrent_commands():
+    """
+    the same command runs concurrently in many threads. every invocation
+    must be handled by its own output handler with its own options.
+    """
+    first = RecordingOutputHandler("first", "option")
+    second = RecordingOutputHandler("second", "option")
+    invocations = 50
+    # make sure the invocations overlap
+    barrier = threading.Barrier(10)
+
+    @click.command()
+    @click.argument("value", type=int)
+    @with_output(first, second)
+    def command(value):
+        barrier.wait(timeout=5)
+        return value
+
+    def run(value: int):
+        output = "first" if value % 2 else "second"
+        args = [str(value), "-o", output, "--option", f"option-{value}"]
+        command.main(args, standalone_mode=False)
+
+    with ThreadPoolExecutor(max_workers=10) as executor:
+        list(executor.map(run, range(invocations)))
+
+    assert sorted(first.handled) == [
+        (value, {"option": f"option-{value}"})
+        for value in range(invocations)
+        if value % 2
+    ]
+    assert sorted(second.handled) == [
+        (value, {"option": f"option-{value}"})
+        for value in range(invocations)
+        if not value % 2
+    ]
@@ -1,4 +1,5 @@
 import json
+from typing import Iterable
 
 import click
 
@@ -15,3 +16,12 @@ class JSONOutputHandler(OutputHandler):
 
     def handle(self, result, **kwargs):
         click.echo(json.dumps(result, indent=self.indent))
+
+    def handle_stream(self, results: Iterable, **kwargs):
+        """
+        streamed results are printed as newline delimited json. one
+        line per item.
+        """
+        for result in results:
+            for item in result if isinstance(result, list) else [result]:
+                click.echo(json.dumps(item))
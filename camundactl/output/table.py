@@ -100,6 +100,10 @@ class ObjectTableOutputHandler(TableOutputHandler):
         output_cell_max_length,
     ):
 
+        if isinstance(result, list):
+            # multiple objects requested at once
+            return super().handle(result, output_headers, output_cell_max_length)
+
         headers = "key,value"
 
         output_headers = output_headers or self.default_table_headers
@@ -65,58 +65,83 @@ class TemplateOutputHandler(OutputHandler):
         self,
         default_template="default",
         tpl_lookup_context: Dict[str, str] = None,
+        templates: Optional[Dict[str, str]] = None,
     ):
         self.default_template = default_template
         self.tpl_lookup_context = tpl_lookup_context or {}
-
-    def _create_loaders(self) -> Iterable[BaseLoader]:
+        # builtin templates by name. the user can override them
+        # with a template file of the same name.
+        self.templates = templates or {}
+        # environments by template search path. reusing them keeps the
+        # compiled templates cached.
+        self._environments: Dict[tuple, Environment] = {}
+
+    def _create_loaders(
+        self, ctx: Optional[click.Context] = None
+    ) -> Iterable[BaseLoader]:
         """
         creates a list of templates loaders.
         """
         yield DictLoader(DEFAULT_TEMPLATES_DICT)
-        if self.ctx:
-            config = self.ctx.obj.get_config()
-            extra_paths = config.get("template", {}).get("extra_paths", [])
+        if ctx and ctx.obj:
+            config = ctx.obj.get_config()
+            extra_paths = (config.get("template") or {}).get("extra_paths") or []
             for path in extra_paths:
                 yield FileSystemLoader(path)
         yield FileSystemLoader(get_configdir() / "templates")
+        if self.templates:
+            yield DictLoader(self.templates)
         yield PackageLoader("camundactl.output", "templates")
 
-    def _create_environment(self) -> Environment:
-        loaders = list(self._create_loaders())
+    def _create_environment(self, ctx: Optional[click.Context] = None) -> Environment:
+        loaders = list(self._create_loaders(ctx))
         loader = ChoiceLoader(loaders)
         return Environment(loader=loader)
 
+    def _get_environment(self, ctx: Optional[click.Context] = None) -> Environment:
+        extra_paths: tuple = ()
+        if ctx and ctx.obj:
+            config = ctx.obj.get_config()
+            extra_paths = tuple((config.get("template") or {}).get("extra_paths") or [])
+        if extra_paths not in self._environments:
+            # concurrent calls may both create it. the last one wins.
+            self._environments[extra_paths] = self._create_environment(ctx)
+        return self._environments[extra_paths]
+
     def _get_empty_template(self, env: Environment) -> Template:
         try:
             return env.get_template("emtpy.tpl")
         except TemplateNotFound:
             return Template("")
 
-    def _create_tpl_lookup_context(self) -> dict[str, Any]:
+    def _create_tpl_lookup_context(
+        self, ctx: Optional[click.Context] = None
+    ) -> dict[str, Any]:
         command_name = "NO_COMMAND_FOUND"
         parent_name = "NO_PARENT_FOUND"
-        if self.ctx:
-            command_name = self.ctx.command.name
-            if self.ctx.parent:
-                parent_name = self.ctx.parent.command.name
+        if ctx:
+            command_name = ctx.command.name
+            if ctx.parent:
+                parent_name = ctx.parent.command.name
         return {
             "command": command_name,
             "parent": parent_name,
             **self.tpl_lookup_context,
         }
 
-    def _get_user_template_patterns(self) -> List[str]:
-        if not self.ctx:
+    def _get_user_template_patterns(
+        self, ctx: Optional[click.Context] = None
+    ) -> List[str]:
+        if not ctx or not ctx.obj:
             return []
-        config = self.ctx.obj.get_config()
+        config = ctx.obj.get_config()
         try:
-            return config["template"]["extra_patterns"]
-        except KeyError:
+            return list(config["template"]["extra_patterns"] or [])
+        except (KeyError, TypeError):
             return []
 
-    def _get_template_patterns(self) -> List[str]:
-        user_template_patterns = self._get_user_template_patterns()
+    def _get_template_patterns(self, ctx: Optional[click.Context] = None) -> List[str]:
+        user_template_patterns = self._get_user_template_patterns(ctx)
         template_patterns = user_template_patterns + self.default_template_patterns
 
         if self.default_template:
@@ -124,7 +149,10 @@ class TemplateOutputHandler(OutputHandler):
         return template_patterns
 
     def _get_template(
-        self, env: Environment, name_or_tpl: Optional[str] = None
+        self,
+        env: Environment,
+        name_or_tpl: Optional[str] = None,
+        ctx: Optional[click.Context] = None,
     ) -> Template:
         if name_or_tpl is not None:
             try:
@@ -132,8 +160,8 @@ class TemplateOutputHandler(OutputHandler):
             except TemplateNotFound:
                 return Template(name_or_tpl)
 
-        template_patterns = self._get_template_patterns()
-        lookup_context = self._create_tpl_lookup_context()
+        template_patterns = self._get_template_patterns(ctx)
+        lookup_context = self._create_tpl_lookup_context(ctx)
         lookup = []
         for pattern in template_patterns:
             try:
@@ -150,11 +178,13 @@ class TemplateOutputHandler(OutputHandler):
             return Template("NO TEMPLATE FOUND")
 
     def handle(self, result: Any, output_template: Optional[str]) -> Any:
-        env = self._create_environment()
+        # the context of the running command. click keeps it per thread.
+        ctx = click.get_current_context(silent=True)
+        env = self._get_environment(ctx)
         if result is None and output_template is None:
             template = self._get_empty_template(env)
         else:
-            template = self._get_template(env, output_template)
+            template = self._get_template(env, output_template, ctx)
 
         if isinstance(result, dict):
             context = {**result, "result": result}
@@ -57,8 +57,7 @@ def test_TemplateOutputHandler_create_loaders_with_ctx(
     tests weather the FileSystemLoaders for the extra_paths
     in then configuration become loaded
     """
-    template_output_handler_default.ctx = click_context
-    loaders = template_output_handler_default._create_loaders()
+    loaders = template_output_handler_default._create_loaders(click_context)
     loaders = list(loaders)
     assert len(loaders) == 5
     a, b, c, d, e = loaders
@@ -116,8 +115,7 @@ def test_TemplateOutputHandler_create_tpl_lookup_context_with_ctx(
     tpl_lookup_context: dict,
     click_context: click.Context,
 ) -> None:
-    template_output_handler_default.ctx = click_context
-    ctx = template_output_handler_default._create_tpl_lookup_context()
+    ctx = template_output_handler_default._create_tpl_lookup_context(click_context)
     assert ctx["command"] == "mock_command"
     assert ctx["parent"] == "mock_command_parent"
     for key, value in tpl_lookup_context.items():
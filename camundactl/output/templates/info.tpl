@@ -17,7 +17,7 @@ OpenAPI:{% for openapi in openapi_specs %}
 Engines: {% if config.engines %}{% for engine in config.engines %}
     - Name: {{engine.name}} {% if engine.name == config.current_engine %}(selected){% endif %}
       URL: {{engine.url}}
-      Version: {{ camunda_engine_version(engine) }}{% endfor %}{% else %}-{% endif %}
+      Version: {{ engine_status[engine.name].version }}{% if engine_status[engine.name].latency is not none %} ({{ engine_status[engine.name].latency }} ms){% endif %}{% endfor %}{% else %}-{% endif %}
 
 Alias: {% if config.alias %}{% for key, value in config.alias.items() %}
     - {{key}}: {{value}}{% endfor %}{% else %}-{% endif %}
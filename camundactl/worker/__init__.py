@@ -0,0 +1,10 @@
+from camundactl.worker.handlers import (  # noqa
+    BpmnError,
+    Handler,
+    HandlerFailure,
+    external_task_handler,
+    get_handlers,
+    get_variables,
+    to_variables,
+)
+from camundactl.worker.runtime import POOLS, Worker, WorkerMetrics  # noqa
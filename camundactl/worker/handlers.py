@@ -0,0 +1,186 @@
+import json
+import time
+import traceback
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
+
+__all__ = [
+    "BpmnError",
+    "Handler",
+    "HandlerFailure",
+    "Outcome",
+    "external_task_handler",
+    "get_handlers",
+    "get_variables",
+    "to_variables",
+]
+
+# default lock duration of fetched tasks in milliseconds
+DEFAULT_LOCK_DURATION = 60_000
+
+# retries and retry timeout (in milliseconds) of a failing handler
+DEFAULT_RETRIES = 3
+DEFAULT_RETRY_TIMEOUT = 60_000
+
+
+class Handler(NamedTuple):
+    topic: str
+    func: Callable[[Dict], Optional[Dict[str, Any]]]
+    lock_duration: int = DEFAULT_LOCK_DURATION
+    # the variables fetched with the task (default all)
+    variables: Optional[List[str]] = None
+
+
+_HANDLERS: Dict[str, Handler] = {}
+
+
+def external_task_handler(
+    topic: str,
+    lock_duration: int = DEFAULT_LOCK_DURATION,
+    variables: Optional[List[str]] = None,
+):
+    """
+    registers the decorated function as handler of the external tasks
+    of topic. the function receives the locked task (with its
+    `variables`) and returns the variables to complete the task with.
+    raising fails the task, raising `BpmnError` throws a bpmn error.
+
+    handlers are defined in the modules of `extra_paths`. with the
+    process pool they have to be module level functions.
+    """
+
+    def inner(func):
+        _HANDLERS[topic] = Handler(topic, func, lock_duration, variables)
+        return func
+
+    return inner
+
+
+def get_handlers() -> Dict[str, Handler]:
+    return dict(_HANDLERS)
+
+
+class HandlerFailure(Exception):
+    """
+    fails the task with explicit retries and retry timeout (in
+    milliseconds). other exceptions decrement the retries of the task.
+    """
+
+    def __init__(
+        self,
+        message: str,
+        details: Optional[str] = None,
+        retries: Optional[int] = None,
+        retry_timeout: int = DEFAULT_RETRY_TIMEOUT,
+    ):
+        super().__init__(message)
+        self.message = message
+        self.details = details
+        self.retries = retries
+        self.retry_timeout = retry_timeout
+
+
+class BpmnError(Exception):
+    def __init__(
+        self,
+        code: str,
+        message: Optional[str] = None,
+        variables: Optional[Dict[str, Any]] = None,
+    ):
+        super().__init__(message or code)
+        self.code = code
+        self.message = message
+        self.variables = variables
+
+
+def get_variables(task: Dict) -> Dict[str, Any]:
+    """
+    returns the plain values of the variables of a fetched task.
+    """
+    return {
+        name: variable.get("value")
+        for name, variable in (task.get("variables") or {}).items()
+    }
+
+
+def _to_variable(value: Any) -> Dict:
+    if isinstance(value, dict) and "value" in value and "type" in value:
+        # typed already
+        return value
+    if value is None:
+        return {"value": None, "type": "Null"}
+    if isinstance(value, bool):
+        return {"value": value, "type": "Boolean"}
+    if isinstance(value, int):
+        return {"value": value, "type": "Long"}
+    if isinstance(value, float):
+        return {"value": value, "type": "Double"}
+    if isinstance(value, (dict, list)):
+        return {"value": json.dumps(value), "type": "Json"}
+    return {"value": str(value), "type": "String"}
+
+
+def to_variables(values: Optional[Dict[str, Any]]) -> Dict[str, Dict]:
+    """
+    converts plain values into typed variables of the rest api.
+    dicts and lists become json variables.
+    """
+    return {name: _to_variable(value) for name, value in (values or {}).items()}
+
+
+class Outcome(NamedTuple):
+    task_id: str
+    topic: str
+    # complete, failure or bpmnError
+    action: str
+    body: Dict[str, Any]
+    # handler latency in seconds
+    latency: float
+
+
+def run_handler(func: Callable[[Dict], Any], task: Dict) -> Outcome:
+    """
+    runs the handler and translates its result into the request
+    reporting it. runs in the threads or processes of the pool.
+    """
+    start = time.monotonic()
+    try:
+        result = func(task)
+    except BpmnError as error:
+        action = "bpmnError"
+        body = {
+            "errorCode": error.code,
+            "errorMessage": error.message,
+            "variables": to_variables(error.variables),
+        }
+    except HandlerFailure as failure:
+        action = "failure"
+        retries = failure.retries
+        if retries is None:
+            retries = _next_retries(task)
+        body = {
+            "errorMessage": failure.message,
+            "errorDetails": failure.details,
+            "retries": retries,
+            "retryTimeout": failure.retry_timeout,
+        }
+    except Exception as error:
+        action = "failure"
+        body = {
+            "errorMessage": f"{type(error).__name__}: {error}"[:600],
+            "errorDetails": traceback.format_exc(),
+            "retries": _next_retries(task),
+            "retryTimeout": DEFAULT_RETRY_TIMEOUT,
+        }
+    else:
+        action = "complete"
+        body = {"variables": to_variables(result)}
+    return Outcome(
+        task["id"], task["topicName"], action, body, time.monotonic() - start
+    )
+
+
+def _next_retries(task: Dict) -> int:
+    retries = task.get("retries")
+    if retries is None:
+        return DEFAULT_RETRIES
+    return max(retries - 1, 0)
@@ -0,0 +1,58 @@
+from .handlers import (
+    BpmnError,
+    HandlerFailure,
+    get_variables,
+    run_handler,
+    to_variables,
+)
+
+TASK = {
+    "id": "t1",
+    "topicName": "charge",
+    "retries": None,
+    "variables": {"amount": {"type": "Long", "value": 5, "valueInfo": {}}},
+}
+
+
+def test_variables():
+    assert get_variables(TASK) == {"amount": 5}
+    assert to_variables({"a": True, "b": 1, "c": [1], "d": None, "e": "x"}) == {
+        "a": {"value": True, "type": "Boolean"},
+        "b": {"value": 1, "type": "Long"},
+        "c": {"value": "[1]", "type": "Json"},
+        "d": {"value": None, "type": "Null"},
+        "e": {"value": "x", "type": "String"},
+    }
+    typed = {"value": "2021-01-01", "type": "Date"}
+    assert to_variables({"a": typed}) == {"a": typed}
+
+
+def test_run_handler_complete():
+    outcome = run_handler(lambda task: {"charged": get_variables(task)["amount"]}, TASK)
+    assert outcome.action == "complete"
+    assert outcome.body == {"variables": {"charged": {"value": 5, "type": "Long"}}}
+
+
+def test_run_handler_failures():
+    def fail(task):
+        raise ValueError("no money")
+
+    outcome = run_handler(fail, {**TASK, "retries": 2})
+    assert outcome.action == "failure"
+    assert outcome.body["errorMessage"] == "ValueError: no money"
+    assert outcome.body["retries"] == 1
+    assert "Traceback" in outcome.body["errorDetails"]
+
+    def explicit(task):
+        raise HandlerFailure("later", retries=5, retry_timeout=10)
+
+    outcome = run_handler(explicit, TASK)
+    assert (outcome.body["retries"], outcome.body["retryTimeout"]) == (5, 10)
+
+    def bpmn(task):
+        raise BpmnError("NO_MONEY", variables={"reason": "empty"})
+
+    outcome = run_handler(bpmn, TASK)
+    assert outcome.action == "bpmnError"
+    assert outcome.body["errorCode"] == "NO_MONEY"
+    assert outcome.body["variables"]["reason"]["value"] == "empty"
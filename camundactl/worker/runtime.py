@@ -0,0 +1,416 @@
+import logging
+import queue
+import socket
+import threading
+import time
+import uuid
+from collections import deque
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Deque, Dict, List, NamedTuple, Optional
+
+from camundactl.client import Client
+from camundactl.client.parallel import map_concurrent
+from camundactl.worker.handlers import (
+    DEFAULT_RETRY_TIMEOUT,
+    Handler,
+    Outcome,
+    run_handler,
+)
+
+__all__ = ["Worker", "WorkerMetrics", "POOLS", "default_worker_id"]
+
+logger = logging.getLogger(__name__)
+
+POOLS = ("thread", "process")
+
+DEFAULT_MAX_WORKERS = 4
+
+# milliseconds the engine holds a fetchAndLock request without tasks
+DEFAULT_ASYNC_RESPONSE_TIMEOUT = 30_000
+
+# outcomes finished within this time (in seconds) are reported together
+FLUSH_INTERVAL = 0.1
+
+# flushes at the end of a run to report outcomes which failed to report
+FINAL_FLUSH_ATTEMPTS = 5
+
+# the lock of a running task is extended if less than this part of the
+# lock duration is left
+EXTEND_THRESHOLD = 0.25
+
+# the latest handler latencies the percentiles are computed of
+LATENCY_WINDOW = 1000
+
+MAX_FETCH_BACKOFF = 30.0
+
+
+def default_worker_id() -> str:
+    return f"cctl-{socket.gethostname()}-{uuid.uuid4().hex[:8]}"
+
+
+class WorkerMetrics:
+    """
+    counters of a running worker. updated by the threads of the worker.
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic):
+        self._clock = clock
+        self._lock = threading.Lock()
+        self.started = clock()
+        self.counters: Dict[str, int] = dict.fromkeys(
+            (
+                "fetched",
+                "completed",
+                "failed",
+                "bpmnErrors",
+                "extended",
+                "lockExpired",
+                "reportErrors",
+                "fetchErrors",
+            ),
+            0,
+        )
+        self._latencies: Deque[float] = deque(maxlen=LATENCY_WINDOW)
+
+    def inc(self, counter: str, value: int = 1) -> None:
+        with self._lock:
+            self.counters[counter] += value
+
+    def add_latency(self, seconds: float) -> None:
+        with self._lock:
+            self._latencies.append(seconds)
+
+    def snapshot(self, running: int = 0) -> Dict[str, Any]:
+        with self._lock:
+            counters = dict(self.counters)
+            latencies = sorted(self._latencies)
+        uptime = self._clock() - self.started
+        handled = counters["completed"] + counters["failed"] + counters["bpmnErrors"]
+
+        def percentile(p: float) -> Optional[float]:
+            if not latencies:
+                return None
+            index = min(int(len(latencies) * p), len(latencies) - 1)
+            return round(latencies[index] * 1000, 1)
+
+        return {
+            "uptime": round(uptime, 1),
+            "running": running,
+            **counters,
+            "tasks/s": round(handled / uptime, 2) if uptime > 0 else None,
+            "latency p50 ms": percentile(0.5),
+            "latency p95 ms": percentile(0.95),
+            "latency max ms": percentile(1.0),
+        }
+
+
+class _RunningTask(NamedTuple):
+    task: Dict
+    handler: Handler
+    # clock time the lock of the task expires
+    locked_until: float
+
+
+class Worker:
+    """
+    fetches and locks external tasks of the topics of the handlers and
+    runs the handlers on a thread or process pool. the outcomes of the
+    handlers are reported together every FLUSH_INTERVAL seconds and the
+    locks of long running handlers are extended.
+    """
+
+    def __init__(
+        self,
+        client: Client,
+        handlers: List[Handler],
+        worker_id: Optional[str] = None,
+        pool: str = "thread",
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        max_tasks: Optional[int] = None,
+        async_response_timeout: int = DEFAULT_ASYNC_RESPONSE_TIMEOUT,
+        stats_interval: Optional[float] = None,
+        on_stats: Optional[Callable[[Dict], None]] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if pool not in POOLS:
+            raise ValueError(f"invalid pool {pool}. choose one of {', '.join(POOLS)}")
+        if not handlers:
+            raise ValueError("there are no handlers to run")
+        self.client = client
+        self.handlers = {handler.topic: handler for handler in handlers}
+        self.worker_id = worker_id or default_worker_id()
+        self.pool = pool
+        self.max_workers = max_workers
+        # tasks locked at once. a few more than workers keeps them busy
+        self.max_tasks = max_tasks or max_workers * 2
+        self.async_response_timeout = async_response_timeout
+        self.stats_interval = stats_interval
+        self.on_stats = on_stats
+        self.metrics = WorkerMetrics(clock)
+        self._clock = clock
+        self._running: Dict[str, _RunningTask] = {}
+        self._outcomes: "queue.Queue[Outcome]" = queue.Queue()
+        self._changed = threading.Condition()
+        self._stopping = threading.Event()
+        self._done = threading.Event()
+
+    def stop(self) -> None:
+        """
+        stops fetching tasks. the running handlers are finished and
+        reported.
+        """
+        self._stopping.set()
+        with self._changed:
+            self._changed.notify_all()
+
+    def _create_executor(self) -> Executor:
+        if self.pool == "process":
+            return ProcessPoolExecutor(max_workers=self.max_workers)
+        return ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix="cctl-worker"
+        )
+
+    def fetch(self, max_tasks: int) -> List[Dict]:
+        body = {
+            "workerId": self.worker_id,
+            "maxTasks": max_tasks,
+            "usePriority": True,
+            "asyncResponseTimeout": self.async_response_timeout,
+            "topics": [
+                {
+                    "topicName": handler.topic,
+                    "lockDuration": handler.lock_duration,
+                    **(
+                        {"variables": handler.variables}
+                        if handler.variables is not None
+                        else {}
+                    ),
+                }
+                for handler in self.handlers.values()
+            ],
+        }
+        # the engine holds the request up to the async response timeout.
+        # its latency does not tell anything about the load of the engine
+        resp = self.client.post(
+            "/external-task/fetchAndLock",
+            json=body,
+            timeout=self.async_response_timeout / 1000 + 10,
+            controlled=False,
+        )
+        resp.raise_for_status()
+        return resp.json()
+
+    def _free_capacity(self) -> int:
+        with self._changed:
+            while not self._stopping.is_set():
+                running = len(self._running) + self._outcomes.qsize()
+                if running < self.max_tasks:
+                    return self.max_tasks - running
+                self._changed.wait(1.0)
+        return 0
+
+    def _dispatch(self, executor: Executor, task: Dict) -> None:
+        handler = self.handlers[task["topicName"]]
+        locked_until = self._clock() + handler.lock_duration / 1000
+        with self._changed:
+            self._running[task["id"]] = _RunningTask(task, handler, locked_until)
+        future = executor.submit(run_handler, handler.func, task)
+        future.add_done_callback(lambda f: self._finished(task, f))
+
+    def _finished(self, task: Dict, future: Future) -> None:
+        try:
+            outcome = future.result()
+        except Exception as error:
+            # the pool itself failed (e.g. a crashed process)
+            outcome = Outcome(
+                task["id"],
+                task["topicName"],
+                "failure",
+                {
+                    "errorMessage": f"{type(error).__name__}: {error}"[:600],
+                    "retries": task.get("retries") or 0,
+                    "retryTimeout": DEFAULT_RETRY_TIMEOUT,
+                },
+                0.0,
+            )
+        with self._changed:
+            running = self._running.pop(task["id"], None)
+            if running and self._clock() > running.locked_until:
+                self.metrics.inc("lockExpired")
+            self._outcomes.put(outcome)
+            self._changed.notify_all()
+
+    def _report(self, outcome: Outcome) -> None:
+        resp = self.client.post(
+            f"/external-task/{outcome.task_id}/{outcome.action}",
+            json={"workerId": self.worker_id, **outcome.body},
+        )
+        counter = {
+            "complete": "completed",
+            "failure": "failed",
+            "bpmnError": "bpmnErrors",
+        }[outcome.action]
+        if resp.status_code >= 400:
+            # e.g. the lock expired and another worker locked the task
+            logger.warning(
+                "reporting %s of task %s failed: %s %s",
+                outcome.action,
+                outcome.task_id,
+                resp.status_code,
+                resp.text,
+            )
+            self.metrics.inc("reportErrors")
+            return
+        self.metrics.inc(counter)
+        self.metrics.add_latency(outcome.latency)
+
+    def _extend(self, task_id: str) -> None:
+        with self._changed:
+            running = self._running.get(task_id)
+        if running is None:
+            return
+        duration = running.handler.lock_duration
+        resp = self.client.post(
+            f"/external-task/{task_id}/extendLock",
+            json={"workerId": self.worker_id, "newDuration": duration},
+        )
+        if resp.status_code >= 400:
+            logger.warning("extending the lock of task %s failed", task_id)
+            return
+        self.metrics.inc("extended")
+        with self._changed:
+            if task_id in self._running:
+                self._running[task_id] = running._replace(
+                    locked_until=self._clock() + duration / 1000
+                )
+
+    def _expiring(self) -> List[str]:
+        now = self._clock()
+        with self._changed:
+            return [
+                task_id
+                for task_id, running in self._running.items()
+                if running.locked_until - now
+                < running.handler.lock_duration / 1000 * EXTEND_THRESHOLD
+            ]
+
+    def flush(self) -> int:
+        """
+        reports the finished outcomes and extends the expiring locks.
+        the requests are sent concurrently. outcomes failing to report
+        (e.g. a lost connection) are queued again and reported with the
+        next flush. returns the number of outcomes reported.
+        """
+        outcomes: List[Outcome] = []
+        while True:
+            try:
+                outcomes.append(self._outcomes.get_nowait())
+            except queue.Empty:
+                break
+        failed: List[Outcome] = []
+
+        def report(outcome: Outcome) -> None:
+            try:
+                self._report(outcome)
+            except Exception as error:
+                logger.warning(
+                    "reporting %s of task %s failed: %s. retrying",
+                    outcome.action,
+                    outcome.task_id,
+                    error,
+                )
+                failed.append(outcome)
+
+        def extend(task_id: str) -> None:
+            try:
+                self._extend(task_id)
+            except Exception as error:
+                logger.warning(
+                    "extending the lock of task %s failed: %s", task_id, error
+                )
+
+        requests: List[Callable[[], None]] = [
+            (lambda outcome=outcome: report(outcome)) for outcome in outcomes
+        ]
+        requests.extend(
+            (lambda task_id=task_id: extend(task_id)) for task_id in self._expiring()
+        )
+        map_concurrent(lambda request: request(), requests)
+        for outcome in failed:
+            self._outcomes.put(outcome)
+        if len(outcomes) > len(failed):
+            with self._changed:
+                self._changed.notify_all()
+        return len(outcomes) - len(failed)
+
+    def _reporter(self) -> None:
+        last_stats = self._clock()
+        final_flushes = 0
+        while True:
+            done = self._done.is_set()
+            try:
+                self.flush()
+            except Exception:
+                logger.exception("reporting outcomes failed")
+            if self.on_stats and self.stats_interval:
+                if self._clock() - last_stats >= self.stats_interval:
+                    last_stats = self._clock()
+                    self.on_stats(self.snapshot())
+            if done:
+                final_flushes += 1
+                if self._outcomes.empty():
+                    return
+                if final_flushes >= FINAL_FLUSH_ATTEMPTS:
+                    logger.error(
+                        "%d outcomes could not be reported, the tasks run again "
+                        "when their locks expire",
+                        self._outcomes.qsize(),
+                    )
+                    return
+                time.sleep(FLUSH_INTERVAL)
+                continue
+            self._done.wait(FLUSH_INTERVAL)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._changed:
+            running = len(self._running)
+        return self.metrics.snapshot(running)
+
+    def run(self) -> Dict[str, Any]:
+        """
+        runs until `stop` is called (or a keyboard interrupt) and
+        returns the metrics.
+        """
+        executor = self._create_executor()
+        reporter = threading.Thread(
+            target=self._reporter, name="cctl-worker-reporter", daemon=True
+        )
+        reporter.start()
+        backoff = 0.0
+        try:
+            while not self._stopping.is_set():
+                capacity = self._free_capacity()
+                if not capacity:
+                    continue
+                try:
+                    tasks = self.fetch(capacity)
+                except Exception as error:
+                    self.metrics.inc("fetchErrors")
+                    backoff = min(max(backoff * 2, 1.0), MAX_FETCH_BACKOFF)
+                    logger.warning(
+                        "fetching tasks failed (%s). retry in %ss", error, backoff
+                    )
+                    self._stopping.wait(backoff)
+                    continue
+                backoff = 0.0
+                self.metrics.inc("fetched", len(tasks))
+                for task in tasks:
+                    self._dispatch(executor, task)
+        except KeyboardInterrupt:
+            logger.info("stopping. waiting for %d running tasks", len(self._running))
+        finally:
+            self._stopping.set()
+            executor.shutdown(wait=True)
+            self._done.set()
+            reporter.join()
+        return self.snapshot()
@@ -0,0 +1,116 @@
+import threading
+import time
+from unittest.mock import Mock
+
+import pytest
+
+from .handlers import Handler, get_variables
+from .runtime import Worker
+
+
+class FakeEngine:
+    """
+    hands out the given tasks and records the reported outcomes
+    """
+
+    def __init__(self, tasks: list):
+        self.tasks = list(tasks)
+        self.requests = []
+        self.lock = threading.Lock()
+        self.worker = None
+
+    def post(self, path, json, **kwargs):
+        with self.lock:
+            self.requests.append((path, json))
+        if path == "/external-task/fetchAndLock":
+            with self.lock:
+                tasks = self.tasks[: json["maxTasks"]]
+                del self.tasks[: json["maxTasks"]]
+            if not tasks:
+                self.worker.stop()
+            return Mock(status_code=200, json=Mock(return_value=tasks))
+        return Mock(status_code=204)
+
+    def reported(self, action: str) -> list:
+        return [
+            path.split("/")[2]
+            for path, _ in self.requests
+            if path.endswith(f"/{action}")
+        ]
+
+
+def _task(id_: str, topic: str = "double") -> dict:
+    return {
+        "id": id_,
+        "topicName": topic,
+        "retries": None,
+        "variables": {"value": {"type": "Long", "value": int(id_)}},
+    }
+
+
+def double(task):
+    if get_variables(task)["value"] == 3:
+        raise ValueError("three")
+    return {"result": get_variables(task)["value"] * 2}
+
+
+@pytest.mark.parametrize("pool", ["thread", "process"])
+def test_worker_run(pool: str):
+    engine = FakeEngine([_task(str(i)) for i in range(10)])
+    worker = Worker(engine, [Handler("double", double)], pool=pool, max_workers=2)
+    engine.worker = worker
+
+    metrics = worker.run()
+
+    assert sorted(engine.reported("complete")) == sorted(
+        str(i) for i in range(10) if i != 3
+    )
+    assert engine.reported("failure") == ["3"]
+    assert (metrics["fetched"], metrics["completed"], metrics["failed"]) == (10, 9, 1)
+    assert metrics["running"] == 0
+    fetches = [json for path, json in engine.requests if path.endswith("fetchAndLock")]
+    # never more tasks locked than max_tasks
+    assert all(1 <= f["maxTasks"] <= 4 for f in fetches)
+    assert fetches[0]["topics"] == [{"topicName": "double", "lockDuration": 60000}]
+
+
+def test_worker_extends_locks():
+    release = threading.Event()
+
+    def slow(task):
+        release.wait(5)
+
+    engine = FakeEngine([_task("1", "slow")])
+    worker = Worker(engine, [Handler("slow", slow, lock_duration=400)])
+    engine.worker = worker
+    thread = threading.Thread(target=worker.run)
+    thread.start()
+    time.sleep(0.8)
+    release.set()
+    thread.join(5)
+
+    extended = [json for path, json in engine.requests if path.endswith("/extendLock")]
+    assert extended and extended[0]["newDuration"] == 400
+    assert engine.reported("complete") == ["1"]
+    assert worker.snapshot()["lockExpired"] == 0
+
+
+def test_worker_reports_outcomes_again():
+    class FlakyEngine(FakeEngine):
+        failed = False
+
+        def post(self, path, json, **kwargs):
+            if path.endswith("/complete") and not self.failed:
+                self.failed = True
+                raise ConnectionError("connection reset")
+            return super().post(path, json, **kwargs)
+
+    engine = FlakyEngine([_task(str(i)) for i in range(5) if i != 3])
+    worker = Worker(engine, [Handler("double", double)], max_workers=2)
+    engine.worker = worker
+
+    metrics = worker.run()
+
+    # the outcome failing to report is reported with the next flush
+    assert sorted(engine.reported("complete")) == ["0", "1", "2", "4"]
+    assert metrics["completed"] == 4